@@ -0,0 +1,152 @@
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Optional, Union
+
+from fastapi import HTTPException, Request, Response
+
+from app.api.responses import FastJSONResponse
+from app.core.config import get_settings
+from app.core.serialization import dumps
+
+NO_CACHE = "no-cache"
+
+Content = Union[bytes, Any]
+
+
+def public_cache_control() -> str:
+    """
+    Return the ``Cache-Control`` header for responses built from SWAPI data.
+
+    Returns:
+        str: The header value, using the configured ``response_max_age``.
+    """
+    return f"public, max-age={get_settings().response_max_age}"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong entity tag from the bytes or values identifying a response.
+
+    Args:
+        *parts (Any): Bytes are hashed as-is, other values by their ``repr``.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else repr(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[float] = None
+) -> bool:
+    """
+    Evaluate ``If-None-Match``, or else ``If-Modified-Since``, for a GET.
+
+    Entity tags are compared weakly, as required for ``If-None-Match``.
+
+    Args:
+        request (Request): The incoming request.
+        etag (str): The current entity tag of the resource.
+        last_modified (Optional[float]): Unix time the resource last changed.
+
+    Returns:
+        bool: Whether the client's copy is still current.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {_opaque(tag) for tag in if_none_match.split(",")}
+        return _opaque(etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified) <= since
+
+
+def validated_response(
+    request: Request,
+    content: Union[Content, Callable[[], Content]],
+    etag: Optional[str] = None,
+    last_modified: Optional[float] = None,
+    cache_control: Optional[str] = None,
+) -> Response:
+    """
+    Answer a GET with validators, or with ``304 Not Modified`` when possible.
+
+    When ``etag`` is given and matches, ``content`` is never encoded, and
+    if it is a callable it is not even called.
+
+    Args:
+        request (Request): The incoming request.
+        content (Union[Content, Callable[[], Content]]): The encoded JSON body,
+            a value to encode as JSON, or a callable returning either.
+        etag (Optional[str]): The entity tag; hashed from the body if omitted.
+        last_modified (Optional[float]): Unix time the content last changed.
+        cache_control (Optional[str]): The ``Cache-Control`` header; defaults
+            to ``public_cache_control()``.
+
+    Returns:
+        Response: The JSON response or an empty 304 response.
+    """
+    headers = {"Cache-Control": cache_control or public_cache_control()}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+    body = None
+    if etag is None:
+        body = _encode(content)
+        etag = make_etag(body)
+    headers["ETag"] = etag
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    if body is None:
+        body = _encode(content)
+    return FastJSONResponse(content=body, headers=headers)
+
+
+def _encode(content: Union[Content, Callable[[], Content]]) -> bytes:
+    if callable(content):
+        content = content()
+    if isinstance(content, bytes):
+        return content
+    return dumps(content)
+
+
+def if_match_version(if_match: Optional[str]) -> Optional[int]:
+    """
+    Read the version a client expects from an ``If-Match`` header.
+
+    Versions are exposed as strong entity tags such as ``"3"``. Weak or
+    unrecognized tags can never match, as required for ``If-Match``.
+
+    Args:
+        if_match (Optional[str]): The raw ``If-Match`` header.
+
+    Returns:
+        Optional[int]: The expected version, or ``None`` when any version will do.
+
+    Raises:
+        HTTPException: 412 if the header cannot match any version.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip()
+    if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+        return int(tag[1:-1])
+    raise HTTPException(status_code=412, detail="Precondition failed")
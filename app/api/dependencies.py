@@ -0,0 +1,177 @@
+from typing import AsyncIterator, Optional
+
+import httpx
+from fastapi import Depends, Request
+
+from app.core.config import get_settings
+from app.core.http import create_http_client
+from app.services.catalog import SwapiCatalog
+from app.services.overlay import StarshipOverlay
+from app.services.pilots_view import PilotsView
+from app.services.resolver import SwapiResolver
+from app.services.starship_store import MemoryStarshipStore, StarshipStore
+from app.services.starship_table import StarshipTableView
+from app.services.throttle import Priority
+
+_default_store: Optional[StarshipStore] = None
+_default_overlay: Optional[StarshipOverlay] = None
+
+
+async def get_http_client(request: Request) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Provide the application-scoped HTTP client created in the app lifespan.
+
+    When the lifespan has not run (e.g. the app is mounted without it), a
+    short-lived client is created for the duration of the request instead.
+
+    Args:
+        request (Request): The incoming request, used to reach the app state.
+
+    Yields:
+        httpx.AsyncClient: The pooled client to use for SWAPI calls.
+    """
+    client = getattr(request.app.state, "http_client", None)
+    if client is not None:
+        yield client
+        return
+
+    async with create_http_client(get_settings()) as client:
+        yield client
+
+
+async def get_resolver(
+    request: Request,
+    client: httpx.AsyncClient = Depends(get_http_client),
+) -> SwapiResolver:
+    """
+    Provide a resolver whose concurrency limit is shared across the whole request.
+
+    Identical SWAPI URLs are fetched once per request, concurrent requests
+    share in-flight fetches through the app's single-flight group, and
+    responses are served from the app's SWAPI cache when it is enabled.
+    Calls reaching SWAPI are interactive within the app's upstream budget.
+
+    Args:
+        request (Request): The incoming request, used to reach the app state.
+        client (httpx.AsyncClient): The shared HTTP client.
+
+    Returns:
+        SwapiResolver: A fresh resolver bound to the current request.
+    """
+    return _resolver(request, client, Priority.INTERACTIVE)
+
+
+async def get_crawl_resolver(
+    request: Request,
+    client: httpx.AsyncClient = Depends(get_http_client),
+) -> SwapiResolver:
+    """
+    Provide a resolver for requests crawling whole SWAPI listings.
+
+    It behaves like ``get_resolver``, but its upstream calls yield the
+    app's upstream budget to interactive lookups.
+
+    Args:
+        request (Request): The incoming request, used to reach the app state.
+        client (httpx.AsyncClient): The shared HTTP client.
+
+    Returns:
+        SwapiResolver: A fresh resolver bound to the current request.
+    """
+    return _resolver(request, client, Priority.CRAWL)
+
+
+def _resolver(
+    request: Request, client: httpx.AsyncClient, priority: Priority
+) -> SwapiResolver:
+    return SwapiResolver(
+        client,
+        get_settings().swapi_max_concurrency,
+        singleflight=getattr(request.app.state, "swapi_singleflight", None),
+        cache=getattr(request.app.state, "swapi_cache", None),
+        budget=getattr(request.app.state, "swapi_budget", None),
+        priority=priority,
+    )
+
+
+async def get_catalog(request: Request) -> Optional[SwapiCatalog]:
+    """
+    Provide the app's preloaded SWAPI catalog, if the lifespan created one.
+
+    Args:
+        request (Request): The incoming request, used to reach the app state.
+
+    Returns:
+        Optional[SwapiCatalog]: The catalog, or ``None`` when there is none.
+    """
+    return getattr(request.app.state, "swapi_catalog", None)
+
+
+async def get_pilots_view(request: Request) -> Optional[PilotsView]:
+    """
+    Provide the app's materialized pilot list, if the lifespan created one.
+
+    Args:
+        request (Request): The incoming request, used to reach the app state.
+
+    Returns:
+        Optional[PilotsView]: The materialized view, or ``None`` when there is none.
+    """
+    return getattr(request.app.state, "pilots_view", None)
+
+
+async def get_starship_table_view(request: Request) -> Optional[StarshipTableView]:
+    """
+    Provide the app's columnar starship table, if the lifespan created one.
+
+    Args:
+        request (Request): The incoming request, used to reach the app state.
+
+    Returns:
+        Optional[StarshipTableView]: The table view, or ``None`` when there is none.
+    """
+    return getattr(request.app.state, "starship_table_view", None)
+
+
+async def get_starship_store(request: Request) -> StarshipStore:
+    """
+    Provide the store holding locally maintained starships.
+
+    When the lifespan has not run, a process-wide in-memory store is used
+    instead so updates still persist between requests.
+
+    Args:
+        request (Request): The incoming request, used to reach the app state.
+
+    Returns:
+        StarshipStore: The starship store.
+    """
+    global _default_store
+    store = getattr(request.app.state, "starship_store", None)
+    if store is not None:
+        return store
+    if _default_store is None:
+        _default_store = MemoryStarshipStore()
+    return _default_store
+
+
+async def get_starship_overlay(
+    request: Request, store: StarshipStore = Depends(get_starship_store)
+) -> StarshipOverlay:
+    """
+    Provide the overlay merging locally maintained starships into SWAPI data.
+
+    Args:
+        request (Request): The incoming request, used to reach the app state.
+        store (StarshipStore): The starship store the overlay reads from.
+
+    Returns:
+        StarshipOverlay: The overlay over the current starship store.
+    """
+    global _default_overlay
+    overlay = getattr(request.app.state, "starship_overlay", None)
+    if overlay is not None:
+        return overlay
+    if _default_overlay is None or _default_overlay.store is not store:
+        _default_overlay = StarshipOverlay(store)
+    return _default_overlay
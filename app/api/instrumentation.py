@@ -0,0 +1,67 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (HTTP_REQUEST_DURATION, HTTP_REQUEST_SWAPI_CALLS,
+                              HTTP_REQUESTS_IN_FLIGHT, start_request_timings)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Record latency, concurrency and SWAPI usage of every HTTP request.
+
+    Requests are labelled with their route template rather than their path,
+    so ``/pilots/details/{pilot_name}`` is one series however many pilots
+    are looked up. With ``server_timing`` the per-request breakdown is also
+    sent to the client as a ``Server-Timing`` header.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings = start_request_timings()
+        responded = False
+
+        def observe(status: str) -> float:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUEST_DURATION.observe(
+                elapsed, method=scope["method"], route=_route(scope), status=status
+            )
+            return elapsed
+
+        async def send_with_timings(message: Message) -> None:
+            nonlocal responded
+            if message["type"] == "http.response.start":
+                responded = True
+                elapsed = observe(str(message["status"]))
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timings.server_timing(elapsed))
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            if not responded:
+                # An unhandled error: the server answers 500 without us.
+                observe("500")
+            HTTP_REQUEST_SWAPI_CALLS.observe(
+                timings.counts["swapi"], route=_route(scope)
+            )
+
+
+def _route(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
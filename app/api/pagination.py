@@ -0,0 +1,156 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from typing import Collection, List, Optional, Tuple
+
+from fastapi import HTTPException, Query
+
+DEFAULT_PAGE_SIZE = 10
+
+MAX_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class Pagination:
+    """
+    The slice of a collection requested by a client.
+
+    Attributes:
+        offset (int): How many items to skip.
+        limit (int): The maximum number of items to return.
+    """
+
+    offset: int
+    limit: int
+
+    def next_cursor(self, count: int) -> Optional[str]:
+        """
+        Return the cursor of the page following this one.
+
+        Args:
+            count (int): The total number of items in the collection.
+
+        Returns:
+            Optional[str]: The opaque cursor, or ``None`` on the last page.
+        """
+        offset = self.offset + self.limit
+        if offset >= count:
+            return None
+        return encode_cursor(Pagination(offset, self.limit))
+
+
+def encode_cursor(pagination: Pagination) -> str:
+    """
+    Encode a page position as an opaque, URL-safe cursor.
+
+    Args:
+        pagination (Pagination): The page the cursor points to.
+
+    Returns:
+        str: The cursor.
+    """
+    raw = f"{pagination.offset}:{pagination.limit}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Pagination:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor (str): The opaque cursor.
+
+    Returns:
+        Pagination: The page the cursor points to.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        offset, limit = (int(part) for part in raw.decode().split(":"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    if offset < 0 or not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return Pagination(offset, limit)
+
+
+def get_pagination(
+    page: Optional[int] = Query(None, ge=1),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Optional[Pagination]:
+    """
+    Read the ``page``, ``limit`` and ``cursor`` query parameters.
+
+    A cursor takes precedence over ``page``; ``limit`` overrides the page
+    size either way.
+
+    Args:
+        page (Optional[int]): The 1-based page number.
+        limit (Optional[int]): The page size.
+        cursor (Optional[str]): A cursor returned as ``next`` by a previous page.
+
+    Returns:
+        Optional[Pagination]: The requested page, or ``None`` when the client
+        did not ask for pagination.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    if cursor is not None:
+        pagination = decode_cursor(cursor)
+        if limit is not None:
+            pagination = Pagination(pagination.offset, limit)
+        return pagination
+    if page is None and limit is None:
+        return None
+    limit = limit or DEFAULT_PAGE_SIZE
+    return Pagination(((page or 1) - 1) * limit, limit)
+
+
+def parse_fields(
+    fields: Optional[str], allowed: Collection[str]
+) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated ``fields`` projection.
+
+    Args:
+        fields (Optional[str]): The raw ``fields`` query parameter.
+        allowed (Collection[str]): The fields the resource exposes.
+
+    Returns:
+        Optional[Tuple[str, ...]]: The requested fields, or ``None`` for all.
+
+    Raises:
+        HTTPException: If an unknown field is requested.
+    """
+    if fields is None:
+        return None
+    requested = tuple(field.strip() for field in fields.split(",") if field.strip())
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    return requested
+
+
+def paginated(
+    key: str, items: List[dict], count: int, pagination: Pagination
+) -> dict:
+    """
+    Wrap one page of items with the collection size and the next cursor.
+
+    Args:
+        key (str): The name of the items member.
+        items (List[dict]): The items on the page.
+        count (int): The total number of items in the collection.
+        pagination (Pagination): The page that was served.
+
+    Returns:
+        dict: ``{key: items, "count": count, "next": cursor}``.
+    """
+    return {key: items, "count": count, "next": pagination.next_cursor(count)}
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Query
+
+from app.services.starship_table import NUMERIC_COLUMNS, SORT_COLUMNS, Range
+
+
+@dataclass(frozen=True)
+class StarshipQuery:
+    """
+    The filters and sort order requested for a starship listing.
+
+    Attributes:
+        ranges (Dict[str, Range]): Inclusive ``(min, max)`` bounds by
+            numeric column.
+        sort (Tuple[Tuple[str, bool], ...]): ``(column, descending)`` keys,
+            most significant first.
+    """
+
+    ranges: Dict[str, Range]
+    sort: Tuple[Tuple[str, bool], ...] = ()
+
+
+def parse_sort(sort: Optional[str]) -> Tuple[Tuple[str, bool], ...]:
+    """
+    Parse a comma-separated ``sort`` parameter such as ``-crew_capacity,name``.
+
+    Args:
+        sort (Optional[str]): The raw ``sort`` query parameter; a leading
+            ``-`` sorts a column in descending order.
+
+    Returns:
+        Tuple[Tuple[str, bool], ...]: The ``(column, descending)`` keys.
+
+    Raises:
+        HTTPException: If a column cannot be sorted on.
+    """
+    if sort is None:
+        return ()
+    keys = []
+    for key in sort.split(","):
+        key = key.strip()
+        if key:
+            keys.append((key.lstrip("-"), key.startswith("-")))
+    unknown = [column for column, _ in keys if column not in SORT_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sort fields: {', '.join(unknown)}",
+        )
+    return tuple(keys)
+
+
+def get_starship_query(
+    min_cost_in_credits: Optional[float] = Query(None),
+    max_cost_in_credits: Optional[float] = Query(None),
+    min_max_atmosphering_speed: Optional[float] = Query(None),
+    max_max_atmosphering_speed: Optional[float] = Query(None),
+    min_crew_capacity: Optional[float] = Query(None),
+    max_crew_capacity: Optional[float] = Query(None),
+    min_passenger_capacity: Optional[float] = Query(None),
+    max_passenger_capacity: Optional[float] = Query(None),
+    min_cargo_capacity: Optional[float] = Query(None),
+    max_cargo_capacity: Optional[float] = Query(None),
+    sort: Optional[str] = None,
+) -> Optional[StarshipQuery]:
+    """
+    Read the ``min_<column>``, ``max_<column>`` and ``sort`` query parameters.
+
+    Bounds are inclusive and apply to the numeric value of the column, so
+    ``"1,000"`` matches ``min_cargo_capacity=1000``; starships whose value
+    is unknown never match a bound on that column.
+
+    Returns:
+        Optional[StarshipQuery]: The requested query, or ``None`` when the
+        client did not filter or sort.
+
+    Raises:
+        HTTPException: If a sort column is unknown.
+    """
+    bounds = {
+        "cost_in_credits": (min_cost_in_credits, max_cost_in_credits),
+        "max_atmosphering_speed": (
+            min_max_atmosphering_speed,
+            max_max_atmosphering_speed,
+        ),
+        "crew_capacity": (min_crew_capacity, max_crew_capacity),
+        "passenger_capacity": (min_passenger_capacity, max_passenger_capacity),
+        "cargo_capacity": (min_cargo_capacity, max_cargo_capacity),
+    }
+    ranges = {
+        column: bounds[column]
+        for column in NUMERIC_COLUMNS
+        if bounds[column] != (None, None)
+    }
+    keys = parse_sort(sort)
+    if not ranges and not keys:
+        return None
+    return StarshipQuery(ranges, keys)
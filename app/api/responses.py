@@ -0,0 +1,19 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.core.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with ``orjson`` when it is installed.
+
+    Content that is already encoded (``bytes``) is sent as-is, so cached or
+    materialized payloads are never serialized again.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -1,32 +1,191 @@
+from functools import partial
+from typing import List, Literal, NoReturn, Optional, Tuple
+
 import httpx
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
-from app.models.schemas import StarshipUpdate
-from app.services.swapi_service import (fetch_all_pilots_with_starships,
+from app.api.conditional import (NO_CACHE, if_match_version, is_not_modified,
+                                 make_etag, validated_response)
+from app.api.dependencies import (get_catalog, get_crawl_resolver,
+                                  get_pilots_view, get_resolver,
+                                  get_starship_overlay, get_starship_store,
+                                  get_starship_table_view)
+from app.api.pagination import (Pagination, get_pagination, paginated,
+                                parse_fields)
+from app.api.query import StarshipQuery, get_starship_query
+from app.api.responses import FastJSONResponse
+from app.api.streaming import (NDJSON_MEDIA_TYPE, iterate, json_array_chunks,
+                               limit_bytes, ndjson_lines, prefetch,
+                               split_lines)
+from app.core.serialization import loads
+from app.models.schemas import (MAX_BULK_BYTES, MAX_BULK_SIZE, MAX_PATCH_BYTES,
+                                BulkUpsertResult, GraphQuery, GraphResult,
+                                LocalStarshipList, NameBatch, Pilot, PilotList,
+                                PilotLookups, StarshipDetails, StarshipList,
+                                StarshipLookups, StarshipPatch, StarshipStats,
+                                StarshipUpdate, StarshipUpdateResult)
+from app.services.catalog import SwapiCatalog
+from app.services.graph import GraphExecutor, QueryError, parse_query
+from app.services.overlay import StarshipOverlay
+from app.services.pilots_view import PilotsView
+from app.services.resolver import SwapiResolver
+from app.services.starship_store import (StarshipNotFound, StarshipStore,
+                                         VersionConflict)
+from app.services.starship_table import (NUMERIC_COLUMNS, QUERY_FIELDS,
+                                         StarshipTable, StarshipTableView,
+                                         build_table)
+from app.services.swapi_service import (PILOT_FIELDS, STARSHIP_FIELDS,
+                                        fetch_all_pilots_with_starships,
+                                        fetch_all_starships,
                                         fetch_pilot_by_name,
+                                        fetch_pilots_by_names, fetch_pilots_page,
                                         fetch_starship_by_name,
-                                        fetch_starships)
+                                        fetch_starships_by_names,
+                                        fetch_starships, fetch_starships_page,
+                                        iter_pilots_with_starships, project)
 
 router = APIRouter()
 
 
-@router.get("/starships")
-async def get_starships():
+@router.get("/starships", response_model=StarshipList)
+async def get_starships(
+    request: Request,
+    fields: Optional[str] = None,
+    pagination: Optional[Pagination] = Depends(get_pagination),
+    query: Optional[StarshipQuery] = Depends(get_starship_query),
+    resolver: SwapiResolver = Depends(get_resolver),
+    catalog: SwapiCatalog = Depends(get_catalog),
+    overlay: StarshipOverlay = Depends(get_starship_overlay),
+    table_view: Optional[StarshipTableView] = Depends(get_starship_table_view),
+):
     """
     Retrieve a list of all starships from the SWAPI service.
 
+    Without ``page``, ``limit`` or ``cursor`` the first SWAPI page is returned
+    with SWAPI's ``next`` URL. With them, the requested slice is returned
+    with the total ``count`` and an opaque ``next`` cursor. Starships also
+    maintained locally are returned with their local fields.
+
+    With ``min_<column>``/``max_<column>`` filters or a ``sort`` order, the
+    query runs over every starship and all matches (or the requested page
+    of them) are returned with their total ``count``. ``fields`` may then
+    also select ``starship_class`` and the capacities.
+
+    Args:
+        fields (Optional[str]): Comma-separated starship fields to return.
+        pagination (Optional[Pagination]): The requested page, if any.
+        query (Optional[StarshipQuery]): The requested filters and order, if any.
+
     Returns:
         dict: A dictionary containing starship details and the
-        next page URL (if available).
+        next page URL or cursor (if available).
+
+    Raises:
+        HTTPException: If a field is unknown or SWAPI cannot be reached.
+    """
+    if query is not None:
+        selected = parse_fields(fields, QUERY_FIELDS) or STARSHIP_FIELDS
+        table = await _starship_table(table_view, overlay, resolver, catalog)
+        indexes = table.order(table.select(query.ranges), query.sort)
+        if pagination is not None:
+            page = indexes[pagination.offset:pagination.offset + pagination.limit]
+        else:
+            page = indexes
+        starships = [project(table.rows[index], selected) for index in page]
+        if pagination is None:
+            data = {"starships": starships, "count": len(indexes), "next": None}
+        else:
+            data = paginated("starships", starships, len(indexes), pagination)
+        return validated_response(request, data)
+
+    selected = parse_fields(fields, STARSHIP_FIELDS)
+    if pagination is None:
+        data = await fetch_starships(resolver)
+        starships = await overlay.apply(data["starships"])
+        data["starships"] = [project(starship, selected) for starship in starships]
+        return validated_response(request, data)
+
+    starships, count = await fetch_starships_page(
+        resolver, pagination.offset, pagination.limit, catalog
+    )
+    starships = await overlay.apply(starships)
+    starships = [project(starship, selected) for starship in starships]
+    return validated_response(
+        request, paginated("starships", starships, count, pagination)
+    )
+
+
+@router.get("/starships/stats", response_model=StarshipStats)
+async def get_starship_stats(
+    request: Request,
+    group_by: Optional[Literal["model", "starship_class"]] = None,
+    columns: Optional[str] = None,
+    query: Optional[StarshipQuery] = Depends(get_starship_query),
+    resolver: SwapiResolver = Depends(get_resolver),
+    catalog: SwapiCatalog = Depends(get_catalog),
+    overlay: StarshipOverlay = Depends(get_starship_overlay),
+    table_view: Optional[StarshipTableView] = Depends(get_starship_table_view),
+):
+    """
+    Aggregate the numeric starship columns, optionally by model or class.
+
+    Values are parsed as numbers (``"1,000"`` is 1000) and unknown values
+    are left out of the column statistics. The same ``min_<column>`` and
+    ``max_<column>`` filters as ``/starships`` apply.
+
+    Args:
+        group_by (Optional[str]): ``model`` or ``starship_class``.
+        columns (Optional[str]): Comma-separated numeric columns to
+            summarize; all of them by default.
+        query (Optional[StarshipQuery]): The requested filters, if any.
+
+    Returns:
+        dict: The number of matching starships and, per group, its size and
+        the ``count``, ``min``, ``max`` and ``avg`` of each column.
+
+    Raises:
+        HTTPException: If a column is unknown or SWAPI cannot be reached.
     """
-    return await fetch_starships()
+    selected = parse_fields(columns, NUMERIC_COLUMNS) or NUMERIC_COLUMNS
+    table = await _starship_table(table_view, overlay, resolver, catalog)
+    mask = table.select(query.ranges if query is not None else {})
+    return validated_response(
+        request,
+        {
+            "group_by": group_by,
+            "count": sum(mask),
+            "groups": table.aggregate(mask, group_by, selected),
+        },
+    )
+
 
+async def _starship_table(
+    table_view: Optional[StarshipTableView],
+    overlay: StarshipOverlay,
+    resolver: SwapiResolver,
+    catalog: Optional[SwapiCatalog],
+) -> StarshipTable:
+    if table_view is not None:
+        return await table_view.table(overlay, resolver)
+    return await build_table(await fetch_all_starships(resolver, catalog), overlay)
 
-@router.get("/starships/details/{starship_name}")
-async def get_starship_details(starship_name: str):
+
+@router.get("/starships/details/{starship_name}", response_model=StarshipDetails)
+async def get_starship_details(
+    request: Request,
+    starship_name: str,
+    resolver: SwapiResolver = Depends(get_resolver),
+    catalog: SwapiCatalog = Depends(get_catalog),
+    overlay: StarshipOverlay = Depends(get_starship_overlay),
+):
     """
     Retrieve details for a specific starship by name.
 
+    Local changes to the starship are merged into the SWAPI details, and
+    starships only maintained locally are served from the local store.
+
     Args:
         starship_name (str): The name of the starship to search for.
 
@@ -36,38 +195,169 @@ async def get_starship_details(starship_name: str):
     Raises:
         HTTPException: If the starship is not found.
     """
-    starship = await fetch_starship_by_name(starship_name)
+    starship = await fetch_starship_by_name(starship_name, resolver, catalog)
     if "error" in starship:
+        local = await overlay.local_details(starship_name)
+        if local is not None:
+            return validated_response(request, local)
         raise HTTPException(
             status_code=404,
             detail=starship["error"],
         )
-    return starship
+    [starship] = await overlay.apply([starship])
+    return validated_response(request, starship)
+
+
+@router.post("/starships/details:batch", response_model=StarshipLookups)
+async def get_starship_details_batch(
+    batch: NameBatch,
+    resolver: SwapiResolver = Depends(get_resolver),
+    catalog: SwapiCatalog = Depends(get_catalog),
+    overlay: StarshipOverlay = Depends(get_starship_overlay),
+):
+    """
+    Retrieve details for several starships by name in one request.
+
+    Local changes are merged in as for ``/starships/details/{starship_name}``.
+
+    Args:
+        batch (NameBatch): The starship names to look up.
+
+    Returns:
+        dict: The per-name ``results``, each with a ``status`` and either
+        ``data`` or an ``error``.
+    """
+    results = await fetch_starships_by_names(batch.names, resolver, catalog)
+    for result in results:
+        if result["status"] == 200:
+            [result["data"]] = await overlay.apply([result["data"]])
+        elif result["status"] == 404:
+            local = await overlay.local_details(result["name"])
+            if local is not None:
+                result.update(status=200, data=local)
+                del result["error"]
+    return FastJSONResponse({"results": results})
 
 
-@router.get("/pilots")
-async def list_pilots():
+@router.get("/pilots", response_model=PilotList)
+async def list_pilots(
+    request: Request,
+    stream: Optional[Literal["ndjson", "json"]] = None,
+    fields: Optional[str] = None,
+    pagination: Optional[Pagination] = Depends(get_pagination),
+    resolver: SwapiResolver = Depends(get_crawl_resolver),
+    pilots_view: PilotsView = Depends(get_pilots_view),
+):
     """
     Retrieve a list of pilots who have flown starships.
 
+    Once the catalog is loaded the precomputed, pre-serialized list is
+    returned as-is; until then pilots are crawled and enriched on demand.
+    With ``page``, ``limit`` or ``cursor`` only the requested slice is
+    enriched and it is returned with the total ``count`` and an opaque
+    ``next`` cursor. ``fields`` restricts the pilot fields returned, and
+    sub-resources only needed by other fields are not fetched.
+
+    Pilots can also be streamed as they are enriched, either as NDJSON
+    (``?stream=ndjson`` or ``Accept: application/x-ndjson``) or as a
+    chunked ``{"pilots": [...]}`` document (``?stream=json``). Streams
+    always cover every pilot.
+
+    Args:
+        stream (Optional[str]): ``ndjson`` or ``json`` to stream the pilots.
+        fields (Optional[str]): Comma-separated pilot fields to return.
+        pagination (Optional[Pagination]): The requested page, if any.
+
     Returns:
         dict: A dictionary containing a list of pilots.
 
     Raises:
-        HTTPException: If there is an error fetching pilot data.
+        HTTPException: If a field is unknown or there is an error fetching
+        pilot data.
     """
+    selected = parse_fields(fields, PILOT_FIELDS)
+    if stream is None and NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        stream = "ndjson"
+    if stream is not None:
+        return await _stream_pilots(stream, selected, resolver, pilots_view)
+
+    if pilots_view is not None and pilots_view.ready:
+        etag = make_etag(pilots_view.digest, selected, pagination)
+        last_modified = pilots_view.updated_at
+        content = partial(_pilots_from_view, pilots_view, selected, pagination)
+        if (
+            pagination is None
+            and selected is None
+            and not is_not_modified(request, etag, last_modified)
+        ):
+            content = await pilots_view.payload()
+        return validated_response(
+            request, content, etag=etag, last_modified=last_modified
+        )
+
+    try:
+        if pagination is not None:
+            pilots, count = await fetch_pilots_page(
+                resolver, pagination.offset, pagination.limit, selected
+            )
+            return validated_response(
+                request, paginated("pilots", pilots, count, pagination)
+            )
+        pilots = await fetch_all_pilots_with_starships(resolver, selected)
+        return validated_response(request, {"pilots": pilots})
+    except httpx.HTTPStatusError as exc:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch pilots: {exc}",
+        )
+
+
+def _pilots_from_view(
+    pilots_view: PilotsView,
+    fields: Optional[Tuple[str, ...]],
+    pagination: Optional[Pagination],
+) -> dict:
+    pilots = pilots_view.pilots
+    if pagination is None:
+        return {"pilots": [project(pilot, fields) for pilot in pilots]}
+    page = pilots[pagination.offset:pagination.offset + pagination.limit]
+    page = [project(pilot, fields) for pilot in page]
+    return paginated("pilots", page, len(pilots), pagination)
+
+
+async def _stream_pilots(
+    stream: str,
+    fields: Optional[Tuple[str, ...]],
+    resolver: SwapiResolver,
+    pilots_view: Optional[PilotsView],
+) -> StreamingResponse:
+    if pilots_view is not None and pilots_view.ready:
+        pilots = iterate(project(pilot, fields) for pilot in pilots_view.pilots)
+    else:
+        pilots = iter_pilots_with_starships(resolver, fields)
+
     try:
-        pilots = await fetch_all_pilots_with_starships()
-        return {"pilots": pilots}
+        pilots = await prefetch(pilots)
     except httpx.HTTPStatusError as exc:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch pilots: {exc}",
         )
 
+    if stream == "ndjson":
+        return StreamingResponse(ndjson_lines(pilots), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(
+        json_array_chunks("pilots", pilots), media_type="application/json"
+    )
+
 
-@router.get("/pilots/details/{pilot_name}")
-async def get_pilot_details(pilot_name: str):
+@router.get("/pilots/details/{pilot_name}", response_model=Pilot)
+async def get_pilot_details(
+    request: Request,
+    pilot_name: str,
+    resolver: SwapiResolver = Depends(get_resolver),
+    catalog: SwapiCatalog = Depends(get_catalog),
+):
     """
     Retrieve details for a specific pilot by name.
 
@@ -81,10 +371,10 @@ async def get_pilot_details(pilot_name: str):
         HTTPException: If there is an error or the pilot is not found.
     """
     try:
-        pilot_details = await fetch_pilot_by_name(pilot_name)
+        pilot_details = await fetch_pilot_by_name(pilot_name, resolver, catalog)
         if "error" in pilot_details:
             raise HTTPException(status_code=404, detail=pilot_details["error"])
-        return pilot_details
+        return validated_response(request, pilot_details)
     except HTTPException as e:
         raise e
     except httpx.HTTPStatusError:
@@ -93,49 +383,260 @@ async def get_pilot_details(pilot_name: str):
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
 
 
-# Simulated in-memory database for starships
-starships_db = {
-    "Millennium Falcon": {
-        "name": "Millennium Falcon",
-        "model": "YT-1300 light freighter",
-        "cost_in_credits": 100000,
-        "max_atmosphering_speed": 1050,
-        "crew_capacity": 4,
-        "passenger_capacity": 6,
-        "pilots": ["Han Solo", "Chewbacca"],
-    }
-}
+@router.post("/pilots/details:batch", response_model=PilotLookups)
+async def get_pilot_details_batch(
+    batch: NameBatch,
+    resolver: SwapiResolver = Depends(get_resolver),
+    catalog: SwapiCatalog = Depends(get_catalog),
+):
+    """
+    Retrieve details for several pilots by name in one request.
 
+    Args:
+        batch (NameBatch): The pilot names to look up.
 
-@router.put("/starships/update")
-async def update_starship(starship: StarshipUpdate):
+    Returns:
+        dict: The per-name ``results``, each with a ``status`` and either
+        ``data`` or an ``error``.
+    """
+    results = await fetch_pilots_by_names(batch.names, resolver, catalog)
+    return FastJSONResponse({"results": results})
+
+
+@router.post("/graphql", response_model=GraphResult)
+async def run_graph_query(
+    body: GraphQuery,
+    resolver: SwapiResolver = Depends(get_resolver),
+    catalog: SwapiCatalog = Depends(get_catalog),
+    overlay: StarshipOverlay = Depends(get_starship_overlay),
+):
+    """
+    Answer a nested query over pilots, starships, species and planets.
+
+    The client selects exactly the fields it needs, e.g. every pilot with
+    the cost and crew of its starships, in one round trip. Related
+    resources are loaded in batches and each distinct one at most once.
+
+    Args:
+        body (GraphQuery): The query, in a subset of the GraphQL syntax.
+
+    Returns:
+        dict: The selected fields under ``data``.
+
+    Raises:
+        HTTPException: If the query is invalid or SWAPI cannot be reached.
+    """
+    try:
+        selections = parse_query(body.query)
+    except QueryError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    try:
+        data = await GraphExecutor(resolver, catalog, overlay).execute(selections)
+    except httpx.HTTPStatusError:
+        raise HTTPException(
+            status_code=500, detail="Failed to fetch data from SWAPI."
+        )
+    return FastJSONResponse({"data": data})
+
+
+@router.get("/starships/local", response_model=LocalStarshipList)
+async def list_local_starships(
+    request: Request,
+    model: Optional[str] = None,
+    pilot: Optional[str] = None,
+    store: StarshipStore = Depends(get_starship_store),
+):
+    """
+    List the locally maintained starships, optionally filtered.
+
+    Args:
+        model (Optional[str]): Only starships of this model, ignoring case.
+        pilot (Optional[str]): Only starships flown by this pilot, ignoring case.
+
+    Returns:
+        dict: A dictionary containing the matching starships.
+    """
+    starships = await store.find(model=model, pilot=pilot)
+    return validated_response(
+        request,
+        {"starships": [starship.data for starship in starships]},
+        cache_control=NO_CACHE,
+    )
+
+
+@router.get("/starships/local/{starship_name}", response_model=StarshipUpdate)
+async def get_local_starship(
+    request: Request,
+    starship_name: str,
+    store: StarshipStore = Depends(get_starship_store),
+):
+    """
+    Retrieve a locally maintained starship along with its ``ETag``.
+
+    Args:
+        starship_name (str): The exact name of the starship.
+
+    Returns:
+        dict: The starship details.
+
+    Raises:
+        HTTPException: If the starship is not in the store.
+    """
+    starship = await store.get(starship_name)
+    if starship is None:
+        raise HTTPException(status_code=404, detail="Starship not found")
+    return validated_response(
+        request, starship.data, etag=starship.etag, cache_control=NO_CACHE
+    )
+
+
+@router.put("/starships/update", response_model=StarshipUpdateResult)
+async def update_starship(
+    starship: StarshipUpdate,
+    if_match: Optional[str] = Header(None),
+    store: StarshipStore = Depends(get_starship_store),
+):
     """
     Update the details of an existing starship.
 
+    Sending the ``ETag`` of the version the change is based on in
+    ``If-Match`` makes the update fail instead of overwriting a concurrent
+    change.
+
     Args:
         starship (StarshipUpdate): The updated starship data.
+        if_match (Optional[str]): The expected ``ETag`` of the starship.
 
     Returns:
         dict: A dictionary containing a success message
         and the updated starship details.
 
     Raises:
-        HTTPException: If the starship is not found in the in-memory database.
+        HTTPException: 404 if the starship is not in the store, 412 if it
+        no longer matches ``If-Match``.
     """
-    if starship.name not in starships_db:
+    try:
+        updated = await store.update(starship.model_dump(), if_match_version(if_match))
+    except StarshipNotFound:
         raise HTTPException(status_code=404, detail="Starship not found")
+    except VersionConflict:
+        raise HTTPException(status_code=412, detail="Precondition failed")
+
+    return FastJSONResponse(
+        {"message": "Starship updated successfully", "data": updated.data},
+        headers={"ETag": updated.etag},
+    )
+
+
+@router.patch("/starships/bulk", response_model=BulkUpsertResult)
+async def bulk_upsert_starships(
+    request: Request,
+    store: StarshipStore = Depends(get_starship_store),
+):
+    """
+    Create or partially update many starships in one request.
+
+    The body is either a JSON array of ``StarshipPatch`` objects or, with
+    ``Content-Type: application/x-ndjson``, one patch per line. Every patch
+    is validated first, then all valid ones are applied in a single store
+    transaction. Invalid patches are reported and skipped.
+
+    Args:
+        request (Request): The incoming request carrying the patches.
+
+    Returns:
+        dict: One result per patch, in order, with its ``status`` (``201``
+        created, ``200`` updated, ``422`` rejected) and the ``version``
+        written or the ``error``, plus the ``created``, ``updated`` and
+        ``failed`` counts.
+
+    Raises:
+        HTTPException: 400 if the body is not a JSON array or NDJSON, 413 if
+        it holds more than ``MAX_BULK_SIZE`` patches, is larger than
+        ``MAX_BULK_BYTES`` or has an NDJSON line longer than
+        ``MAX_PATCH_BYTES``.
+    """
+    raw_patches = await _read_patches(request)
+    results: List[dict] = []
+    valid: List[Tuple[int, dict]] = []
+    for index, raw in enumerate(raw_patches):
+        try:
+            if isinstance(raw, bytes):
+                patch = StarshipPatch.model_validate_json(raw)
+            else:
+                patch = StarshipPatch.model_validate(raw)
+        except ValidationError as exc:
+            name = raw.get("name") if isinstance(raw, dict) else None
+            if not isinstance(name, str):
+                name = None
+            results.append(
+                {"index": index, "name": name, "status": 422, "error": _errors(exc)}
+            )
+            continue
+        results.append({"index": index, "name": patch.name})
+        valid.append((index, patch.model_dump(exclude_none=True)))
+
+    outcomes = await store.upsert_many([patch for _, patch in valid])
+    for (index, _), outcome in zip(valid, outcomes):
+        results[index]["status"] = outcome.status
+        if outcome.starship is not None:
+            results[index]["version"] = outcome.starship.version
+        else:
+            results[index]["error"] = outcome.error
+
+    statuses = [result["status"] for result in results]
+    return FastJSONResponse(
+        {
+            "results": results,
+            "created": statuses.count(201),
+            "updated": statuses.count(200),
+            "failed": statuses.count(422),
+        }
+    )
+
+
+async def _read_patches(request: Request) -> list:
+    # Refuse a declared oversized body before reading any of it, and count
+    # bytes while reading in case the declaration is missing or wrong.
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > MAX_BULK_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Request bodies are limited to {MAX_BULK_BYTES} bytes.",
+        )
+    chunks = limit_bytes(request.stream(), MAX_BULK_BYTES)
+    if NDJSON_MEDIA_TYPE in request.headers.get("content-type", ""):
+        lines = []
+        async for line in split_lines(chunks, MAX_PATCH_BYTES):
+            lines.append(line)
+            # Stop reading an oversized stream instead of buffering all of it.
+            if len(lines) > MAX_BULK_SIZE:
+                _too_many_patches()
+        return lines
+    try:
+        body = loads(b"".join([chunk async for chunk in chunks]))
+    except ValueError:
+        body = None
+    if not isinstance(body, list):
+        raise HTTPException(
+            status_code=400,
+            detail="Expected a JSON array or NDJSON of starship patches.",
+        )
+    if len(body) > MAX_BULK_SIZE:
+        _too_many_patches()
+    return body
+
+
+def _too_many_patches() -> NoReturn:
+    raise HTTPException(
+        status_code=413,
+        detail=f"At most {MAX_BULK_SIZE} patches are accepted per request.",
+    )
+
 
-    starships_db[starship.name] = {
-        "name": starship.name,
-        "model": starship.model,
-        "cost_in_credits": starship.cost_in_credits,
-        "max_atmosphering_speed": starship.max_atmosphering_speed,
-        "crew_capacity": starship.crew_capacity,
-        "passenger_capacity": starship.passenger_capacity,
-        "pilots": starship.pilots,
-    }
-
-    return {
-        "message": "Starship updated successfully",
-        "data": starships_db[starship.name],
-    }
+def _errors(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'body'}: {error['msg']}"
+        for error in exc.errors()
+    )
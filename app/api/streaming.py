@@ -0,0 +1,178 @@
+from typing import AsyncIterator, Iterable, TypeVar
+
+import httpx
+from fastapi import HTTPException
+
+from app.core.serialization import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+T = TypeVar("T")
+
+
+async def iterate(items: Iterable[T]) -> AsyncIterator[T]:
+    """
+    Expose an in-memory iterable as an async iterator.
+
+    Args:
+        items (Iterable[T]): The items to yield.
+
+    Yields:
+        T: Each item in turn.
+    """
+    for item in items:
+        yield item
+
+
+async def prefetch(items: AsyncIterator[T]) -> AsyncIterator[T]:
+    """
+    Pull the first item now so errors surface before a response is started.
+
+    Once a streaming response has sent its headers its status can no longer
+    change, so failures while producing the first item are raised here,
+    where they can still become a regular error response.
+
+    Args:
+        items (AsyncIterator[T]): The items to stream.
+
+    Returns:
+        AsyncIterator[T]: An iterator yielding the same items, first one included.
+    """
+    try:
+        first = await anext(items)
+    except StopAsyncIteration:
+        return iterate(())
+
+    async def chained() -> AsyncIterator[T]:
+        yield first
+        async for item in items:
+            yield item
+
+    return chained()
+
+
+def _error_detail(exc: Exception) -> str:
+    if isinstance(exc, HTTPException):
+        return exc.detail
+    return "Failed to fetch pilots."
+
+
+async def ndjson_lines(items: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """
+    Encode items as newline-delimited JSON, one line per item.
+
+    A failure after streaming has started is reported as a final
+    ``{"error": ...}`` line.
+
+    Args:
+        items (AsyncIterator[dict]): The items to encode.
+
+    Yields:
+        bytes: One encoded line per item.
+    """
+    try:
+        async for item in items:
+            yield dumps(item) + b"\n"
+    except (HTTPException, httpx.HTTPError) as exc:
+        yield dumps({"error": _error_detail(exc)}) + b"\n"
+
+
+async def json_array_chunks(
+    key: str, items: AsyncIterator[dict]
+) -> AsyncIterator[bytes]:
+    """
+    Encode items as a ``{key: [...]}`` JSON document, one chunk per item.
+
+    A failure after streaming has started closes the array and adds an
+    ``"error"`` member to the document.
+
+    Args:
+        key (str): The name of the array member.
+        items (AsyncIterator[dict]): The items to encode.
+
+    Yields:
+        bytes: The document, chunk by chunk.
+    """
+    yield b"{" + dumps(key) + b":["
+    separator = b""
+    try:
+        async for item in items:
+            yield separator + dumps(item)
+            separator = b","
+    except (HTTPException, httpx.HTTPError) as exc:
+        yield b'],"error":' + dumps(_error_detail(exc)) + b"}"
+        return
+    yield b"]}"
+
+
+async def limit_bytes(
+    chunks: AsyncIterator[bytes], limit: int
+) -> AsyncIterator[bytes]:
+    """
+    Pass a streamed body through, refusing it once it exceeds ``limit`` bytes.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The body, chunk by chunk.
+        limit (int): The largest number of bytes accepted.
+
+    Yields:
+        bytes: Each chunk in turn.
+
+    Raises:
+        HTTPException: 413 as soon as more than ``limit`` bytes have been read.
+    """
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > limit:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Request bodies are limited to {limit} bytes.",
+            )
+        yield chunk
+
+
+async def split_lines(
+    chunks: AsyncIterator[bytes], max_length: int
+) -> AsyncIterator[bytes]:
+    """
+    Split a streamed body into its non-blank lines.
+
+    Chunks are appended to one buffer that is scanned for line breaks from
+    where the previous scan stopped, so each byte is examined once however
+    the body is chunked.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The body, chunk by chunk.
+        max_length (int): The longest line accepted, in bytes.
+
+    Yields:
+        bytes: Each non-blank line, without its line terminator.
+
+    Raises:
+        HTTPException: 413 if a line is longer than ``max_length`` bytes.
+    """
+    buffer = bytearray()
+    scanned = 0
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", scanned)) != -1:
+            line = bytes(buffer[start:end])
+            start = scanned = end + 1
+            _check_line(line, max_length)
+            if line.strip():
+                yield line
+        del buffer[:start]
+        scanned = len(buffer)
+        _check_line(buffer, max_length)
+    if buffer.strip():
+        yield bytes(buffer)
+
+
+def _check_line(line: bytes, max_length: int) -> None:
+    if len(line) > max_length:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lines are limited to {max_length} bytes.",
+        )
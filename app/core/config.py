@@ -0,0 +1,149 @@
+import os
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+ENV_PREFIX = "STARSHIP_"
+
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Application settings, overridable through ``STARSHIP_*`` environment variables.
+
+    Attributes:
+        http_max_connections (int): Maximum number of pooled upstream connections.
+        http_max_keepalive_connections (int): Idle connections kept alive in the pool.
+        http_keepalive_expiry (float): Seconds an idle connection is kept alive.
+        http2 (bool): Negotiate HTTP/2 with SWAPI when the ``h2`` package is present.
+        http_connect_timeout (float): Seconds allowed to establish a connection.
+        http_read_timeout (float): Seconds allowed to read an upstream response.
+        http_write_timeout (float): Seconds allowed to send an upstream request.
+        http_pool_timeout (float): Seconds to wait for a free pooled connection.
+        swapi_max_concurrency (int): Concurrent SWAPI calls allowed per request.
+        swapi_global_concurrency (int): Concurrent SWAPI calls allowed across the
+            whole process; ``0`` removes the limit.
+        swapi_rate_limit (float): Sustained SWAPI calls per second allowed across
+            the whole process; ``0`` removes the limit.
+        swapi_rate_burst (int): SWAPI calls allowed in a burst above the rate limit.
+        swapi_timeout (float): Overall seconds allowed for one SWAPI attempt,
+            body included.
+        swapi_retries (int): Extra attempts for SWAPI calls that failed transiently.
+        swapi_retry_backoff (float): Upper bound of the first retry delay; it
+            doubles with every further attempt.
+        swapi_retry_max_backoff (float): Upper bound of any retry delay.
+        swapi_breaker_threshold (int): Consecutive failed SWAPI calls that open
+            the circuit breaker; ``0`` disables it.
+        swapi_breaker_reset (float): Seconds the breaker stays open before
+            probing SWAPI again.
+        swapi_hedge_delay (float): Seconds after which a slow SWAPI call is
+            raced against a second one; ``0`` disables hedging.
+        cache_backend (str): ``memory``, ``redis``, ``socket`` or ``none`` to
+            disable caching.
+        cache_redis_url (str): Redis URL used by the ``redis`` cache backend.
+        cache_socket_path (str): Unix socket of the shared cache sidecar used by
+            the ``socket`` cache backend.
+        cache_max_bytes (int): Size bound of the in-process cache, or of the
+            sidecar's.
+        cache_ttl_default (float): Seconds a SWAPI response stays fresh.
+        cache_ttl_people (float): Freshness of ``people`` responses.
+        cache_ttl_starships (float): Freshness of ``starships`` responses.
+        cache_ttl_species (float): Freshness of ``species`` responses.
+        cache_ttl_planets (float): Freshness of ``planets`` responses.
+        cache_stale_ttl (float): Seconds a stale response is served while refreshing.
+        swapi_mode (str): ``online`` to call SWAPI, ``offline`` to serve the snapshot.
+        snapshot_path (str): SQLite file holding the local SWAPI snapshot.
+        snapshot_refresh_interval (float): Seconds between snapshot refreshes in
+            offline mode; ``0`` disables them.
+        catalog_preload (bool): Load the SWAPI catalog and its name indexes on startup.
+        warm_interval (float): Seconds between scheduled refreshes of the warmed
+            SWAPI data; keep it below the cache TTLs. ``0`` disables them.
+        warm_jitter (float): Fraction of ``warm_interval`` by which each refresh
+            is randomly moved earlier or later.
+        warm_lock_path (str): File locked by the worker revalidating a shared
+            ``redis`` or ``socket`` cache, so only one worker per host refreshes it.
+        store_backend (str): ``memory`` or ``sqlite`` storage for starship updates.
+        store_path (str): SQLite file used by the ``sqlite`` store backend.
+        server_timing (bool): Send a ``Server-Timing`` header breaking each
+            response down into SWAPI, cache and encoding time.
+        response_max_age (int): Seconds clients may reuse responses built from
+            SWAPI data before revalidating them.
+    """
+
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http2: bool = True
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 10.0
+    http_write_timeout: float = 10.0
+    http_pool_timeout: float = 5.0
+    swapi_max_concurrency: int = 10
+    swapi_global_concurrency: int = 32
+    swapi_rate_limit: float = 50.0
+    swapi_rate_burst: int = 100
+    swapi_timeout: float = 15.0
+    swapi_retries: int = 2
+    swapi_retry_backoff: float = 0.1
+    swapi_retry_max_backoff: float = 2.0
+    swapi_breaker_threshold: int = 5
+    swapi_breaker_reset: float = 30.0
+    swapi_hedge_delay: float = 0.0
+    cache_backend: str = "memory"
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_socket_path: str = "swapi_cache.sock"
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_ttl_default: float = 3600.0
+    cache_ttl_people: float = 3600.0
+    cache_ttl_starships: float = 3600.0
+    cache_ttl_species: float = 86400.0
+    cache_ttl_planets: float = 86400.0
+    cache_stale_ttl: float = 600.0
+    swapi_mode: str = "online"
+    snapshot_path: str = "swapi_snapshot.sqlite3"
+    snapshot_refresh_interval: float = 0.0
+    catalog_preload: bool = True
+    warm_interval: float = 3000.0
+    warm_jitter: float = 0.1
+    warm_lock_path: str = "swapi_warm.lock"
+    store_backend: str = "memory"
+    store_path: str = "starships.sqlite3"
+    response_max_age: int = 60
+    server_timing: bool = False
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Build settings from the environment, falling back to the defaults.
+
+        Returns:
+            Settings: The resolved application settings.
+        """
+        overrides = {}
+        for field in fields(cls):
+            raw = os.environ.get(f"{ENV_PREFIX}{field.name.upper()}")
+            if raw is None:
+                continue
+            if field.type in (bool, "bool"):
+                overrides[field.name] = _parse_bool(raw)
+            elif field.type in (int, "int"):
+                overrides[field.name] = int(raw)
+            elif field.type in (float, "float"):
+                overrides[field.name] = float(raw)
+            else:
+                overrides[field.name] = raw
+        return cls(**overrides)
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Return the process-wide settings, read once from the environment.
+
+    Returns:
+        Settings: The cached application settings.
+    """
+    return Settings.from_env()
@@ -0,0 +1,73 @@
+from importlib.util import find_spec
+from typing import Optional
+
+import httpx
+
+from app.core.config import Settings
+from app.core.resilience import CircuitBreaker, ResilientTransport, RetryPolicy
+
+
+def create_http_client(
+    settings: Settings, transport: Optional[httpx.AsyncBaseTransport] = None
+) -> httpx.AsyncClient:
+    """
+    Create the pooled HTTP client shared by every SWAPI call.
+
+    HTTP/2 is only negotiated when the optional ``h2`` package is installed,
+    otherwise the client falls back to HTTP/1.1 keep-alive connections.
+    Network calls go through a ``ResilientTransport`` that bounds, retries,
+    optionally hedges them and trips a circuit breaker on repeated failures.
+
+    Args:
+        settings (Settings): The application settings holding pool and timeout limits.
+        transport (Optional[httpx.AsyncBaseTransport]): Replaces the network
+            transport, e.g. to answer requests from the local snapshot.
+
+    Returns:
+        httpx.AsyncClient: A client configured with connection pooling and timeouts.
+    """
+    timeout = httpx.Timeout(
+        connect=settings.http_connect_timeout,
+        read=settings.http_read_timeout,
+        write=settings.http_write_timeout,
+        pool=settings.http_pool_timeout,
+    )
+    if transport is None:
+        transport = create_resilient_transport(settings)
+    return httpx.AsyncClient(timeout=timeout, transport=transport)
+
+
+def create_resilient_transport(settings: Settings) -> ResilientTransport:
+    """
+    Create the pooled network transport wrapped in the configured resilience.
+
+    Args:
+        settings (Settings): The application settings.
+
+    Returns:
+        ResilientTransport: The transport used to reach SWAPI.
+    """
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+    network = httpx.AsyncHTTPTransport(
+        limits=limits, http2=settings.http2 and find_spec("h2") is not None
+    )
+    breaker = None
+    if settings.swapi_breaker_threshold > 0:
+        breaker = CircuitBreaker(
+            settings.swapi_breaker_threshold, settings.swapi_breaker_reset
+        )
+    return ResilientTransport(
+        network,
+        retry=RetryPolicy(
+            retries=settings.swapi_retries,
+            base_delay=settings.swapi_retry_backoff,
+            max_delay=settings.swapi_retry_max_backoff,
+        ),
+        breaker=breaker,
+        timeout=settings.swapi_timeout or None,
+        hedge_delay=settings.swapi_hedge_delay,
+    )
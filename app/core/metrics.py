@@ -0,0 +1,339 @@
+import math
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+SERIALIZATION_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1
+)
+
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Base class of the metric families exported by ``Registry``.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): The one-line description exported as ``# HELP``.
+        labelnames (Tuple[str, ...]): The names of the metric's labels.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """
+        Yield the ``(suffix, labels, value)`` samples of the family.
+        """
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """
+        Render the family in the Prometheus text exposition format.
+
+        Returns:
+            List[str]: The exposition lines.
+        """
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing count, one per label combination.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self._values[self._key(labels)] += amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        for key, value in sorted(self._values.items()):
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class Gauge(Counter):
+    """
+    Value that goes up and down, one per label combination.
+    """
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self._values[self._key(labels)] -= amount
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in cumulative buckets.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = defaultdict(float)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+        self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                labels = _format_labels(
+                    (*self.labelnames, "le"), (*key, _format_value(bound))
+                )
+                yield "_bucket", labels, cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield "_sum", labels, self._sums[key]
+            yield "_count", labels, cumulative
+
+
+class Registry:
+    """
+    Collection of metric families rendered together by ``/metrics``.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Render every family in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition document.
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time spent serving HTTP requests, until the response starts.",
+        ("method", "route", "status"),
+    )
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+)
+HTTP_REQUEST_SWAPI_CALLS = REGISTRY.register(
+    Histogram(
+        "http_request_swapi_calls",
+        "SWAPI calls made while serving one HTTP request.",
+        ("route",),
+        buckets=COUNT_BUCKETS,
+    )
+)
+SWAPI_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "swapi_request_duration_seconds",
+        "Time spent on SWAPI calls, by resource type and status.",
+        ("resource", "status"),
+    )
+)
+SWAPI_REQUESTS_IN_FLIGHT = REGISTRY.register(
+    Gauge("swapi_requests_in_flight", "SWAPI calls currently in progress.")
+)
+SWAPI_CACHE_LOOKUPS = REGISTRY.register(
+    Counter(
+        "swapi_cache_lookups_total",
+        "SWAPI cache lookups by result: hit, stale, miss, revalidated, stale_error.",
+        ("result",),
+    )
+)
+SERIALIZATION_DURATION = REGISTRY.register(
+    Histogram(
+        "serialization_duration_seconds",
+        "Time spent encoding JSON.",
+        buckets=SERIALIZATION_BUCKETS,
+    )
+)
+
+
+class RequestTimings:
+    """
+    Time and event counts accumulated while serving one HTTP request.
+
+    Attributes:
+        durations (Dict[str, float]): Seconds spent per component.
+        counts (Dict[str, int]): Events per component.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def add(self, name: str, seconds: Optional[float] = None) -> None:
+        self.counts[name] += 1
+        if seconds is not None:
+            self.durations[name] += seconds
+
+    def server_timing(self, total: float) -> str:
+        """
+        Render the timings as a ``Server-Timing`` header value.
+
+        SWAPI time is summed over calls that may have run concurrently, so
+        it can exceed the total.
+
+        Args:
+            total (float): Seconds the request took until the response started.
+
+        Returns:
+            str: The header value, with durations in milliseconds.
+        """
+        entries = []
+        if self.counts["swapi"]:
+            entries.append(
+                f'swapi;dur={self.durations["swapi"] * 1000:.1f};'
+                f'desc="{self.counts["swapi"]} calls"'
+            )
+        lookups = {
+            result: self.counts[f"cache_{result}"]
+            for result in ("hit", "stale", "miss")
+            if self.counts[f"cache_{result}"]
+        }
+        if lookups:
+            desc = " ".join(f"{result}={count}" for result, count in lookups.items())
+            entries.append(f'cache;desc="{desc}"')
+        if self.counts["encode"]:
+            entries.append(f'encode;dur={self.durations["encode"] * 1000:.1f}')
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> RequestTimings:
+    """
+    Start accumulating timings for the request being served.
+
+    Tasks spawned while serving the request inherit the same accumulator.
+
+    Returns:
+        RequestTimings: The accumulator for the current request.
+    """
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def record_swapi_call(resource: str, status: str, seconds: float) -> None:
+    """
+    Record one SWAPI call.
+
+    Args:
+        resource (str): The resource type, e.g. ``people``.
+        status (str): The HTTP status, or ``error`` if no response arrived.
+        seconds (float): How long the call took.
+    """
+    SWAPI_REQUEST_DURATION.observe(seconds, resource=resource, status=status)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add("swapi", seconds)
+
+
+def record_cache_lookup(result: str) -> None:
+    """
+    Record one SWAPI cache lookup.
+
+    Args:
+        result (str): ``hit``, ``stale``, ``miss``, ``revalidated`` or
+            ``stale_error``.
+    """
+    SWAPI_CACHE_LOOKUPS.inc(result=result)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(f"cache_{result}")
+
+
+def record_serialization(seconds: float) -> None:
+    """
+    Record the time spent encoding one JSON document.
+
+    Args:
+        seconds (float): How long the encoding took.
+    """
+    SERIALIZATION_DURATION.observe(seconds)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add("encode", seconds)
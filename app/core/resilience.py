@@ -0,0 +1,256 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Set
+
+import httpx
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Request extension holding an ``AttemptHook``, called around every attempt.
+ATTEMPT_HOOK = "upstream_attempt"
+
+AttemptHook = Callable[
+    [Callable[[], Awaitable[httpx.Response]]], Awaitable[httpx.Response]
+]
+
+
+class CircuitOpenError(httpx.TransportError):
+    """
+    Raised instead of calling an upstream the circuit breaker considers down.
+    """
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How often and how long to wait before retrying a failed upstream call.
+
+    Delays grow exponentially from ``base_delay`` up to ``max_delay`` and
+    are fully jittered, so clients retrying together do not retry in step.
+
+    Attributes:
+        retries (int): Extra attempts after the first one.
+        base_delay (float): Upper bound of the first delay, in seconds.
+        max_delay (float): Upper bound of any delay, in seconds.
+    """
+
+    retries: int = 2
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Return the seconds to wait before retrying after a failed attempt.
+
+        Args:
+            attempt (int): The 0-based number of the attempt that failed.
+            retry_after (Optional[float]): The delay requested by the upstream
+                through ``Retry-After``, honoured up to ``max_delay``.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class CircuitBreaker:
+    """
+    Stop calling an upstream after repeated failures, then probe it again.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    every call fails fast for ``reset_timeout`` seconds. A single probe is
+    then let through every ``reset_timeout``: its success closes the
+    circuit, its failure keeps it open.
+
+    Attributes:
+        state (str): ``closed``, ``open`` or ``half_open``.
+        failures (int): Consecutive failures since the last success.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._clock = clock
+
+    def allow(self) -> bool:
+        """
+        Return whether a call may be sent upstream now.
+
+        Returns:
+            bool: ``False`` while the circuit is open or a probe is in flight.
+        """
+        if self.state == "closed":
+            return True
+        now = self._clock()
+        if now - self._opened_at < self.reset_timeout:
+            return False
+        # Also re-probe when an earlier probe never reported back.
+        self.state = "half_open"
+        self._opened_at = now
+        return True
+
+    def record_success(self) -> None:
+        """
+        Close the circuit after a successful call.
+        """
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """
+        Count a failed call, opening the circuit once the threshold is reached.
+        """
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self._opened_at = self._clock()
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    HTTP transport adding timeouts, retries, hedging and a circuit breaker.
+
+    Idempotent requests are bounded by an overall ``timeout`` per attempt,
+    body included, and retried with jittered exponential backoff on
+    connection errors, timeouts and ``429``/``502``/``503``/``504``
+    answers. With a ``hedge_delay``, an attempt still unanswered after that
+    many seconds is raced against a second identical request and the first
+    answer wins. Calls that still fail count against the ``breaker``, which
+    then rejects requests with ``CircuitOpenError`` until the upstream
+    recovers. Other methods are passed through untouched.
+
+    A request can carry an ``AttemptHook`` in its ``ATTEMPT_HOOK``
+    extension. It is called with a function sending one attempt, for the
+    first attempt, every retry and every hedged request alike, so callers
+    can charge rate limits and record metrics per request actually sent.
+    Time spent in the hook before sending does not count against
+    ``timeout``.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        retry: RetryPolicy = RetryPolicy(),
+        breaker: Optional[CircuitBreaker] = None,
+        timeout: Optional[float] = None,
+        hedge_delay: float = 0.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.transport = transport
+        self.retry = retry
+        self.breaker = breaker
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self._sleep = sleep
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in IDEMPOTENT_METHODS:
+            return await self.transport.handle_async_request(request)
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpenError("SWAPI circuit breaker is open.", request=request)
+
+        attempt = 0
+        while True:
+            last = attempt >= self.retry.retries
+            try:
+                response = await self._hedged(request)
+            except httpx.TransportError:
+                if last:
+                    self._record(success=False)
+                    raise
+                await self._sleep(self.retry.delay(attempt))
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self._record(success=True)
+                    return response
+                if last:
+                    self._record(success=False)
+                    return response
+                await self._sleep(self.retry.delay(attempt, _retry_after(response)))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def _record(self, success: bool) -> None:
+        if self.breaker is None:
+            return
+        if success:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    async def _hedged(self, request: httpx.Request) -> httpx.Response:
+        if self.hedge_delay <= 0:
+            return await self._attempt(request)
+
+        attempts: Set[asyncio.Task] = {asyncio.ensure_future(self._attempt(request))}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=self.hedge_delay)
+            if not done:
+                attempts.add(asyncio.ensure_future(self._attempt(request)))
+            error: Optional[BaseException] = None
+            while attempts:
+                done, attempts = await asyncio.wait(
+                    attempts, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in attempts:
+                task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+
+    async def _attempt(self, request: httpx.Request) -> httpx.Response:
+        hook: Optional[AttemptHook] = request.extensions.get(ATTEMPT_HOOK)
+        if hook is None:
+            return await self._bounded(request)
+        return await hook(lambda: self._bounded(request))
+
+    async def _bounded(self, request: httpx.Request) -> httpx.Response:
+        try:
+            return await asyncio.wait_for(self._send(request), self.timeout)
+        except asyncio.TimeoutError:
+            raise httpx.ReadTimeout(
+                f"SWAPI did not answer within {self.timeout} seconds.",
+                request=request,
+            ) from None
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        # Read the body here so the per-attempt timeout covers all of it.
+        response = await self.transport.handle_async_request(request)
+        try:
+            body = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(body),
+            extensions=response.extensions,
+        )
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return max(float(response.headers["retry-after"]), 0.0)
+    except (KeyError, ValueError):
+        return None
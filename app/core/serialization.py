@@ -0,0 +1,53 @@
+import json
+import time
+from typing import Any, Union
+
+from app.core.metrics import record_serialization
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON.
+
+    The optional ``orjson`` package is used when it is installed; otherwise
+    the standard library produces the same compact encoding. The time spent
+    is recorded in the serialization metrics.
+
+    Args:
+        value (Any): The JSON-serializable value.
+
+    Returns:
+        bytes: The encoded JSON.
+    """
+    started = time.perf_counter()
+    if orjson is not None:
+        encoded = orjson.dumps(value)
+    else:
+        encoded = json.dumps(
+            value, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode()
+    record_serialization(time.perf_counter() - started)
+    return encoded
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON, with ``orjson`` when it is installed.
+
+    Args:
+        data (Union[bytes, str]): The encoded JSON.
+
+    Returns:
+        Any: The decoded value.
+
+    Raises:
+        ValueError: If ``data`` is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,12 +1,204 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+from app.api.instrumentation import MetricsMiddleware
+from app.api.responses import FastJSONResponse
 from app.api.routes import router
+from app.core.config import get_settings
+from app.core.http import create_http_client
+from app.core.metrics import REGISTRY
+from app.core.resilience import CircuitOpenError
+from app.services.cache import SHARED_CACHE_BACKENDS, create_cache
+from app.services.catalog import SwapiCatalog
+from app.services.overlay import StarshipOverlay
+from app.services.pilots_view import PilotsView
+from app.services.resolver import SwapiResolver
+from app.services.singleflight import SingleFlight
+from app.services.snapshot import (SnapshotTransport, SwapiSnapshot,
+                                   refresh_periodically)
+from app.services.starship_store import create_store
+from app.services.starship_table import StarshipTableView
+from app.services.throttle import Priority, create_budget
+from app.services.warmer import CacheWarmer, FileLock
+
+logger = logging.getLogger(__name__)
+
+
+async def _stop(task: asyncio.Task) -> None:
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
+async def _refresh_catalog(catalog: SwapiCatalog, resolver: SwapiResolver) -> None:
+    try:
+        await catalog.refresh(resolver)
+    except Exception:
+        logger.exception("Failed to load the SWAPI catalog")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Manage resources shared by every request for the lifetime of the app.
+
+    A single pooled HTTP client is opened on startup so SWAPI connections
+    are reused across requests, and closed again on shutdown. Concurrent
+    requests for the same SWAPI URL share one in-flight call, and SWAPI
+    responses are cached for the lifetime of the app. In offline mode every
+    SWAPI call is answered from the local snapshot instead of the network;
+    online, every SWAPI call shares one rate limit and concurrency budget
+    in which background work yields to requests.
+    The SWAPI catalog, its name indexes and the cache are warmed in the
+    background and kept warm on a schedule, and the enriched pilot list is
+    materialized whenever the catalog changes; with a shared cache its
+    encoded payload is held once by the cache rather than by every worker.
+    Locally maintained starships live in the configured starship store and
+    are merged into the SWAPI starships served.
+    """
+    settings = get_settings()
+    async with AsyncExitStack() as stack:
+        snapshot = None
+        transport = None
+        if settings.swapi_mode == "offline":
+            snapshot = SwapiSnapshot(settings.snapshot_path)
+            stack.callback(snapshot.close)
+            transport = SnapshotTransport(snapshot)
+
+        client = await stack.enter_async_context(
+            create_http_client(settings, transport)
+        )
+        singleflight = SingleFlight()
+        cache = create_cache(settings, singleflight)
+        if cache is not None:
+            stack.push_async_callback(cache.close)
+        upstream_budget = create_budget(settings)
+        # Offline, only the snapshot refresh reaches SWAPI.
+        budget = upstream_budget if snapshot is None else None
+
+        def new_resolver(revalidate: bool = False) -> SwapiResolver:
+            return SwapiResolver(
+                client,
+                settings.swapi_max_concurrency,
+                singleflight=singleflight,
+                cache=cache,
+                budget=budget,
+                priority=Priority.BACKGROUND,
+                revalidate=revalidate,
+            )
+
+        store = create_store(settings)
+        stack.push_async_callback(store.close)
+
+        catalog = SwapiCatalog()
+        shared = settings.cache_backend in SHARED_CACHE_BACKENDS
+        pilots_view = PilotsView(
+            catalog, shared=cache.backend if shared and cache is not None else None
+        )
+        starship_table_view = StarshipTableView(catalog)
+        warmer = None
+        if settings.catalog_preload:
+            warmer = CacheWarmer(
+                catalog,
+                new_resolver,
+                cache=cache,
+                interval=settings.warm_interval if snapshot is None else 0.0,
+                jitter=settings.warm_jitter,
+                lock=FileLock(settings.warm_lock_path) if shared else None,
+            )
+            warm = asyncio.create_task(warmer.run())
+            stack.push_async_callback(_stop, warm)
 
-app = FastAPI()
+        if snapshot is not None and settings.snapshot_refresh_interval > 0:
+
+            async def on_snapshot_change() -> None:
+                if cache is not None:
+                    await cache.clear()
+                await _refresh_catalog(catalog, new_resolver())
+
+            refresh = asyncio.create_task(
+                refresh_periodically(
+                    snapshot,
+                    settings,
+                    on_change=on_snapshot_change,
+                    budget=upstream_budget,
+                )
+            )
+            stack.push_async_callback(_stop, refresh)
+
+        app.state.http_client = client
+        app.state.swapi_singleflight = singleflight
+        app.state.swapi_cache = cache
+        app.state.swapi_budget = budget
+        app.state.swapi_catalog = catalog
+        app.state.pilots_view = pilots_view
+        app.state.starship_table_view = starship_table_view
+        app.state.cache_warmer = warmer
+        app.state.starship_store = store
+        app.state.starship_overlay = StarshipOverlay(store)
+        try:
+            yield
+        finally:
+            del app.state.http_client
+            del app.state.swapi_singleflight
+            del app.state.swapi_cache
+            del app.state.swapi_budget
+            del app.state.swapi_catalog
+            del app.state.pilots_view
+            del app.state.starship_table_view
+            del app.state.cache_warmer
+            del app.state.starship_store
+            del app.state.starship_overlay
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.include_router(router)
 
+app.add_middleware(MetricsMiddleware, server_timing=get_settings().server_timing)
+
+
+@app.exception_handler(httpx.TransportError)
+async def swapi_unavailable(request: Request, exc: httpx.TransportError):
+    """
+    Answer ``503`` when SWAPI cannot be reached, instead of a bare ``500``.
+    """
+    headers = {}
+    if isinstance(exc, CircuitOpenError):
+        headers["Retry-After"] = str(int(get_settings().swapi_breaker_reset))
+    return FastJSONResponse(
+        {"detail": "SWAPI is unavailable."}, status_code=503, headers=headers
+    )
+
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Galactic Empire API"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Export the application metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/ready")
+async def ready(request: Request):
+    """
+    Report whether this instance has warmed its SWAPI data.
+
+    Load balancers should only route traffic to instances answering ``200``.
+    """
+    warmer = getattr(request.app.state, "cache_warmer", None)
+    if warmer is not None and not warmer.ready:
+        return FastJSONResponse({"status": "warming"}, status_code=503)
+    return {"status": "ready"}
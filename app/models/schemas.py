@@ -1,5 +1,15 @@
-from typing import List
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+MAX_BATCH_SIZE = 100
+
+MAX_BULK_SIZE = 10000
+
+MAX_BULK_BYTES = 16 * 1024 * 1024
+
+MAX_PATCH_BYTES = 64 * 1024
+
+MAX_QUERY_LENGTH = 10000
 
 
 class StarshipUpdate(BaseModel):
@@ -22,3 +32,329 @@ class StarshipUpdate(BaseModel):
     crew_capacity: int
     passenger_capacity: int
     pilots: List[str]
+
+
+class StarshipPatch(BaseModel):
+    """
+    Schema representing a partial starship update in a bulk upsert.
+
+    Only ``name`` is required. Omitted or ``null`` fields keep their stored
+    value; creating a starship requires every ``StarshipUpdate`` field.
+
+    Attributes:
+        name (str): The name of the starship.
+        model (Optional[str]): The model of the starship.
+        cost_in_credits (Optional[int]): The cost of the starship in credits.
+        max_atmosphering_speed (Optional[int]): The maximum atmospheric speed.
+        crew_capacity (Optional[int]): The number of crew members.
+        passenger_capacity (Optional[int]): The number of passengers.
+        pilots (Optional[List[str]]): The pilot names associated with the starship.
+    """
+    name: str
+    model: Optional[str] = None
+    cost_in_credits: Optional[int] = None
+    max_atmosphering_speed: Optional[int] = None
+    crew_capacity: Optional[int] = None
+    passenger_capacity: Optional[int] = None
+    pilots: Optional[List[str]] = None
+
+
+class NameBatch(BaseModel):
+    """
+    Schema representing a batch of resources to look up by name.
+
+    Attributes:
+        names (List[str]): The names to look up, at most ``MAX_BATCH_SIZE``.
+    """
+    names: List[str] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class GraphQuery(BaseModel):
+    """
+    Schema representing a nested query over pilots and starships.
+
+    Attributes:
+        query (str): The query, in a subset of the GraphQL syntax.
+    """
+    query: str = Field(min_length=1, max_length=MAX_QUERY_LENGTH)
+
+
+class GraphResult(BaseModel):
+    """
+    Schema representing the result of a nested query.
+
+    Attributes:
+        data (dict): The selected fields, keyed by field name or alias.
+    """
+    data: dict
+
+
+class StarshipSummary(BaseModel):
+    """
+    Schema representing a starship in listings.
+
+    Fields left out by a ``fields`` projection are omitted.
+
+    Filtered or sorted listings can also select the starship class and
+    capacities.
+
+    Attributes:
+        name (Optional[str]): The name of the starship.
+        model (Optional[str]): The model of the starship.
+        cost_in_credits (Optional[str]): The cost of the starship in credits.
+        max_atmosphering_speed (Optional[str]): The maximum atmospheric speed.
+        starship_class (Optional[str]): The class of the starship.
+        crew_capacity (Optional[str]): The number of crew members.
+        passenger_capacity (Optional[str]): The number of passengers.
+        cargo_capacity (Optional[str]): The cargo capacity of the starship.
+    """
+    name: Optional[str] = None
+    model: Optional[str] = None
+    cost_in_credits: Optional[str] = None
+    max_atmosphering_speed: Optional[str] = None
+    starship_class: Optional[str] = None
+    crew_capacity: Optional[str] = None
+    passenger_capacity: Optional[str] = None
+    cargo_capacity: Optional[str] = None
+
+
+class StarshipList(BaseModel):
+    """
+    Schema representing a page of starships.
+
+    Attributes:
+        starships (List[StarshipSummary]): The starships on the page.
+        next (Optional[str]): SWAPI's next page URL, or the next cursor when
+            paginating.
+        count (Optional[int]): The total number of starships, when paginating.
+    """
+    starships: List[StarshipSummary]
+    next: Optional[str] = None
+    count: Optional[int] = None
+
+
+class ColumnStats(BaseModel):
+    """
+    Schema representing a summary of one numeric starship column.
+
+    Attributes:
+        count (int): The number of starships whose value is known.
+        min (Optional[float]): The smallest known value.
+        max (Optional[float]): The largest known value.
+        avg (Optional[float]): The mean of the known values.
+    """
+    count: int
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+
+
+class StarshipGroup(BaseModel):
+    """
+    Schema representing the starships sharing one group key.
+
+    Attributes:
+        key (Optional[str]): The model or class shared by the group, or
+            ``None`` when the starships are not grouped.
+        count (int): The number of starships in the group.
+        stats (Dict[str, ColumnStats]): The summary of each requested column.
+    """
+    key: Optional[str] = None
+    count: int
+    stats: Dict[str, ColumnStats]
+
+
+class StarshipStats(BaseModel):
+    """
+    Schema representing aggregated starship statistics.
+
+    Attributes:
+        group_by (Optional[str]): The column the starships are grouped by.
+        count (int): The number of starships matching the filters.
+        groups (List[StarshipGroup]): The groups, largest first.
+    """
+    group_by: Optional[str] = None
+    count: int
+    groups: List[StarshipGroup]
+
+
+class StarshipDetails(BaseModel):
+    """
+    Schema representing the details of a starship.
+
+    Attributes:
+        name (Optional[str]): The name of the starship.
+        model (Optional[str]): The model of the starship.
+        cost_in_credits (Optional[str]): The cost of the starship in credits.
+        max_atmosphering_speed (Optional[str]): The maximum atmospheric speed.
+        crew_capacity (Optional[str]): The number of crew members.
+        passenger_capacity (Optional[str]): The number of passengers.
+        cargo_capacity (Optional[str]): The cargo capacity of the starship.
+    """
+    name: Optional[str] = None
+    model: Optional[str] = None
+    cost_in_credits: Optional[str] = None
+    max_atmosphering_speed: Optional[str] = None
+    crew_capacity: Optional[str] = None
+    passenger_capacity: Optional[str] = None
+    cargo_capacity: Optional[str] = None
+
+
+class PilotStarship(BaseModel):
+    """
+    Schema representing a starship flown by a pilot.
+
+    Attributes:
+        name (Optional[str]): The name of the starship.
+        model (Optional[str]): The model of the starship.
+    """
+    name: Optional[str] = None
+    model: Optional[str] = None
+
+
+class Pilot(BaseModel):
+    """
+    Schema representing a pilot enriched with species, homeworld and starships.
+
+    Fields left out by a ``fields`` projection are omitted.
+
+    Attributes:
+        name (Optional[str]): The name of the pilot.
+        height (Optional[str]): The height of the pilot.
+        gender (Optional[str]): The gender of the pilot.
+        weight (Optional[str]): The mass of the pilot.
+        birth_year (Optional[str]): The birth year of the pilot.
+        species_name (Optional[str]): The name of the pilot's species.
+        starships (Optional[List[PilotStarship]]): The starships flown.
+        homeworld (Optional[str]): The name of the pilot's homeworld.
+    """
+    name: Optional[str] = None
+    height: Optional[str] = None
+    gender: Optional[str] = None
+    weight: Optional[str] = None
+    birth_year: Optional[str] = None
+    species_name: Optional[str] = None
+    starships: Optional[List[PilotStarship]] = None
+    homeworld: Optional[str] = None
+
+
+class PilotList(BaseModel):
+    """
+    Schema representing a list or page of pilots.
+
+    Attributes:
+        pilots (List[Pilot]): The pilots.
+        count (Optional[int]): The total number of pilots, when paginating.
+        next (Optional[str]): The next cursor, when paginating.
+    """
+    pilots: List[Pilot]
+    count: Optional[int] = None
+    next: Optional[str] = None
+
+
+class StarshipLookup(BaseModel):
+    """
+    Schema representing one result of a batch starship lookup.
+
+    Attributes:
+        name (str): The name that was looked up.
+        status (int): ``200`` if found, otherwise the error status.
+        data (Optional[StarshipDetails]): The starship, if found.
+        error (Optional[str]): Why the lookup failed, if it did.
+    """
+    name: str
+    status: int
+    data: Optional[StarshipDetails] = None
+    error: Optional[str] = None
+
+
+class StarshipLookups(BaseModel):
+    """
+    Schema representing the results of a batch starship lookup.
+
+    Attributes:
+        results (List[StarshipLookup]): One result per name, in order.
+    """
+    results: List[StarshipLookup]
+
+
+class PilotLookup(BaseModel):
+    """
+    Schema representing one result of a batch pilot lookup.
+
+    Attributes:
+        name (str): The name that was looked up.
+        status (int): ``200`` if found, otherwise the error status.
+        data (Optional[Pilot]): The pilot, if found.
+        error (Optional[str]): Why the lookup failed, if it did.
+    """
+    name: str
+    status: int
+    data: Optional[Pilot] = None
+    error: Optional[str] = None
+
+
+class PilotLookups(BaseModel):
+    """
+    Schema representing the results of a batch pilot lookup.
+
+    Attributes:
+        results (List[PilotLookup]): One result per name, in order.
+    """
+    results: List[PilotLookup]
+
+
+class LocalStarshipList(BaseModel):
+    """
+    Schema representing locally maintained starships.
+
+    Attributes:
+        starships (List[StarshipUpdate]): The stored starships.
+    """
+    starships: List[StarshipUpdate]
+
+
+class StarshipUpdateResult(BaseModel):
+    """
+    Schema representing the outcome of ``PUT /starships/update``.
+
+    Attributes:
+        message (str): A confirmation message.
+        data (StarshipUpdate): The starship as stored.
+    """
+    message: str
+    data: StarshipUpdate
+
+
+class PatchResult(BaseModel):
+    """
+    Schema representing the outcome of one patch of a bulk upsert.
+
+    Attributes:
+        index (int): The position of the patch in the request.
+        name (Optional[str]): The patched starship, if the patch named one.
+        status (int): ``201`` created, ``200`` updated or ``422`` rejected.
+        version (Optional[int]): The version written, if any.
+        error (Optional[str]): Why the patch was rejected, if it was.
+    """
+    index: int
+    name: Optional[str] = None
+    status: int
+    version: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkUpsertResult(BaseModel):
+    """
+    Schema representing the outcome of a bulk upsert.
+
+    Attributes:
+        results (List[PatchResult]): One result per patch, in order.
+        created (int): The number of starships created.
+        updated (int): The number of starships updated.
+        failed (int): The number of patches rejected.
+    """
+    results: List[PatchResult]
+    created: int
+    updated: int
+    failed: int
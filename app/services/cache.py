@@ -0,0 +1,542 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (Any, AsyncIterator, Awaitable, Callable, Dict, Mapping,
+                    Optional, Protocol, Set)
+
+import httpx
+
+from app.core.config import Settings
+from app.core.metrics import record_cache_lookup
+from app.services.singleflight import SingleFlight
+
+Loader = Callable[[Dict[str, str]], Awaitable[httpx.Response]]
+
+SHARED_CACHE_BACKENDS = ("redis", "socket")
+
+PRIME_BATCH_SIZE = 256
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """
+    A cached SWAPI response body, its freshness window and its validators.
+
+    Attributes:
+        value (bytes): The raw response body.
+        stored_at (float): Unix time the entry was stored.
+        expires_at (float): Unix time after which the entry is stale.
+        stale_until (float): Unix time after which the entry can no longer be served.
+        etag (Optional[str]): The ``ETag`` SWAPI sent with the body, if any.
+        last_modified (Optional[str]): The ``Last-Modified`` SWAPI sent, if any.
+    """
+
+    value: bytes
+    stored_at: float
+    expires_at: float
+    stale_until: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def validators(self) -> Dict[str, str]:
+        """
+        Return the headers asking SWAPI to revalidate this entry.
+
+        Returns:
+            Dict[str, str]: ``If-None-Match`` and/or ``If-Modified-Since``.
+        """
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def encode_entry(entry: CacheEntry) -> bytes:
+    """
+    Serialize an entry for a shared backend: a JSON header line, then the body.
+
+    Args:
+        entry (CacheEntry): The entry.
+
+    Returns:
+        bytes: The serialized entry.
+    """
+    header = json.dumps(
+        {
+            "stored_at": entry.stored_at,
+            "expires_at": entry.expires_at,
+            "stale_until": entry.stale_until,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+        }
+    ).encode()
+    return header + b"\n" + entry.value
+
+
+def decode_entry(payload: bytes) -> CacheEntry:
+    """
+    Deserialize an entry produced by ``encode_entry``.
+
+    Args:
+        payload (bytes): The serialized entry.
+
+    Returns:
+        CacheEntry: The entry.
+    """
+    header, _, value = payload.partition(b"\n")
+    return CacheEntry(value=value, **json.loads(header))
+
+
+class CacheBackend(Protocol):
+    """
+    Storage used by ``SwapiCache`` to keep entries by normalized URL.
+    """
+
+    async def get(self, key: str) -> Optional[CacheEntry]: ...
+
+    async def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def clear(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """
+    In-process backend bounded by the total size of the cached bodies.
+
+    Entries are kept in least-recently-used order and the oldest ones are
+    evicted once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await self.delete(key)
+        if len(entry.value) > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.size += len(entry.value)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted.value)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry.value)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    async def close(self) -> None:
+        await self.clear()
+
+
+class RedisCacheBackend:
+    """
+    Backend storing entries in Redis so they survive restarts and are shared.
+
+    Any client exposing the ``redis.asyncio`` methods used here (``get``,
+    ``set``, ``delete`` and ``scan_iter``) can be passed in, which keeps the
+    backend testable against a local stand-in.
+    """
+
+    def __init__(self, client: Any, prefix: str = "swapi:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "swapi:") -> "RedisCacheBackend":
+        """
+        Connect to Redis through the optional ``redis`` package.
+
+        Args:
+            url (str): The Redis connection URL.
+            prefix (str): Prefix applied to every cache key.
+
+        Returns:
+            RedisCacheBackend: A backend bound to the given server.
+
+        Raises:
+            RuntimeError: If the ``redis`` package is not installed.
+        """
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:
+            raise RuntimeError(
+                "The redis cache backend requires the 'redis' package."
+            ) from exc
+        return cls(redis_asyncio.from_url(url), prefix)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        payload = await self.client.get(self.prefix + key)
+        if payload is None:
+            return None
+        return decode_entry(payload)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        ttl_ms = max(int((entry.stale_until - time.time()) * 1000), 1)
+        await self.client.set(self.prefix + key, encode_entry(entry), px=ttl_ms)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self._scan()]
+        if keys:
+            await self.client.delete(*keys)
+
+    async def close(self) -> None:
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close")
+        await close()
+
+    def _scan(self) -> AsyncIterator[Any]:
+        return self.client.scan_iter(match=f"{self.prefix}*")
+
+
+def resource_type(url: str) -> str:
+    """
+    Return the SWAPI resource type (``people``, ``starships``...) of a URL.
+
+    Args:
+        url (str): A SWAPI URL.
+
+    Returns:
+        str: The first path segment after ``/api/``, or an empty string.
+    """
+    path = httpx.URL(url).path
+    if "/api/" in path:
+        path = path.split("/api/", 1)[1]
+    return path.strip("/").split("/")[0]
+
+
+class SwapiCache:
+    """
+    TTL cache for SWAPI response bodies with stale-while-revalidate.
+
+    Fresh entries are served directly. Stale entries are still served while
+    a single background refresh replaces them, and missing or expired
+    entries are loaded once no matter how many callers ask concurrently.
+    Refreshes of an entry SWAPI sent validators for are conditional: a
+    ``304 Not Modified`` keeps the cached body and only renews its TTL.
+    When SWAPI cannot be reached at all, any entry still held by the backend
+    is served, however old, rather than failing the lookup.
+
+    Attributes:
+        backend (CacheBackend): Where entries are stored.
+        hits (int): Lookups answered with a fresh entry.
+        stale_hits (int): Lookups answered with a stale entry.
+        misses (int): Lookups that had to wait for SWAPI.
+        revalidations (int): Refreshes SWAPI answered with ``304 Not Modified``.
+        stale_errors (int): Lookups answered with an old entry because SWAPI
+            could not be reached.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttls: Dict[str, float],
+        default_ttl: float,
+        stale_ttl: float,
+        singleflight: Optional[SingleFlight] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.backend = backend
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stale_errors = 0
+        self._singleflight = (
+            singleflight if singleflight is not None else SingleFlight()
+        )
+        self._clock = clock
+        self._refreshes: Set[asyncio.Task] = set()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the hit and miss counters.
+
+        Returns:
+            Dict[str, int]: The ``hits``, ``stale_hits``, ``misses``,
+            ``revalidations`` and ``stale_errors`` counts.
+        """
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "stale_errors": self.stale_errors,
+        }
+
+    def ttl_for(self, key: str) -> float:
+        """
+        Return the freshness lifetime for a cache key.
+
+        Args:
+            key (str): The normalized SWAPI URL.
+
+        Returns:
+            float: The TTL in seconds for the key's resource type.
+        """
+        return self.ttls.get(resource_type(key), self.default_ttl)
+
+    async def get_or_load(self, key: str, loader: Loader) -> bytes:
+        """
+        Return the cached body for ``key``, loading it through ``loader`` if needed.
+
+        Args:
+            key (str): The normalized SWAPI URL.
+            loader (Loader): Sends the GET to SWAPI with the given extra headers
+                and returns the response, which may be ``304 Not Modified``.
+
+        Returns:
+            bytes: The response body.
+        """
+        entry = await self.backend.get(key)
+        now = self._clock()
+        if entry is not None and now < entry.expires_at:
+            self.hits += 1
+            record_cache_lookup("hit")
+            return entry.value
+        if entry is not None and now < entry.stale_until:
+            self.stale_hits += 1
+            record_cache_lookup("stale")
+            self._schedule_refresh(key, loader, entry)
+            return entry.value
+
+        self.misses += 1
+        record_cache_lookup("miss")
+        try:
+            return await self._singleflight.do(
+                key, lambda: self._load(key, loader, entry)
+            )
+        except httpx.HTTPError as exc:
+            if entry is None or not _upstream_down(exc):
+                raise
+            self.stale_errors += 1
+            record_cache_lookup("stale_error")
+            return entry.value
+
+    async def refresh(self, key: str, loader: Loader) -> bytes:
+        """
+        Reload ``key`` through ``loader`` even if its entry is still fresh.
+
+        The reload is conditional when the entry has validators, so an
+        unchanged resource only renews its TTL.
+
+        Args:
+            key (str): The normalized SWAPI URL.
+            loader (Loader): Sends the GET to SWAPI, as for ``get_or_load``.
+
+        Returns:
+            bytes: The response body.
+        """
+        entry = await self.backend.get(key)
+        return await self._singleflight.do(
+            key, lambda: self._load(key, loader, entry)
+        )
+
+    async def prime(self, key: str, value: bytes, replace: bool = False) -> bool:
+        """
+        Store a body obtained elsewhere where SWAPI's own response is missing.
+
+        An entry holding SWAPI validators is never overwritten: it came from
+        SWAPI itself, may hold more than ``value`` and can still be
+        revalidated upstream. Other primed entries are only overwritten once
+        stale, or at once with ``replace``.
+
+        Args:
+            key (str): The normalized SWAPI URL.
+            value (bytes): The response body SWAPI would send for ``key``.
+            replace (bool): Overwrite a fresh primed entry too.
+
+        Returns:
+            bool: Whether the entry was stored.
+        """
+        now = self._clock()
+        entry = await self.backend.get(key)
+        if entry is not None and (
+            entry.validators() or (not replace and now < entry.expires_at)
+        ):
+            return False
+        expires_at = now + self.ttl_for(key)
+        await self.backend.set(
+            key,
+            CacheEntry(
+                value=value,
+                stored_at=now,
+                expires_at=expires_at,
+                stale_until=expires_at + self.stale_ttl,
+            ),
+        )
+        return True
+
+    async def prime_many(
+        self, values: Mapping[str, bytes], replace: bool = False
+    ) -> int:
+        """
+        Prime many entries, ``PRIME_BATCH_SIZE`` backend calls at a time.
+
+        Shared backends pipeline the concurrent calls, rather than paying
+        one round trip per entry.
+
+        Args:
+            values (Mapping[str, bytes]): The bodies, by normalized SWAPI URL.
+            replace (bool): Overwrite fresh primed entries too.
+
+        Returns:
+            int: The number of entries stored.
+        """
+        items = list(values.items())
+        stored = 0
+        for start in range(0, len(items), PRIME_BATCH_SIZE):
+            results = await asyncio.gather(
+                *(
+                    self.prime(key, value, replace)
+                    for key, value in items[start:start + PRIME_BATCH_SIZE]
+                )
+            )
+            stored += sum(results)
+        return stored
+
+    async def invalidate(self, key: str) -> None:
+        """
+        Drop a single entry from the cache.
+
+        Args:
+            key (str): The normalized SWAPI URL.
+        """
+        await self.backend.delete(key)
+
+    async def clear(self) -> None:
+        """
+        Drop every entry from the cache.
+        """
+        await self.backend.clear()
+
+    async def close(self) -> None:
+        """
+        Cancel pending refreshes and release the backend.
+        """
+        for task in self._refreshes:
+            task.cancel()
+        await asyncio.gather(*self._refreshes, return_exceptions=True)
+        await self.backend.close()
+
+    async def _load(
+        self, key: str, loader: Loader, previous: Optional[CacheEntry]
+    ) -> bytes:
+        response = await loader(previous.validators() if previous else {})
+        if response.status_code == 304 and previous is not None:
+            self.revalidations += 1
+            record_cache_lookup("revalidated")
+            value = previous.value
+            etag = response.headers.get("etag", previous.etag)
+            last_modified = response.headers.get(
+                "last-modified", previous.last_modified
+            )
+        else:
+            value = response.content
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+
+        now = self._clock()
+        expires_at = now + self.ttl_for(key)
+        await self.backend.set(
+            key,
+            CacheEntry(
+                value=value,
+                stored_at=now,
+                expires_at=expires_at,
+                stale_until=expires_at + self.stale_ttl,
+                etag=etag,
+                last_modified=last_modified,
+            ),
+        )
+        return value
+
+    def _schedule_refresh(
+        self, key: str, loader: Loader, previous: CacheEntry
+    ) -> None:
+        async def refresh() -> None:
+            try:
+                await self._singleflight.do(
+                    key, lambda: self._load(key, loader, previous)
+                )
+            except httpx.HTTPError:
+                # Keep serving the stale entry; the next lookup retries.
+                pass
+
+        task = asyncio.ensure_future(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+
+def _upstream_down(exc: httpx.HTTPError) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return isinstance(exc, httpx.TransportError)
+
+
+def create_cache(
+    settings: Settings, singleflight: Optional[SingleFlight] = None
+) -> Optional[SwapiCache]:
+    """
+    Build the SWAPI cache configured by the settings.
+
+    Args:
+        settings (Settings): The application settings.
+        singleflight (Optional[SingleFlight]): Group used to collapse concurrent loads.
+
+    Returns:
+        Optional[SwapiCache]: The cache, or ``None`` when caching is disabled.
+    """
+    if settings.cache_backend == "none":
+        return None
+    if settings.cache_backend == "redis":
+        backend = RedisCacheBackend.from_url(settings.cache_redis_url)
+    elif settings.cache_backend == "socket":
+        from app.services.shared_cache import SocketCacheBackend
+
+        backend = SocketCacheBackend(settings.cache_socket_path)
+    else:
+        backend = MemoryCacheBackend(settings.cache_max_bytes)
+
+    return SwapiCache(
+        backend,
+        ttls={
+            "people": settings.cache_ttl_people,
+            "starships": settings.cache_ttl_starships,
+            "species": settings.cache_ttl_species,
+            "planets": settings.cache_ttl_planets,
+        },
+        default_ttl=settings.cache_ttl_default,
+        stale_ttl=settings.cache_stale_ttl,
+        singleflight=singleflight,
+    )
@@ -0,0 +1,209 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+
+from app.services.name_index import NameIndex
+from app.services.records import RECORD_TYPES, AnyRecord, PersonRecord
+from app.services.resolver import SwapiResolver
+from app.services.swapi_service import (RESOURCES, fetch_all_resources,
+                                        matches_search, pilot_details)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CatalogChange:
+    """
+    The resources that changed during one catalog refresh.
+
+    Attributes:
+        version (int): The catalog version after the refresh.
+        upserted (Dict[str, Set[int]]): Ids added or modified, by resource type.
+        removed (Dict[str, Set[int]]): Ids no longer present, by resource type.
+    """
+
+    version: int
+    upserted: Dict[str, Set[int]] = field(default_factory=dict)
+    removed: Dict[str, Set[int]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return any(self.upserted.values()) or any(self.removed.values())
+
+
+class SwapiCatalog:
+    """
+    In-memory copy of every SWAPI person, starship, species and planet.
+
+    The catalog is refreshed as a whole from the resolver (and therefore from
+    the response cache or the offline snapshot). Resources are kept as
+    compact records (see ``app.services.records``) holding only the served
+    fields, keyed and cross-referenced by integer id. Only resources whose
+    served fields changed are re-indexed, and listeners registered with
+    ``subscribe`` are told which ones so they can update derived data
+    incrementally.
+
+    Attributes:
+        resources (Dict[str, Dict[int, AnyRecord]]): Records by type and id.
+        indexes (Dict[str, NameIndex]): Name indexes over people and starships.
+        version (int): Incremented every time a refresh changes the catalog.
+    """
+
+    INDEXED = ("people", "starships")
+
+    def __init__(self):
+        self.resources: Dict[str, Dict[int, AnyRecord]] = {r: {} for r in RESOURCES}
+        self.indexes: Dict[str, NameIndex] = {r: NameIndex() for r in self.INDEXED}
+        self.version = 0
+        self._loaded = False
+        self._listeners: List[Callable[["SwapiCatalog", CatalogChange], None]] = []
+
+    @property
+    def ready(self) -> bool:
+        """
+        Whether the catalog has been loaded at least once.
+        """
+        return self._loaded
+
+    def subscribe(
+        self, listener: Callable[["SwapiCatalog", CatalogChange], None]
+    ) -> None:
+        """
+        Call ``listener`` after the first load and every refresh that changes it.
+
+        Args:
+            listener (Callable[[SwapiCatalog, CatalogChange], None]): The callback.
+        """
+        self._listeners.append(listener)
+
+    def get(self, resource: str, id: Optional[int]) -> Optional[AnyRecord]:
+        """
+        Return a resource by id.
+
+        Args:
+            resource (str): The resource type.
+            id (Optional[int]): The resource id.
+
+        Returns:
+            Optional[AnyRecord]: The record, or ``None`` if it is unknown.
+        """
+        return self.resources[resource].get(id)
+
+    def pilot(self, person: PersonRecord) -> dict:
+        """
+        Join a person with its species, homeworld and starships.
+
+        Args:
+            person (PersonRecord): The person.
+
+        Returns:
+            dict: The enriched pilot, as served by the pilot endpoints.
+        """
+        species = person.species_ids
+        starships = (self.get("starships", id) for id in person.starship_ids)
+        return pilot_details(
+            person,
+            self.get("species", species[0]) if species else None,
+            self.get("planets", person.homeworld_id),
+            [starship for starship in starships if starship is not None],
+        )
+
+    def find(self, resource: str, name: str) -> List[AnyRecord]:
+        """
+        Return the resources whose name equals ``name``, ignoring case.
+
+        Args:
+            resource (str): ``people`` or ``starships``.
+            name (str): The exact name to look up.
+
+        Returns:
+            List[AnyRecord]: The matching records.
+        """
+        return [self.get(resource, id) for id in self.indexes[resource].lookup(name)]
+
+    def match(self, resource: str, text: str) -> List[AnyRecord]:
+        """
+        Return the resources SWAPI's ``?search=`` would return for ``text``.
+
+        Resources whose name (or model, for starships) contains ``text``,
+        ignoring case, are returned in id order.
+
+        Args:
+            resource (str): ``people`` or ``starships``.
+            text (str): The searched text.
+
+        Returns:
+            List[AnyRecord]: The matching records.
+        """
+        records = self.resources[resource]
+        return [
+            records[id]
+            for id in sorted(records)
+            if matches_search(resource, records[id], text)
+        ]
+
+    def search(self, resource: str, text: str, limit: int = 10) -> List[AnyRecord]:
+        """
+        Return the resources best matching a partial name, best first.
+
+        The ranking is fuzzy, for search-as-you-type; lookups by name use
+        ``find`` and ``match`` instead.
+
+        Args:
+            resource (str): ``people`` or ``starships``.
+            text (str): The partial name.
+            limit (int): The maximum number of resources to return.
+
+        Returns:
+            List[AnyRecord]: The ranked records.
+        """
+        ids = self.indexes[resource].search(text, limit=limit)
+        return [self.get(resource, id) for id in ids]
+
+    async def refresh(self, resolver: SwapiResolver) -> CatalogChange:
+        """
+        Reload every resource and re-index the ones that changed.
+
+        Args:
+            resolver (SwapiResolver): The resolver used to crawl SWAPI.
+
+        Returns:
+            CatalogChange: The resources that changed.
+        """
+        fetched = await fetch_all_resources(resolver)
+        change = CatalogChange(version=self.version)
+
+        for resource, items in fetched.items():
+            current = self.resources[resource]
+            records = map(RECORD_TYPES[resource].from_swapi, items)
+            latest = {record.id: record for record in records if record.id is not None}
+            upserted = {
+                id for id, record in latest.items() if current.get(id) != record
+            }
+            removed = set(current) - set(latest)
+            self.resources[resource] = latest
+
+            index = self.indexes.get(resource)
+            if index is not None:
+                for id in removed:
+                    index.remove(id)
+                for id in upserted:
+                    index.add(id, latest[id].name or "")
+
+            change.upserted[resource] = upserted
+            change.removed[resource] = removed
+
+        if not change and self.ready:
+            return change
+
+        self.version += 1
+        change.version = self.version
+        self._loaded = True
+        for listener in self._listeners:
+            listener(self, change)
+        logger.info(
+            "SWAPI catalog refreshed to version %d (%d changed, %d removed)",
+            self.version,
+            sum(len(urls) for urls in change.upserted.values()),
+            sum(len(urls) for urls in change.removed.values()),
+        )
+        return change
@@ -0,0 +1,103 @@
+import asyncio
+from typing import (Awaitable, Callable, Dict, Generic, Hashable, List,
+                    Sequence, TypeVar)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Batch and deduplicate loads of keyed values within one request.
+
+    Keys requested while the event loop is busy with one round of work are
+    queued and loaded together by a single ``batch`` call once that round
+    yields, so resolvers written one object at a time still hit the source
+    once per level. Results are cached per key for the loader's lifetime:
+    every distinct key is loaded at most once.
+
+    Attributes:
+        batches (int): The number of ``batch`` calls made.
+    """
+
+    def __init__(self, batch: Callable[[List[K]], Awaitable[Sequence[V]]]):
+        self.batches = 0
+        self._batch = batch
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+
+    async def load(self, key: K) -> V:
+        """
+        Load the value of one key.
+
+        Args:
+            key (K): The key.
+
+        Returns:
+            V: The value ``batch`` returned for the key.
+
+        Raises:
+            ValueError: If ``batch`` returned fewer or more values than keys.
+        """
+        return await asyncio.shield(self._future(key))
+
+    async def load_many(self, keys: Sequence[K]) -> List[V]:
+        """
+        Load the values of several keys in one batch.
+
+        Args:
+            keys (Sequence[K]): The keys.
+
+        Returns:
+            List[V]: The values, in key order.
+
+        Raises:
+            ValueError: If ``batch`` returned fewer or more values than keys.
+        """
+        futures = [self._future(key) for key in keys]
+        return list(await asyncio.shield(asyncio.gather(*futures)))
+
+    def prime(self, key: K, value: V) -> None:
+        """
+        Cache a value obtained elsewhere, unless the key is already loaded.
+
+        Args:
+            key (K): The key.
+            value (V): The value.
+        """
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def _future(self, key: K) -> asyncio.Future:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                loop.call_soon(self._dispatch)
+        return future
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        self.batches += 1
+        asyncio.ensure_future(self._run(keys))
+
+    async def _run(self, keys: List[K]) -> None:
+        try:
+            values = list(await self._batch(keys))
+            if len(values) != len(keys):
+                raise ValueError(
+                    f"Batch returned {len(values)} values for {len(keys)} keys."
+                )
+        except Exception as exc:
+            for key in keys:
+                future = self._futures[key]
+                future.set_exception(exc)
+                # Waiters still get the error; keys nobody awaits stay quiet.
+                future.exception()
+            return
+        for key, value in zip(keys, values):
+            self._futures[key].set_result(value)
@@ -0,0 +1,360 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.catalog import SwapiCatalog
+from app.services.dataloader import DataLoader
+from app.services.overlay import StarshipOverlay
+from app.services.records import (RECORD_TYPES, AnyRecord, PersonRecord,
+                                  resource_url)
+from app.services.resolver import SwapiResolver, gather_all
+from app.services.starship_table import QUERY_FIELDS, starship_row
+from app.services.swapi_service import BASE_URL, fetch_all_starships
+
+SCALARS: Dict[str, Dict[str, str]] = {
+    "Pilot": {
+        "name": "name",
+        "height": "height",
+        "gender": "gender",
+        "weight": "mass",
+        "birth_year": "birth_year",
+    },
+    "Starship": {field: field for field in QUERY_FIELDS},
+    "Species": {"name": "name"},
+    "Planet": {"name": "name"},
+}
+
+RELATIONS: Dict[str, Dict[str, str]] = {
+    "Query": {
+        "pilots": "Pilot",
+        "pilot": "Pilot",
+        "starships": "Starship",
+        "starship": "Starship",
+    },
+    "Pilot": {"species": "Species", "homeworld": "Planet", "starships": "Starship"},
+}
+
+ARGUMENTS: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("Query", "pilot"): ("name",),
+    ("Query", "starship"): ("name",),
+}
+
+# Selection sets nested deeper than the schema allows are refused while
+# parsing, before they can exhaust the recursion limit.
+MAX_DEPTH = 4
+
+_TOKEN = re.compile(
+    r"""
+    (?P<skip>[\s,]+|\#[^\n]*)
+    | (?P<punct>[{}():])
+    | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+    | (?P<string>"(?:[^"\\\n]|\\.)*")
+    | (?P<number>-?\d+(?:\.\d+)?)
+    """,
+    re.VERBOSE,
+)
+
+
+class QueryError(ValueError):
+    """
+    Raised when a query is malformed or selects fields that do not exist.
+    """
+
+
+@dataclass(frozen=True)
+class Selection:
+    """
+    One field selected by a query.
+
+    Attributes:
+        name (str): The field name.
+        alias (str): The key the field is returned under.
+        arguments (Dict[str, Any]): The field arguments.
+        selections (Optional[Tuple[Selection, ...]]): The sub-selection of an
+            object field, ``None`` for scalar fields.
+    """
+
+    name: str
+    alias: str
+    arguments: Dict[str, Any]
+    selections: Optional[Tuple["Selection", ...]] = None
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens: List[Tuple[str, str]] = []
+        position = 0
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if match is None:
+                raise QueryError(f"Unexpected character {text[position]!r}.")
+            if match.lastgroup != "skip":
+                self.tokens.append((match.lastgroup, match.group()))
+            position = match.end()
+        self.position = 0
+        self.depth = 0
+
+    def peek(self, value: Optional[str] = None) -> bool:
+        if self.position >= len(self.tokens):
+            return False
+        return value is None or self.tokens[self.position][1] == value
+
+    def take(self, kind: Optional[str] = None, value: Optional[str] = None) -> str:
+        if self.position >= len(self.tokens):
+            raise QueryError("Unexpected end of query.")
+        token_kind, token = self.tokens[self.position]
+        if (kind is not None and token_kind != kind) or (
+            value is not None and token != value
+        ):
+            raise QueryError(f"Unexpected {token!r}.")
+        self.position += 1
+        return token
+
+    def document(self) -> Tuple[Selection, ...]:
+        if self.peek("query"):
+            self.take()
+            if not self.peek("{"):
+                self.take("name")
+        selections = self.selection_set()
+        if self.peek():
+            raise QueryError(f"Unexpected {self.tokens[self.position][1]!r}.")
+        return selections
+
+    def selection_set(self) -> Tuple[Selection, ...]:
+        self.take("punct", "{")
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise QueryError(f"Selections are nested more than {MAX_DEPTH} deep.")
+        selections = [self.selection()]
+        while not self.peek("}"):
+            selections.append(self.selection())
+        self.take("punct", "}")
+        self.depth -= 1
+        return tuple(selections)
+
+    def selection(self) -> Selection:
+        alias = name = self.take("name")
+        if self.peek(":"):
+            self.take()
+            name = self.take("name")
+        arguments = {}
+        if self.peek("("):
+            self.take()
+            while not self.peek(")"):
+                argument = self.take("name")
+                self.take("punct", ":")
+                arguments[argument] = self.value()
+            self.take("punct", ")")
+        selections = self.selection_set() if self.peek("{") else None
+        return Selection(name, alias, arguments, selections)
+
+    def value(self) -> Any:
+        kind, token = self.tokens[self.position] if self.peek() else (None, None)
+        self.take()
+        if kind == "string":
+            return re.sub(r"\\(.)", r"\1", token[1:-1])
+        if kind == "number":
+            return float(token) if "." in token else int(token)
+        if token in ("true", "false", "null"):
+            return {"true": True, "false": False, "null": None}[token]
+        raise QueryError(f"Unexpected {token!r}.")
+
+
+def parse_query(text: str) -> Tuple[Selection, ...]:
+    """
+    Parse a query written in a subset of the GraphQL syntax.
+
+    Supported: an optional ``query`` keyword and name, nested selection
+    sets, aliases and literal arguments. Variables, fragments and
+    directives are not.
+
+    Args:
+        text (str): The query, e.g. ``{ pilots { name starships { model } } }``.
+
+    Returns:
+        Tuple[Selection, ...]: The root selections, validated against the schema.
+
+    Raises:
+        QueryError: If the query is malformed, nested more than ``MAX_DEPTH``
+            selection sets deep or selects an unknown field.
+    """
+    selections = _Parser(text).document()
+    _validate("Query", selections)
+    return selections
+
+
+def _validate(type: str, selections: Tuple[Selection, ...]) -> None:
+    for selection in selections:
+        scalar = selection.name in SCALARS.get(type, {})
+        target = RELATIONS.get(type, {}).get(selection.name)
+        if not scalar and target is None:
+            raise QueryError(f"Unknown field {type}.{selection.name}.")
+        allowed = ARGUMENTS.get((type, selection.name), ())
+        unknown = [name for name in selection.arguments if name not in allowed]
+        if unknown:
+            raise QueryError(
+                f"Unknown argument {unknown[0]!r} on {type}.{selection.name}."
+            )
+        invalid = [
+            name
+            for name in allowed
+            if not isinstance(selection.arguments.get(name), str)
+        ]
+        if invalid:
+            raise QueryError(
+                f"Argument {invalid[0]!r} on {type}.{selection.name} "
+                "must be a string."
+            )
+        if scalar and selection.selections is not None:
+            raise QueryError(f"Field {type}.{selection.name} has no sub-fields.")
+        if target is not None:
+            if selection.selections is None:
+                raise QueryError(f"Field {type}.{selection.name} needs sub-fields.")
+            _validate(target, selection.selections)
+
+
+class GraphExecutor:
+    """
+    Execute parsed queries over pilots, starships, species and planets.
+
+    Related resources are loaded through one ``DataLoader`` per resource
+    type, so a query loads every distinct species, planet and starship at
+    most once, in one batch per nesting level, whatever the number of
+    pilots referencing it. Once the catalog is loaded the loaders read it
+    and no SWAPI call is made; until then they fetch through the resolver.
+    Starships carry their local overrides, as in the starship endpoints.
+    """
+
+    def __init__(
+        self,
+        resolver: SwapiResolver,
+        catalog: Optional[SwapiCatalog],
+        overlay: StarshipOverlay,
+    ):
+        self.resolver = resolver
+        self.catalog = catalog if catalog is not None and catalog.ready else None
+        self.overlay = overlay
+        self.loaders = {
+            "species": DataLoader(self._records_loader("species")),
+            "planets": DataLoader(self._records_loader("planets")),
+            "starships": DataLoader(self._load_starships),
+        }
+
+    async def execute(self, selections: Tuple[Selection, ...]) -> dict:
+        """
+        Resolve the root selections of a parsed query.
+
+        Args:
+            selections (Tuple[Selection, ...]): The output of ``parse_query``.
+
+        Returns:
+            dict: The query result, keyed by alias.
+
+        Raises:
+            httpx.HTTPStatusError: If a SWAPI resource cannot be fetched.
+        """
+        return await self._object("Query", None, selections)
+
+    async def _object(
+        self, type: str, value: Any, selections: Tuple[Selection, ...]
+    ) -> dict:
+        results = await gather_all(
+            self._field(type, value, selection) for selection in selections
+        )
+        return {
+            selection.alias: result for selection, result in zip(selections, results)
+        }
+
+    async def _field(self, type: str, value: Any, selection: Selection) -> Any:
+        scalar = SCALARS.get(type, {}).get(selection.name)
+        if scalar is not None:
+            return value.get(scalar)
+
+        target = RELATIONS[type][selection.name]
+        resolve = getattr(self, f"_{type.lower()}_{selection.name}")
+        related = await resolve(value, **selection.arguments)
+        if related is None:
+            return None
+        if isinstance(related, list):
+            return await gather_all(
+                self._object(target, item, selection.selections) for item in related
+            )
+        return await self._object(target, related, selection.selections)
+
+    async def _query_pilots(self, _) -> List[PersonRecord]:
+        return [person for person in await self._people() if person.starship_ids]
+
+    async def _query_pilot(self, _, name: str) -> Optional[PersonRecord]:
+        if self.catalog is not None:
+            people = self.catalog.find("people", name)
+        else:
+            data = await self.resolver.get_json(f"{BASE_URL}/people/?search={name}")
+            people = [
+                PersonRecord.from_swapi(person)
+                for person in data.get("results", [])
+                if (person.get("name") or "").casefold() == name.casefold()
+            ]
+        return next((person for person in people if person.starship_ids), None)
+
+    async def _query_starships(self, _) -> List[dict]:
+        starships = await fetch_all_starships(self.resolver, self.catalog)
+        return await self.overlay.apply([starship_row(s) for s in starships])
+
+    async def _query_starship(self, _, name: str) -> Optional[dict]:
+        if self.catalog is not None:
+            matches = self.catalog.find("starships", name) or self.catalog.match(
+                "starships", name
+            )
+        else:
+            data = await self.resolver.get_json(
+                f"{BASE_URL}/starships/?search={name}"
+            )
+            matches = data.get("results", [])
+        if matches:
+            [starship] = await self.overlay.apply([starship_row(matches[0])])
+            return starship
+        local = await self.overlay.local_details(name)
+        return {**local, "starship_class": None} if local is not None else None
+
+    async def _pilot_species(self, person: PersonRecord) -> Optional[AnyRecord]:
+        if not person.species_ids:
+            return None
+        return await self.loaders["species"].load(person.species_ids[0])
+
+    async def _pilot_homeworld(self, person: PersonRecord) -> Optional[AnyRecord]:
+        if person.homeworld_id is None:
+            return None
+        return await self.loaders["planets"].load(person.homeworld_id)
+
+    async def _pilot_starships(self, person: PersonRecord) -> List[dict]:
+        starships = await self.loaders["starships"].load_many(person.starship_ids)
+        return [starship for starship in starships if starship is not None]
+
+    async def _people(self) -> List[PersonRecord]:
+        if self.catalog is not None:
+            return list(self.catalog.resources["people"].values())
+        pages = await self.resolver.get_all_pages(f"{BASE_URL}/people/")
+        return [
+            PersonRecord.from_swapi(person)
+            for page in pages
+            for person in page["results"]
+        ]
+
+    def _records_loader(self, resource: str):
+        async def load(ids: List[int]) -> List[Optional[AnyRecord]]:
+            if self.catalog is not None:
+                return [self.catalog.get(resource, id) for id in ids]
+            resources = await self.resolver.get_many(
+                [resource_url(resource, id) for id in ids]
+            )
+            return [RECORD_TYPES[resource].from_swapi(data) for data in resources]
+
+        return load
+
+    async def _load_starships(self, ids: List[int]) -> List[Optional[dict]]:
+        records = await self._records_loader("starships")(ids)
+        rows = await self.overlay.apply(
+            [starship_row(record) for record in records if record is not None]
+        )
+        merged = iter(rows)
+        return [next(merged) if record is not None else None for record in records]
@@ -0,0 +1,118 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+
+def _fold(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Case-insensitive name index supporting exact, prefix and fuzzy lookups.
+
+    Exact lookups are a single dict hit. Prefix lookups bisect a sorted list
+    of folded names, and partial matches are ranked by the share of the
+    query's trigrams found in each name. Entries are keyed by the resource
+    id so they can be added and removed incrementally.
+    """
+
+    def __init__(self):
+        self._names: Dict[int, str] = {}
+        self._exact: Dict[str, Set[int]] = defaultdict(set)
+        self._sorted: List[Tuple[str, int]] = []
+        self._trigrams: Dict[str, Set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, key: int, name: str) -> None:
+        """
+        Index ``name`` under ``key``, replacing any name previously indexed.
+
+        Args:
+            key (int): The id of the indexed resource.
+            name (str): The name to index.
+        """
+        if key in self._names:
+            self.remove(key)
+        folded = _fold(name)
+        self._names[key] = folded
+        self._exact[folded].add(key)
+        insort(self._sorted, (folded, key))
+        for trigram in _trigrams(folded):
+            self._trigrams[trigram].add(key)
+
+    def remove(self, key: int) -> None:
+        """
+        Remove ``key`` from the index if it is indexed.
+
+        Args:
+            key (int): The id of the indexed resource.
+        """
+        folded = self._names.pop(key, None)
+        if folded is None:
+            return
+        self._exact[folded].discard(key)
+        if not self._exact[folded]:
+            del self._exact[folded]
+        del self._sorted[bisect_left(self._sorted, (folded, key))]
+        for trigram in _trigrams(folded):
+            self._trigrams[trigram].discard(key)
+            if not self._trigrams[trigram]:
+                del self._trigrams[trigram]
+
+    def lookup(self, name: str) -> List[int]:
+        """
+        Return the keys whose name equals ``name``, ignoring case.
+
+        Args:
+            name (str): The name to look up.
+
+        Returns:
+            List[int]: The matching keys, sorted.
+        """
+        return sorted(self._exact.get(_fold(name), ()))
+
+    def search(self, text: str, limit: int = 10, min_score: float = 0.3) -> List[int]:
+        """
+        Rank indexed names against a partial name.
+
+        Exact matches come first, then names starting with ``text``, then
+        names sharing the most trigrams with it.
+
+        Args:
+            text (str): The partial name to search for.
+            limit (int): The maximum number of keys to return.
+            min_score (float): The minimum share of shared trigrams to match.
+
+        Returns:
+            List[int]: The best matching keys, best first.
+        """
+        folded = _fold(text)
+        ranked = self.lookup(folded)
+
+        # ``(folded,)`` sorts before every ``(folded, key)`` whatever the key.
+        start = bisect_left(self._sorted, (folded,))
+        for name, key in self._sorted[start:]:
+            if len(ranked) >= limit or not name.startswith(folded):
+                break
+            if key not in ranked:
+                ranked.append(key)
+
+        query = _trigrams(folded)
+        scores: Dict[int, int] = defaultdict(int)
+        for trigram in query:
+            for key in self._trigrams.get(trigram, ()):
+                scores[key] += 1
+        fuzzy = sorted(
+            (key for key, score in scores.items() if score / len(query) >= min_score),
+            key=lambda key: (-scores[key], self._names[key], key),
+        )
+        ranked.extend(key for key in fuzzy if key not in ranked)
+        return ranked[:limit]
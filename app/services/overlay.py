@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional, Tuple
+
+from app.services.starship_store import StarshipStore
+from app.services.swapi_service import starship_details
+
+
+def _as_swapi(data: dict) -> dict:
+    return {
+        "name": data["name"],
+        "model": data["model"],
+        "cost_in_credits": str(data["cost_in_credits"]),
+        "max_atmosphering_speed": str(data["max_atmosphering_speed"]),
+        "crew": str(data["crew_capacity"]),
+        "passengers": str(data["passenger_capacity"]),
+    }
+
+
+class StarshipOverlay:
+    """
+    SWAPI starships merged with the starships maintained in the local store.
+
+    Served starship records (summaries or details) take the fields of the
+    stored starship with the same name, formatted as SWAPI formats them.
+    Merged records are cached, stamped with the store revision they were
+    built from, and dropped as soon as the store is written to.
+
+    Attributes:
+        store (StarshipStore): The store holding the local starships.
+        revision (Optional[int]): The store revision the cache reflects.
+    """
+
+    def __init__(self, store: StarshipStore):
+        self.store = store
+        self.revision: Optional[int] = None
+        self._overrides: Dict[str, dict] = {}
+        self._merged: Dict[Tuple, dict] = {}
+
+    async def refresh(self) -> None:
+        """
+        Reload the local starships if the store has been written to.
+        """
+        revision = await self.store.revision()
+        if revision == self.revision:
+            return
+        starships = await self.store.find()
+        self._overrides = {
+            starship.data["name"].casefold(): starship_details(
+                _as_swapi(starship.data)
+            )
+            for starship in starships
+        }
+        self._merged = {}
+        self.revision = revision
+
+    async def apply(self, starships: List[dict]) -> List[dict]:
+        """
+        Merge local overrides into served starship records.
+
+        Args:
+            starships (List[dict]): Starship summaries or details built from SWAPI.
+
+        Returns:
+            List[dict]: The records, with overridden fields replaced.
+        """
+        await self.refresh()
+        return [self._merge(starship) for starship in starships]
+
+    async def local_details(self, name: str) -> Optional[dict]:
+        """
+        Return the details of a starship that only exists in the local store.
+
+        Args:
+            name (str): The starship name, ignoring case.
+
+        Returns:
+            Optional[dict]: The details, or ``None`` if it is not stored.
+        """
+        await self.refresh()
+        return self._overrides.get(name.casefold())
+
+    def _merge(self, starship: dict) -> dict:
+        override = self._overrides.get((starship.get("name") or "").casefold())
+        if override is None:
+            return starship
+        key = tuple(starship.items())
+        merged = self._merged.get(key)
+        if merged is None:
+            merged = {
+                field: override[field] if override.get(field) is not None else value
+                for field, value in starship.items()
+            }
+            self._merged[key] = merged
+        return merged
@@ -0,0 +1,102 @@
+import hashlib
+import time
+from typing import List, Optional
+
+from app.core.serialization import dumps
+from app.services.cache import CacheBackend, CacheEntry
+from app.services.catalog import CatalogChange, SwapiCatalog
+
+SHARED_KEY = "view:/pilots"
+
+SHARED_TTL = 86400.0
+
+
+class PilotsView:
+    """
+    Materialized ``/pilots`` response, rebuilt whenever the catalog changes.
+
+    Every pilot is joined with its species, homeworld and starships from the
+    catalog, so serving the list needs no SWAPI calls and no serialization:
+    ``payload()`` returns the encoded JSON response.
+
+    With a ``shared`` cache backend the encoded payload is also published
+    under ``SHARED_KEY`` with its digest, by the first worker to serve it.
+    The backend is consulted once per digest change, and the payload is
+    served from this worker's memory from then on.
+
+    Attributes:
+        pilots (List[dict]): The enriched pilots, in SWAPI order.
+        body (Optional[bytes]): The pre-serialized ``{"pilots": [...]}``
+            payload, or ``None`` until the view is built.
+        version (int): The catalog version the view was built from.
+        digest (Optional[str]): A hash of the payload, stable across processes.
+        updated_at (Optional[float]): Unix time the content last changed.
+    """
+
+    def __init__(self, catalog: SwapiCatalog, shared: Optional[CacheBackend] = None):
+        self.pilots: List[dict] = []
+        self.body: Optional[bytes] = None
+        self.version = 0
+        self.digest: Optional[str] = None
+        self.updated_at: Optional[float] = None
+        self.shared = shared
+        self._published: Optional[str] = None
+        catalog.subscribe(self.rebuild)
+
+    @property
+    def ready(self) -> bool:
+        """
+        Whether the view has been built at least once.
+        """
+        return self.digest is not None
+
+    def rebuild(self, catalog: SwapiCatalog, change: CatalogChange) -> None:
+        """
+        Recompute the joined pilot records from the catalog.
+
+        Args:
+            catalog (SwapiCatalog): The refreshed catalog.
+            change (CatalogChange): What changed in the refresh.
+        """
+        pilots = [
+            catalog.pilot(person)
+            for person in catalog.resources["people"].values()
+            if person.starship_ids
+        ]
+
+        body = dumps({"pilots": pilots})
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        if digest != self.digest:
+            self.updated_at = time.time()
+        self.pilots = pilots
+        self.body = body
+        self.digest = digest
+        self.version = change.version
+
+    async def payload(self) -> bytes:
+        """
+        Return the encoded ``{"pilots": [...]}`` payload.
+
+        With a shared backend, the first call after the digest changes
+        publishes the payload unless the backend holds it already.
+
+        Returns:
+            bytes: The encoded payload.
+        """
+        if self.shared is None or self._published == self.digest:
+            return self.body
+        entry = await self.shared.get(SHARED_KEY)
+        if entry is None or entry.etag != self.digest:
+            now = time.time()
+            await self.shared.set(
+                SHARED_KEY,
+                CacheEntry(
+                    value=self.body,
+                    stored_at=now,
+                    expires_at=now + SHARED_TTL,
+                    stale_until=now + SHARED_TTL,
+                    etag=self.digest,
+                ),
+            )
+        self._published = self.digest
+        return self.body
@@ -0,0 +1,217 @@
+import sys
+from dataclasses import dataclass, fields
+from typing import ClassVar, Dict, Iterable, Optional, Tuple, Type, Union
+
+from app.services.swapi_service import BASE_URL
+
+
+def resource_id(url: Optional[str]) -> Optional[int]:
+    """
+    Return the numeric id at the end of a SWAPI resource URL.
+
+    Args:
+        url (Optional[str]): The resource URL, e.g. ``.../starships/12/``.
+
+    Returns:
+        Optional[int]: The id, or ``None`` if the URL has none.
+    """
+    if not url:
+        return None
+    try:
+        return int(url.rstrip("/").rsplit("/", 1)[-1])
+    except ValueError:
+        return None
+
+
+def resource_url(resource: str, id: int) -> str:
+    """
+    Return the SWAPI URL of a resource.
+
+    Args:
+        resource (str): The resource type.
+        id (int): The resource id.
+
+    Returns:
+        str: The resource URL.
+    """
+    return f"{BASE_URL}/{resource}/{id}/"
+
+
+def _text(value) -> Optional[str]:
+    # SWAPI repeats a handful of values ("unknown", "n/a", genders, models,
+    # numeric strings) across thousands of records; keep one copy of each.
+    return sys.intern(value) if isinstance(value, str) else None
+
+
+def _ids(urls: Iterable[str]) -> Tuple[int, ...]:
+    return tuple(id for id in map(resource_id, urls) if id is not None)
+
+
+class Record:
+    """
+    Base class of the compact records the catalog keeps instead of raw JSON.
+
+    Records hold only the fields the API serves, with interned strings and
+    integer ids in place of URLs. ``get`` reads a field like the raw SWAPI
+    dict it replaces, so the helpers building served payloads accept either.
+    """
+
+    __slots__ = ()
+
+    RESOURCE: ClassVar[str]
+
+    id: int
+
+    def get(self, field: str, default=None):
+        """
+        Return a field by its SWAPI name.
+
+        Args:
+            field (str): The field name.
+            default: The value returned for fields the record does not keep.
+
+        Returns:
+            The field value, or ``default``.
+        """
+        return getattr(self, field, default)
+
+    def to_swapi(self) -> dict:
+        """
+        Render the record as the (trimmed) SWAPI JSON it was built from.
+
+        Returns:
+            dict: The kept fields, with references as URLs and the record's
+            own ``url``.
+        """
+        data = {field.name: getattr(self, field.name) for field in fields(self)}
+        del data["id"]
+        data["url"] = resource_url(self.RESOURCE, self.id)
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class PlanetRecord(Record):
+    """
+    A SWAPI planet, reduced to its name.
+    """
+
+    RESOURCE: ClassVar[str] = "planets"
+
+    id: int
+    name: Optional[str]
+
+    @classmethod
+    def from_swapi(cls, data: dict) -> "PlanetRecord":
+        return cls(resource_id(data.get("url")), _text(data.get("name")))
+
+
+@dataclass(frozen=True, slots=True)
+class SpeciesRecord(Record):
+    """
+    A SWAPI species, reduced to its name.
+    """
+
+    RESOURCE: ClassVar[str] = "species"
+
+    id: int
+    name: Optional[str]
+
+    @classmethod
+    def from_swapi(cls, data: dict) -> "SpeciesRecord":
+        return cls(resource_id(data.get("url")), _text(data.get("name")))
+
+
+@dataclass(frozen=True, slots=True)
+class StarshipRecord(Record):
+    """
+    A SWAPI starship, with the fields served by the starship endpoints.
+    """
+
+    RESOURCE: ClassVar[str] = "starships"
+
+    id: int
+    name: Optional[str]
+    model: Optional[str]
+    starship_class: Optional[str]
+    cost_in_credits: Optional[str]
+    max_atmosphering_speed: Optional[str]
+    crew: Optional[str]
+    passengers: Optional[str]
+    cargo_capacity: Optional[str]
+
+    @classmethod
+    def from_swapi(cls, data: dict) -> "StarshipRecord":
+        return cls(
+            resource_id(data.get("url")),
+            *(
+                _text(data.get(field))
+                for field in (
+                    "name",
+                    "model",
+                    "starship_class",
+                    "cost_in_credits",
+                    "max_atmosphering_speed",
+                    "crew",
+                    "passengers",
+                    "cargo_capacity",
+                )
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PersonRecord(Record):
+    """
+    A SWAPI person, with the fields served for pilots and the ids of the
+    species, homeworld and starships it references.
+    """
+
+    RESOURCE: ClassVar[str] = "people"
+
+    id: int
+    name: Optional[str]
+    height: Optional[str]
+    mass: Optional[str]
+    gender: Optional[str]
+    birth_year: Optional[str]
+    species_ids: Tuple[int, ...]
+    homeworld_id: Optional[int]
+    starship_ids: Tuple[int, ...]
+
+    @classmethod
+    def from_swapi(cls, data: dict) -> "PersonRecord":
+        return cls(
+            resource_id(data.get("url")),
+            _text(data.get("name")),
+            _text(data.get("height")),
+            _text(data.get("mass")),
+            _text(data.get("gender")),
+            _text(data.get("birth_year")),
+            _ids(data.get("species") or ()),
+            resource_id(data.get("homeworld")),
+            _ids(data.get("starships") or ()),
+        )
+
+    def to_swapi(self) -> dict:
+        homeworld = self.homeworld_id
+        return {
+            "name": self.name,
+            "height": self.height,
+            "mass": self.mass,
+            "gender": self.gender,
+            "birth_year": self.birth_year,
+            "species": [resource_url("species", id) for id in self.species_ids],
+            "homeworld": (
+                resource_url("planets", homeworld) if homeworld is not None else None
+            ),
+            "starships": [resource_url("starships", id) for id in self.starship_ids],
+            "url": resource_url(self.RESOURCE, self.id),
+        }
+
+
+AnyRecord = Union[PersonRecord, StarshipRecord, SpeciesRecord, PlanetRecord]
+
+RECORD_TYPES: Dict[str, Type[AnyRecord]] = {
+    record.RESOURCE: record
+    for record in (PersonRecord, StarshipRecord, SpeciesRecord, PlanetRecord)
+}
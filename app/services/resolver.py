@@ -0,0 +1,272 @@
+import asyncio
+import time
+from contextlib import nullcontext
+from functools import partial
+from typing import (AsyncIterator, Awaitable, Callable, Dict, Iterable, List,
+                    Optional, TypeVar)
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+from app.core.metrics import SWAPI_REQUESTS_IN_FLIGHT, record_swapi_call
+from app.core.resilience import ATTEMPT_HOOK, ResilientTransport
+from app.core.serialization import loads
+from app.services.cache import SwapiCache, resource_type
+from app.services.singleflight import SingleFlight
+from app.services.throttle import Priority, UpstreamBudget
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+T = TypeVar("T")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a SWAPI URL so equivalent spellings share one key.
+
+    The host is lower-cased, the path always ends with a slash and query
+    parameters are sorted.
+
+    Args:
+        url (str): The SWAPI URL.
+
+    Returns:
+        str: The normalized URL.
+    """
+    parsed = httpx.URL(url.strip())
+    path = parsed.path if parsed.path.endswith("/") else f"{parsed.path}/"
+    query = urlencode(sorted(parse_qsl(parsed.query.decode())))
+    normalized = f"{parsed.scheme}://{parsed.netloc.decode()}{path}"
+    return f"{normalized}?{query}" if query else normalized
+
+
+async def gather_all(aws: Iterable[Awaitable[T]]) -> List[T]:
+    """
+    Run awaitables concurrently and return their results in order.
+
+    Unlike a bare ``asyncio.gather``, the first failure cancels every
+    sibling that is still running before the error is raised.
+
+    Args:
+        aws (Iterable[Awaitable[T]]): The awaitables to run.
+
+    Returns:
+        List[T]: The results, in the same order as ``aws``.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _observed(
+    url: str, send: Callable[[], Awaitable[httpx.Response]]
+) -> httpx.Response:
+    started = time.perf_counter()
+    status = "error"
+    SWAPI_REQUESTS_IN_FLIGHT.inc()
+    try:
+        response = await send()
+        status = str(response.status_code)
+        return response
+    finally:
+        SWAPI_REQUESTS_IN_FLIGHT.dec()
+        record_swapi_call(resource_type(url), status, time.perf_counter() - started)
+
+
+def _sends_attempt_hooks(client: httpx.AsyncClient) -> bool:
+    # Other transports (the offline snapshot, test doubles) send every
+    # request exactly once, so the resolver charges the call itself.
+    return isinstance(getattr(client, "_transport", None), ResilientTransport)
+
+
+class SwapiResolver:
+    """
+    Resolve SWAPI resource URLs on behalf of a single inbound request.
+
+    Every fetch made through one resolver shares the same concurrency limit,
+    so fanning out over many sub-resources never exceeds ``max_concurrency``
+    simultaneous upstream calls for that request. Each distinct URL is only
+    fetched once per resolver, and when an application-wide ``singleflight``
+    group is given, concurrent requests for the same URL share one call.
+    Responses are served from ``cache`` when one is given, or revalidated
+    with SWAPI first when ``revalidate`` is set, and calls that do reach
+    SWAPI also wait for the process-wide ``budget`` at ``priority``. Through
+    a ``ResilientTransport`` the budget is charged, and the call recorded in
+    the metrics, once per attempt sent, retries and hedged requests included.
+
+    Attributes:
+        client (httpx.AsyncClient): The shared HTTP client used for SWAPI requests.
+        priority (Priority): The urgency of this resolver's upstream calls.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        singleflight: Optional[SingleFlight] = None,
+        cache: Optional[SwapiCache] = None,
+        budget: Optional[UpstreamBudget] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        revalidate: bool = False,
+    ):
+        self.client = client
+        self.priority = priority
+        self._budget = budget
+        self._revalidate = revalidate
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._singleflight = singleflight
+        self._cache = cache
+        self._resolved: Dict[str, asyncio.Future] = {}
+
+    async def get_json(self, url: str) -> dict:
+        """
+        Fetch a SWAPI URL and decode its JSON body.
+
+        Repeated calls for the same URL, including concurrent ones, share the
+        first call's result.
+
+        Args:
+            url (str): The SWAPI resource URL.
+
+        Returns:
+            dict: The decoded JSON body.
+
+        Raises:
+            httpx.HTTPStatusError: If SWAPI answers with an error status.
+        """
+        key = normalize_url(url)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = asyncio.ensure_future(self._load(key, url))
+            self._resolved[key] = resolved
+        return await asyncio.shield(resolved)
+
+    async def _load(self, key: str, url: str) -> dict:
+        if self._cache is not None:
+            load = self._cache.refresh if self._revalidate else self._cache.get_or_load
+            body = await load(key, lambda headers: self._fetch(url, headers))
+        elif self._singleflight is not None:
+            body = await self._singleflight.do(key, lambda: self._fetch_body(url))
+        else:
+            body = await self._fetch_body(url)
+        return loads(body)
+
+    async def _fetch(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        async def attempt(send: Callable[[], Awaitable[httpx.Response]]):
+            budget = self._budget.slot(self.priority) if self._budget else nullcontext()
+            async with budget:
+                return await _observed(url, send)
+
+        async with self._semaphore:
+            send = partial(
+                self.client.get,
+                url,
+                headers=headers,
+                extensions={ATTEMPT_HOOK: attempt},
+            )
+            if _sends_attempt_hooks(self.client):
+                # The transport charges and records every attempt it sends,
+                # retries and hedged requests included.
+                response = await send()
+            else:
+                response = await attempt(send)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    async def _fetch_body(self, url: str) -> bytes:
+        return (await self._fetch(url)).content
+
+    async def get_many(self, urls: Iterable[str]) -> List[dict]:
+        """
+        Fetch several SWAPI URLs concurrently, preserving their order.
+
+        If any fetch fails, the remaining ones are cancelled and the first
+        error is raised.
+
+        Args:
+            urls (Iterable[str]): The SWAPI resource URLs.
+
+        Returns:
+            List[dict]: The decoded JSON bodies, in the same order as ``urls``.
+        """
+        return await gather_all(self.get_json(url) for url in urls)
+
+    async def get_all_pages(self, url: str) -> List[dict]:
+        """
+        Fetch every page of a paginated SWAPI listing.
+
+        The first page reports the total ``count``, so the remaining page URLs
+        are computed up front and fetched concurrently. Listings that do not
+        report a count are walked through their ``next`` links instead.
+
+        Args:
+            url (str): The URL of the first page of the listing.
+
+        Returns:
+            List[dict]: The decoded pages, in page order.
+        """
+        first_page = await self.get_json(url)
+        page_urls = _remaining_page_urls(url, first_page)
+        if page_urls is not None:
+            return [first_page, *await self.get_many(page_urls)]
+
+        pages = [first_page]
+        while pages[-1].get("next"):
+            pages.append(await self.get_json(pages[-1]["next"]))
+        return pages
+
+    async def iter_pages(self, url: str) -> AsyncIterator[dict]:
+        """
+        Yield every page of a paginated SWAPI listing as soon as it arrives.
+
+        The first page is yielded first; the remaining pages are fetched
+        concurrently and yielded in completion order rather than page order.
+
+        Args:
+            url (str): The URL of the first page of the listing.
+
+        Yields:
+            dict: The decoded pages.
+        """
+        page = await self.get_json(url)
+        yield page
+        page_urls = _remaining_page_urls(url, page)
+        if page_urls is None:
+            while page.get("next"):
+                page = await self.get_json(page["next"])
+                yield page
+            return
+
+        tasks = [asyncio.ensure_future(self.get_json(url)) for url in page_urls]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                yield await next_page
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _remaining_page_urls(url: str, first_page: dict) -> Optional[List[str]]:
+    """
+    Compute the URLs of the pages following ``first_page`` from its ``count``.
+
+    Returns ``None`` when the listing does not report enough to compute them.
+    """
+    if not first_page.get("next"):
+        return []
+    count = first_page.get("count")
+    page_size = len(first_page.get("results", []))
+    if not count or not page_size:
+        return None
+    last_page = -(-count // page_size)
+    separator = "&" if "?" in url else "?"
+    return [f"{url}{separator}page={page}" for page in range(2, last_page + 1)]
@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import errno
+import logging
+import os
+import struct
+import time
+from collections import deque
+from dataclasses import replace
+from typing import Callable, Deque, Optional
+
+from app.core.config import get_settings
+from app.services.cache import (CacheEntry, MemoryCacheBackend, decode_entry,
+                                encode_entry)
+
+logger = logging.getLogger(__name__)
+
+OP_GET = b"G"
+OP_SET = b"S"
+OP_DELETE = b"D"
+OP_CLEAR = b"C"
+
+FOUND = b"+"
+MISSING = b"-"
+
+_REQUEST = struct.Struct("!cII")
+_REPLY = struct.Struct("!cI")
+
+
+class CacheUnavailable(ConnectionError):
+    """
+    Raised when the shared cache sidecar cannot be reached.
+    """
+
+
+class SharedCacheServer:
+    """
+    Cache sidecar shared by every worker on a host over a Unix socket.
+
+    Entries are kept in their serialized form (``encode_entry``) in a
+    size-bounded LRU, so a lookup writes the stored bytes back as-is,
+    without decoding or re-encoding them. Entries past ``stale_until`` are
+    dropped when looked up.
+
+    Requests are ``op, key length, payload length`` headers followed by the
+    key and payload; replies are ``status, payload length`` headers followed
+    by the payload, in request order.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.store = MemoryCacheBackend(max_bytes)
+        self._clock = clock
+
+    async def start(self) -> asyncio.AbstractServer:
+        """
+        Listen on the socket, replacing a socket file left by a dead sidecar.
+
+        Returns:
+            asyncio.AbstractServer: The listening server.
+
+        Raises:
+            OSError: ``EADDRINUSE`` if a live sidecar is listening on ``path``.
+        """
+        if os.path.exists(self.path):
+            if await _is_listening(self.path):
+                raise OSError(
+                    errno.EADDRINUSE,
+                    f"A shared cache is already listening on {self.path}",
+                )
+            os.unlink(self.path)
+        server = await asyncio.start_unix_server(self._serve, self.path)
+        os.chmod(self.path, 0o600)
+        return server
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                op, key_size, size = _REQUEST.unpack(
+                    await reader.readexactly(_REQUEST.size)
+                )
+                key = (await reader.readexactly(key_size)).decode()
+                payload = await reader.readexactly(size) if size else b""
+                reply = await self._handle(op, key, payload)
+                if reply is None:
+                    writer.write(_REPLY.pack(MISSING, 0))
+                else:
+                    writer.write(_REPLY.pack(FOUND, len(reply)) + reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, op: bytes, key: str, payload: bytes) -> Optional[bytes]:
+        if op == OP_GET:
+            entry = await self.store.get(key)
+            if entry is None:
+                return None
+            if self._clock() >= entry.stale_until:
+                await self.store.delete(key)
+                return None
+            return entry.value
+        if op == OP_SET:
+            # Keep the serialized entry as the stored value, so it is counted
+            # against ``max_bytes`` and served without re-encoding.
+            entry = decode_entry(payload)
+            await self.store.set(key, replace(entry, value=payload))
+        elif op == OP_DELETE:
+            await self.store.delete(key)
+        elif op == OP_CLEAR:
+            await self.store.clear()
+        return b""
+
+
+async def _is_listening(path: str) -> bool:
+    try:
+        _, writer = await asyncio.open_unix_connection(path)
+    except OSError:
+        return False
+    writer.close()
+    return True
+
+
+class SocketCacheBackend:
+    """
+    Backend storing entries in the host's shared cache sidecar.
+
+    Every worker connects to the same ``SharedCacheServer``, so a response
+    fetched or refreshed by one worker is served to all of them. Requests
+    are pipelined over one connection per worker. If the sidecar cannot be
+    reached, lookups miss and writes are dropped instead of failing the
+    request; the connection is retried on the next call.
+    """
+
+    def __init__(self, path: str, timeout: float = 1.0):
+        self.path = path
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._replies: Optional[asyncio.Task] = None
+        self._pending: Deque[asyncio.Future] = deque()
+        self._connecting = asyncio.Lock()
+        self._available = True
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            payload = await self._call(OP_GET, key)
+        except CacheUnavailable:
+            return None
+        return decode_entry(payload) if payload is not None else None
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        try:
+            await self._call(OP_SET, key, encode_entry(entry))
+        except CacheUnavailable:
+            pass
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._call(OP_DELETE, key)
+        except CacheUnavailable:
+            pass
+
+    async def clear(self) -> None:
+        try:
+            await self._call(OP_CLEAR, "")
+        except CacheUnavailable:
+            pass
+
+    async def close(self) -> None:
+        self._disconnect()
+
+    async def _call(
+        self, op: bytes, key: str, payload: bytes = b""
+    ) -> Optional[bytes]:
+        try:
+            writer = await self._connect()
+            reply = asyncio.get_running_loop().create_future()
+            self._pending.append(reply)
+            encoded = key.encode()
+            writer.write(_REQUEST.pack(op, len(encoded), len(payload)) + encoded)
+            if payload:
+                writer.write(payload)
+            await writer.drain()
+            # Shielded so a caller timing out leaves its reply in the queue,
+            # keeping replies matched to requests until the reset below.
+            return await asyncio.wait_for(asyncio.shield(reply), self.timeout)
+        except (OSError, asyncio.TimeoutError) as exc:
+            self._disconnect()
+            raise CacheUnavailable(str(exc)) from exc
+
+    async def _connect(self) -> asyncio.StreamWriter:
+        async with self._connecting:
+            if self._writer is None:
+                try:
+                    self._reader, self._writer = await asyncio.open_unix_connection(
+                        self.path
+                    )
+                except OSError:
+                    if self._available:
+                        logger.warning(
+                            "Shared cache at %s is unavailable, bypassing it",
+                            self.path,
+                        )
+                    self._available = False
+                    raise
+                self._available = True
+                self._replies = asyncio.ensure_future(self._read_replies(self._reader))
+            return self._writer
+
+    async def _read_replies(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                status, size = _REPLY.unpack(await reader.readexactly(_REPLY.size))
+                payload = await reader.readexactly(size) if size else b""
+                reply = self._pending.popleft()
+                if not reply.done():
+                    reply.set_result(payload if status == FOUND else None)
+        except (asyncio.IncompleteReadError, OSError):
+            if self._reader is reader:
+                self._disconnect()
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._replies is not None and self._replies is not asyncio.current_task():
+            self._replies.cancel()
+        self._reader = self._writer = self._replies = None
+        # Requests in flight on the dropped connection count as misses.
+        while self._pending:
+            reply = self._pending.popleft()
+            if not reply.done():
+                reply.set_result(None)
+
+
+async def _main(path: str, max_bytes: int) -> None:
+    server = await SharedCacheServer(path, max_bytes).start()
+    logger.info("Shared SWAPI cache listening on %s", path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description="Run the SWAPI cache shared by every worker on this host."
+    )
+    parser.add_argument(
+        "--path",
+        default=settings.cache_socket_path,
+        help="Unix socket the workers connect to.",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=settings.cache_max_bytes,
+        help="Size bound of the cached entries.",
+    )
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_main(arguments.path, arguments.max_bytes))
+    except OSError as exc:
+        parser.exit(1, f"{exc}\n")
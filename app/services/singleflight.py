@@ -0,0 +1,38 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into a single in-flight call.
+
+    The first caller for a key starts the work; every caller arriving while
+    it is still running awaits the same result instead of starting its own.
+    Nothing is kept once the call completes, so later callers start afresh.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` for ``key`` unless a call for that key is already in flight.
+
+        Args:
+            key (str): The deduplication key.
+            fn (Callable[[], Awaitable[Any]]): Starts the work if none is in flight.
+
+        Returns:
+            Any: The result of the shared call.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._calls.pop(key, None))
+        # Shield the shared call so one caller being cancelled does not
+        # cancel it for every other caller awaiting the same key.
+        return await asyncio.shield(call)
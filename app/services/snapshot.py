@@ -0,0 +1,341 @@
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import Settings, get_settings
+from app.core.http import create_http_client
+from app.services.resolver import SwapiResolver
+from app.services.swapi_service import (BASE_URL, RESOURCES, SWAPI_PAGE_SIZE,
+                                        fetch_all_resources)
+from app.services.throttle import Priority, UpstreamBudget, create_budget
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    resource TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT,
+    model TEXT,
+    edited TEXT,
+    body BLOB NOT NULL,
+    PRIMARY KEY (resource, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resources_by_name
+    ON resources (resource, name COLLATE NOCASE);
+"""
+
+Row = Tuple[str, int, Optional[str], Optional[str], Optional[str], bytes]
+
+
+def resource_id(url: str) -> int:
+    """
+    Extract the numeric id from a SWAPI resource URL.
+
+    Args:
+        url (str): A SWAPI resource URL such as ``.../starships/12/``.
+
+    Returns:
+        int: The resource id.
+    """
+    return int(url.rstrip("/").rsplit("/", 1)[1])
+
+
+class SwapiSnapshot:
+    """
+    Local SQLite copy of the SWAPI people, starships, species and planets.
+
+    Each resource is stored once as its compact JSON body, indexed by type,
+    id and name. The async methods run the SQLite work in a worker thread so
+    the event loop is never blocked.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+    async def get(self, resource: str, id: int) -> Optional[bytes]:
+        """
+        Return the JSON body of a single resource.
+
+        Args:
+            resource (str): The resource type, e.g. ``starships``.
+            id (int): The resource id.
+
+        Returns:
+            Optional[bytes]: The JSON body, or ``None`` if it is not in the snapshot.
+        """
+        rows = await self._query(
+            "SELECT body FROM resources WHERE resource = ? AND id = ?",
+            (resource, id),
+        )
+        return rows[0][0] if rows else None
+
+    async def search(
+        self,
+        resource: str,
+        search: str = "",
+        offset: int = 0,
+        limit: int = SWAPI_PAGE_SIZE,
+    ) -> Tuple[int, List[bytes]]:
+        """
+        Return one page of resources whose name (or model) contains ``search``.
+
+        Matching is case-insensitive, like SWAPI's ``?search=`` parameter.
+
+        Args:
+            resource (str): The resource type, e.g. ``people``.
+            search (str): The text to look for; empty matches every resource.
+            offset (int): How many matching resources to skip.
+            limit (int): The maximum number of resources to return.
+
+        Returns:
+            Tuple[int, List[bytes]]: The total match count and the page of bodies.
+        """
+        escaped = search.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+        pattern = f"%{escaped}%"
+        where = "resource = ? AND (name LIKE ? ESCAPE '!' OR model LIKE ? ESCAPE '!')"
+        params = (resource, pattern, pattern)
+        [(count,)] = await self._query(
+            f"SELECT COUNT(*) FROM resources WHERE {where}", params
+        )
+        rows = await self._query(
+            f"SELECT body FROM resources WHERE {where} ORDER BY id LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        )
+        return count, [row[0] for row in rows]
+
+    async def versions(self, resource: str) -> Dict[int, Optional[str]]:
+        """
+        Return the ``edited`` timestamp of every stored resource of a type.
+
+        Args:
+            resource (str): The resource type.
+
+        Returns:
+            Dict[int, Optional[str]]: The ``edited`` value keyed by resource id.
+        """
+        rows = await self._query(
+            "SELECT id, edited FROM resources WHERE resource = ?", (resource,)
+        )
+        return dict(rows)
+
+    async def apply(self, upserts: Iterable[Row], deletes: Iterable[Tuple[str, int]]):
+        """
+        Insert, replace and delete resources in a single transaction.
+
+        Args:
+            upserts (Iterable[Row]): Rows to insert or replace.
+            deletes (Iterable[Tuple[str, int]]): ``(resource, id)`` pairs to delete.
+        """
+
+        def write():
+            with self._lock, self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?, ?)",
+                    list(upserts),
+                )
+                self._connection.executemany(
+                    "DELETE FROM resources WHERE resource = ? AND id = ?",
+                    list(deletes),
+                )
+
+        await asyncio.to_thread(write)
+
+    def close(self) -> None:
+        """
+        Close the underlying SQLite connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    async def _query(self, sql: str, params: tuple) -> list:
+        def read():
+            with self._lock:
+                return self._connection.execute(sql, params).fetchall()
+
+        return await asyncio.to_thread(read)
+
+
+def _row(resource: str, data: dict) -> Row:
+    body = json.dumps(data, separators=(",", ":")).encode()
+    return (
+        resource,
+        resource_id(data["url"]),
+        data.get("name"),
+        data.get("model"),
+        data.get("edited"),
+        body,
+    )
+
+
+async def sync_snapshot(
+    resolver: SwapiResolver, snapshot: SwapiSnapshot
+) -> Dict[str, int]:
+    """
+    Bring the snapshot up to date with SWAPI.
+
+    Every listing is crawled concurrently, but only resources whose ``edited`` timestamp
+    changed are rewritten and resources gone from SWAPI are deleted, so an
+    up-to-date snapshot costs no writes. The same call builds a new snapshot
+    from scratch.
+
+    Args:
+        resolver (SwapiResolver): The resolver used to crawl SWAPI.
+        snapshot (SwapiSnapshot): The snapshot to update.
+
+    Returns:
+        Dict[str, int]: The number of ``inserted``, ``updated`` and ``deleted`` rows.
+    """
+    counts = {"inserted": 0, "updated": 0, "deleted": 0}
+    upserts: List[Row] = []
+    deletes: List[Tuple[str, int]] = []
+
+    resources = await fetch_all_resources(resolver)
+    for resource, items in resources.items():
+        known = await snapshot.versions(resource)
+        seen = set()
+        for data in items:
+            row = _row(resource, data)
+            seen.add(row[1])
+            if row[1] not in known:
+                counts["inserted"] += 1
+            elif known[row[1]] != row[4]:
+                counts["updated"] += 1
+            else:
+                continue
+            upserts.append(row)
+        removed = [(resource, id) for id in known if id not in seen]
+        counts["deleted"] += len(removed)
+        deletes.extend(removed)
+
+    await snapshot.apply(upserts, deletes)
+    return counts
+
+
+async def refresh_periodically(
+    snapshot: SwapiSnapshot,
+    settings: Settings,
+    on_change: Optional[Callable[[], Awaitable[None]]] = None,
+    budget: Optional[UpstreamBudget] = None,
+) -> None:
+    """
+    Re-sync the snapshot with SWAPI every ``snapshot_refresh_interval`` seconds.
+
+    Args:
+        snapshot (SwapiSnapshot): The snapshot being served.
+        settings (Settings): The application settings.
+        on_change (Optional[Callable[[], Awaitable[None]]]): Awaited after
+            a refresh that changed the snapshot.
+        budget (Optional[UpstreamBudget]): The process-wide upstream budget
+            the refresh calls are charged to.
+    """
+    async with create_http_client(settings) as client:
+        while True:
+            await asyncio.sleep(settings.snapshot_refresh_interval)
+            resolver = SwapiResolver(
+                client, budget=budget, priority=Priority.BACKGROUND
+            )
+            try:
+                counts = await sync_snapshot(resolver, snapshot)
+            except httpx.HTTPError:
+                logger.warning("SWAPI snapshot refresh failed", exc_info=True)
+                continue
+            logger.info("SWAPI snapshot refreshed: %s", counts)
+            if on_change is not None and any(counts.values()):
+                await on_change()
+
+
+class SnapshotTransport(httpx.AsyncBaseTransport):
+    """
+    HTTP transport answering SWAPI requests from a local snapshot.
+
+    It understands the URLs the service layer uses (resource details,
+    paginated listings and ``?search=``), so every SWAPI call resolves
+    locally without touching the network.
+    """
+
+    def __init__(self, snapshot: SwapiSnapshot):
+        self.snapshot = snapshot
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.split("/api/", 1)[-1].strip("/").split("/")
+        resource = path[0]
+        if resource not in RESOURCES or len(path) > 2:
+            return self._not_found()
+
+        if len(path) == 2:
+            body = await self.snapshot.get(resource, int(path[1]))
+            return self._json(body) if body is not None else self._not_found()
+
+        search = request.url.params.get("search", "")
+        page = int(request.url.params.get("page", "1"))
+        count, bodies = await self.snapshot.search(
+            resource, search, offset=(page - 1) * SWAPI_PAGE_SIZE
+        )
+        if page > 1 and not bodies:
+            return self._not_found()
+        has_next = page * SWAPI_PAGE_SIZE < count
+        return self._json(
+            b'{"count":%d,"next":%s,"previous":%s,"results":[%s]}'
+            % (
+                count,
+                self._page_url(resource, search, page + 1, has_next),
+                self._page_url(resource, search, page - 1, page > 1),
+                b",".join(bodies),
+            )
+        )
+
+    @staticmethod
+    def _page_url(resource: str, search: str, page: int, exists: bool) -> bytes:
+        if not exists:
+            return b"null"
+        params = httpx.QueryParams({"search": search, "page": page})
+        if not search:
+            params = params.remove("search")
+        return json.dumps(f"{BASE_URL}/{resource}/?{params}").encode()
+
+    @staticmethod
+    def _json(body: bytes) -> httpx.Response:
+        return httpx.Response(
+            200, content=body, headers={"content-type": "application/json"}
+        )
+
+    @staticmethod
+    def _not_found() -> httpx.Response:
+        return httpx.Response(404, json={"detail": "Not found"})
+
+
+async def _main(path: str) -> None:
+    snapshot = SwapiSnapshot(path)
+    try:
+        settings = get_settings()
+        async with create_http_client(settings) as client:
+            resolver = SwapiResolver(client, budget=create_budget(settings))
+            counts = await sync_snapshot(resolver, snapshot)
+    finally:
+        snapshot.close()
+    print(
+        f"Snapshot {path} synced: {counts['inserted']} inserted, "
+        f"{counts['updated']} updated, {counts['deleted']} deleted."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Download or refresh the local SWAPI snapshot."
+    )
+    parser.add_argument(
+        "--path",
+        default=get_settings().snapshot_path,
+        help="SQLite file holding the snapshot.",
+    )
+    asyncio.run(_main(parser.parse_args().path))
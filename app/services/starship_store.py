@@ -0,0 +1,434 @@
+import asyncio
+import json
+import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Protocol, Set
+
+from app.core.config import Settings
+
+SEED_STARSHIPS = (
+    {
+        "name": "Millennium Falcon",
+        "model": "YT-1300 light freighter",
+        "cost_in_credits": 100000,
+        "max_atmosphering_speed": 1050,
+        "crew_capacity": 4,
+        "passenger_capacity": 6,
+        "pilots": ["Han Solo", "Chewbacca"],
+    },
+)
+
+STORED_FIELDS = (
+    "name",
+    "model",
+    "cost_in_credits",
+    "max_atmosphering_speed",
+    "crew_capacity",
+    "passenger_capacity",
+    "pilots",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS starships (
+    name TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS starships_by_model ON starships (model COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS starship_pilots (
+    name TEXT NOT NULL,
+    pilot TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (name, pilot)
+);
+CREATE INDEX IF NOT EXISTS starship_pilots_by_pilot ON starship_pilots (pilot);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_meta VALUES ('revision', 0);
+"""
+
+
+@dataclass(frozen=True)
+class StoredStarship:
+    """
+    A locally maintained starship and its version.
+
+    Attributes:
+        data (dict): The starship fields, as accepted by ``StarshipUpdate``.
+        version (int): Incremented on every write to the starship.
+    """
+
+    data: dict
+    version: int
+
+    @property
+    def etag(self) -> str:
+        """
+        The strong entity tag identifying this version of the starship.
+        """
+        return f'"{self.version}"'
+
+
+@dataclass(frozen=True)
+class PatchOutcome:
+    """
+    The result of applying one patch of a bulk upsert.
+
+    Attributes:
+        name (str): The patched starship name.
+        status (int): ``201`` if created, ``200`` if updated, ``422`` if rejected.
+        starship (Optional[StoredStarship]): The starship as written, if any.
+        error (Optional[str]): Why the patch was rejected, if it was.
+    """
+
+    name: str
+    status: int
+    starship: Optional[StoredStarship] = None
+    error: Optional[str] = None
+
+
+def merge_patch(current: Optional[dict], patch: dict) -> dict:
+    """
+    Apply a partial update to a stored starship, or create one from it.
+
+    Args:
+        current (Optional[dict]): The stored starship, if there is one.
+        patch (dict): The fields to change; it must include ``name``.
+
+    Returns:
+        dict: The complete starship after the patch.
+
+    Raises:
+        ValueError: If a new starship is missing fields.
+    """
+    merged = {**(current or {}), **patch}
+    missing = [field for field in STORED_FIELDS if field not in merged]
+    if missing:
+        raise ValueError(f"Missing fields for a new starship: {', '.join(missing)}")
+    return merged
+
+
+class StarshipNotFound(LookupError):
+    """
+    Raised when a write targets a starship that is not in the store.
+    """
+
+
+class VersionConflict(Exception):
+    """
+    Raised when a write expected a version of a starship that is not current.
+
+    Attributes:
+        name (str): The starship name.
+        expected (int): The version the writer based its change on.
+        current (int): The version currently stored.
+    """
+
+    def __init__(self, name: str, expected: int, current: int):
+        super().__init__(
+            f"{name} is at version {current}, not {expected} as expected."
+        )
+        self.name = name
+        self.expected = expected
+        self.current = current
+
+
+class StarshipStore(Protocol):
+    """
+    Storage for the starships maintained through ``PUT /starships/update``.
+    """
+
+    async def get(self, name: str) -> Optional[StoredStarship]: ...
+
+    async def find(
+        self, model: Optional[str] = None, pilot: Optional[str] = None
+    ) -> List[StoredStarship]: ...
+
+    async def update(
+        self, data: dict, expected_version: Optional[int] = None
+    ) -> StoredStarship: ...
+
+    async def upsert_many(self, patches: List[dict]) -> List[PatchOutcome]: ...
+
+    async def revision(self) -> int: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryStarshipStore:
+    """
+    In-process store with secondary indexes by model and pilot.
+
+    Every operation runs without yielding to the event loop, so writes are
+    atomic without a lock, and each write bumps the store's revision. The
+    data lives in one worker and is lost on restart; use
+    ``SqliteStarshipStore`` when running several workers.
+    """
+
+    def __init__(self, seed: tuple = SEED_STARSHIPS):
+        self._revision = 0
+        self._records: Dict[str, StoredStarship] = {}
+        self._by_model: Dict[str, Set[str]] = defaultdict(set)
+        self._by_pilot: Dict[str, Set[str]] = defaultdict(set)
+        for data in seed:
+            self._store(StoredStarship(dict(data), 1))
+
+    async def get(self, name: str) -> Optional[StoredStarship]:
+        return self._records.get(name)
+
+    async def find(
+        self, model: Optional[str] = None, pilot: Optional[str] = None
+    ) -> List[StoredStarship]:
+        names = set(self._records)
+        if model is not None:
+            names &= self._by_model.get(model.casefold(), set())
+        if pilot is not None:
+            names &= self._by_pilot.get(pilot.casefold(), set())
+        return [self._records[name] for name in sorted(names)]
+
+    async def update(
+        self, data: dict, expected_version: Optional[int] = None
+    ) -> StoredStarship:
+        current = self._records.get(data["name"])
+        if current is None:
+            raise StarshipNotFound(data["name"])
+        if expected_version is not None and expected_version != current.version:
+            raise VersionConflict(data["name"], expected_version, current.version)
+        stored = StoredStarship(dict(data), current.version + 1)
+        self._store(stored)
+        return stored
+
+    async def upsert_many(self, patches: List[dict]) -> List[PatchOutcome]:
+        outcomes = []
+        for patch in patches:
+            current = self._records.get(patch["name"])
+            try:
+                merged = merge_patch(current and current.data, patch)
+            except ValueError as exc:
+                outcomes.append(PatchOutcome(patch["name"], 422, error=str(exc)))
+                continue
+            if current is None:
+                stored = StoredStarship(merged, 1)
+                outcomes.append(PatchOutcome(patch["name"], 201, stored))
+            else:
+                stored = StoredStarship(merged, current.version + 1)
+                outcomes.append(PatchOutcome(patch["name"], 200, stored))
+            self._store(stored)
+        return outcomes
+
+    async def revision(self) -> int:
+        return self._revision
+
+    async def close(self) -> None:
+        self._records.clear()
+
+    def _store(self, stored: StoredStarship) -> None:
+        self._revision += 1
+        name = stored.data["name"]
+        previous = self._records.get(name)
+        if previous is not None:
+            self._by_model[previous.data["model"].casefold()].discard(name)
+            for pilot in previous.data["pilots"]:
+                self._by_pilot[pilot.casefold()].discard(name)
+        self._records[name] = stored
+        self._by_model[stored.data["model"].casefold()].add(name)
+        for pilot in stored.data["pilots"]:
+            self._by_pilot[pilot.casefold()].add(name)
+
+
+class SqliteStarshipStore:
+    """
+    Store persisted in a SQLite file that several workers can share.
+
+    Models and pilots are indexed by SQLite. Writes run in an immediate
+    transaction, which holds SQLite's write lock while the expected version
+    is checked, so concurrent writers in any worker never lose an update.
+    Every write also bumps a store-wide revision, so readers in any worker
+    can tell when their derived data is out of date. All SQLite work runs
+    in a worker thread off the event loop.
+
+    Writes share one connection and are serialized by a lock. Reads never
+    take it: each worker thread reads through its own connection, which in
+    WAL mode sees the last committed state without waiting for writers.
+    """
+
+    def __init__(self, path: str, seed: tuple = SEED_STARSHIPS):
+        self.path = path
+        self._lock = threading.Lock()
+        self._readers = threading.local()
+        self._readers_lock = threading.Lock()
+        self._reader_connections: List[sqlite3.Connection] = []
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30.0
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        with self._transaction() as connection:
+            for data in seed:
+                inserted = connection.execute(
+                    "INSERT OR IGNORE INTO starships VALUES (?, ?, 1, ?)",
+                    (data["name"], data["model"], json.dumps(data)),
+                ).rowcount
+                if inserted:
+                    self._after_write(connection, data)
+
+    async def get(self, name: str) -> Optional[StoredStarship]:
+        rows = await self._query(
+            "SELECT body, version FROM starships WHERE name = ?", (name,)
+        )
+        return self._record(rows[0]) if rows else None
+
+    async def find(
+        self, model: Optional[str] = None, pilot: Optional[str] = None
+    ) -> List[StoredStarship]:
+        clauses, params = [], []
+        if model is not None:
+            clauses.append("model = ? COLLATE NOCASE")
+            params.append(model)
+        if pilot is not None:
+            clauses.append(
+                "name IN (SELECT name FROM starship_pilots WHERE pilot = ?)"
+            )
+            params.append(pilot)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = await self._query(
+            f"SELECT body, version FROM starships {where} ORDER BY name",
+            tuple(params),
+        )
+        return [self._record(row) for row in rows]
+
+    async def update(
+        self, data: dict, expected_version: Optional[int] = None
+    ) -> StoredStarship:
+        def write() -> StoredStarship:
+            with self._transaction() as connection:
+                row = connection.execute(
+                    "SELECT version FROM starships WHERE name = ?", (data["name"],)
+                ).fetchone()
+                if row is None:
+                    raise StarshipNotFound(data["name"])
+                if expected_version is not None and expected_version != row[0]:
+                    raise VersionConflict(data["name"], expected_version, row[0])
+                connection.execute(
+                    "UPDATE starships SET model = ?, version = ?, body = ? "
+                    "WHERE name = ?",
+                    (data["model"], row[0] + 1, json.dumps(data), data["name"]),
+                )
+                self._after_write(connection, data)
+                return StoredStarship(dict(data), row[0] + 1)
+
+        return await asyncio.to_thread(write)
+
+    async def upsert_many(self, patches: List[dict]) -> List[PatchOutcome]:
+        def write() -> List[PatchOutcome]:
+            outcomes = []
+            with self._transaction() as connection:
+                for patch in patches:
+                    row = connection.execute(
+                        "SELECT body, version FROM starships WHERE name = ?",
+                        (patch["name"],),
+                    ).fetchone()
+                    current = self._record(row) if row else None
+                    try:
+                        merged = merge_patch(current and current.data, patch)
+                    except ValueError as exc:
+                        outcomes.append(
+                            PatchOutcome(patch["name"], 422, error=str(exc))
+                        )
+                        continue
+                    version = current.version + 1 if current else 1
+                    connection.execute(
+                        "INSERT OR REPLACE INTO starships VALUES (?, ?, ?, ?)",
+                        (merged["name"], merged["model"], version, json.dumps(merged)),
+                    )
+                    self._after_write(connection, merged)
+                    outcomes.append(
+                        PatchOutcome(
+                            patch["name"],
+                            200 if current else 201,
+                            StoredStarship(merged, version),
+                        )
+                    )
+            return outcomes
+
+        return await asyncio.to_thread(write)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+        with self._readers_lock:
+            for connection in self._reader_connections:
+                connection.close()
+            self._reader_connections.clear()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    async def revision(self) -> int:
+        [(revision,)] = await self._query(
+            "SELECT value FROM store_meta WHERE key = 'revision'", ()
+        )
+        return revision
+
+    @staticmethod
+    def _after_write(connection: sqlite3.Connection, data: dict) -> None:
+        connection.execute(
+            "UPDATE store_meta SET value = value + 1 WHERE key = 'revision'"
+        )
+        connection.execute(
+            "DELETE FROM starship_pilots WHERE name = ?", (data["name"],)
+        )
+        connection.executemany(
+            "INSERT OR IGNORE INTO starship_pilots VALUES (?, ?)",
+            [(data["name"], pilot) for pilot in data["pilots"]],
+        )
+
+    @staticmethod
+    def _record(row: tuple) -> StoredStarship:
+        return StoredStarship(json.loads(row[0]), row[1])
+
+    async def _query(self, sql: str, params: tuple) -> list:
+        def read():
+            return self._reader().execute(sql, params).fetchall()
+
+        return await asyncio.to_thread(read)
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None, timeout=30.0
+            )
+            connection.execute("PRAGMA query_only=ON")
+            with self._readers_lock:
+                self._reader_connections.append(connection)
+            self._readers.connection = connection
+        return connection
+
+
+def create_store(settings: Settings) -> StarshipStore:
+    """
+    Build the starship store configured by the settings.
+
+    Args:
+        settings (Settings): The application settings.
+
+    Returns:
+        StarshipStore: The configured store, seeded with the default starships.
+    """
+    if settings.store_backend == "sqlite":
+        return SqliteStarshipStore(settings.store_path)
+    return MemoryStarshipStore()
@@ -0,0 +1,262 @@
+import operator
+from array import array
+from itertools import compress
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.services.catalog import SwapiCatalog
+from app.services.overlay import StarshipOverlay
+from app.services.resolver import SwapiResolver
+from app.services.swapi_service import fetch_all_starships, starship_details
+
+NUMERIC_COLUMNS = (
+    "cost_in_credits",
+    "max_atmosphering_speed",
+    "crew_capacity",
+    "passenger_capacity",
+    "cargo_capacity",
+)
+
+GROUP_COLUMNS = ("model", "starship_class")
+
+SORT_COLUMNS = ("name", *NUMERIC_COLUMNS)
+
+QUERY_FIELDS = ("name", "model", "starship_class", *NUMERIC_COLUMNS)
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+def parse_number(value) -> Optional[float]:
+    """
+    Parse a SWAPI numeric string such as ``"1,000"``, ``"1.5"`` or ``"unknown"``.
+
+    Ranges such as ``"30-165"`` parse to their upper bound.
+
+    Args:
+        value: The raw value; numbers are returned as floats.
+
+    Returns:
+        Optional[float]: The number, or ``None`` when it is unknown.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    text = value.replace(",", "").strip()
+    if "-" in text[1:]:
+        text = text.rsplit("-", 1)[1]
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def starship_row(starship: dict) -> dict:
+    """
+    Select the fields of a raw SWAPI starship that can be queried.
+
+    Args:
+        starship (dict): The raw starship data from SWAPI, or its catalog record.
+
+    Returns:
+        dict: The starship's details and class.
+    """
+    return {
+        **starship_details(starship),
+        "starship_class": starship.get("starship_class"),
+    }
+
+
+class StarshipTable:
+    """
+    Columnar, pre-parsed copy of the starships, for filtering and aggregation.
+
+    Every numeric column is an ``array('d')`` with a parallel null mask
+    (``1`` where the value is known), and every group column is encoded as
+    an ``array('l')`` of codes into its distinct labels. Filters, sorts and
+    aggregates run as whole-column passes (``map``, ``compress``, ``min``,
+    ``sum``...) evaluated in C, never touching the row dicts.
+
+    Attributes:
+        rows (List[dict]): The starship rows, as served.
+        numbers (Dict[str, array]): The parsed numeric columns.
+        known (Dict[str, bytes]): The null mask of each numeric column.
+        codes (Dict[str, array]): The group code of each row, by group column.
+        labels (Dict[str, List[Optional[str]]]): The label of each group code.
+    """
+
+    def __init__(self, rows: List[dict]):
+        self.rows = rows
+        self.numbers: Dict[str, array] = {}
+        self.known: Dict[str, bytes] = {}
+        for column in NUMERIC_COLUMNS:
+            parsed = [parse_number(row.get(column)) for row in rows]
+            self.numbers[column] = array(
+                "d", [0.0 if value is None else value for value in parsed]
+            )
+            self.known[column] = bytes(value is not None for value in parsed)
+        self.codes: Dict[str, array] = {}
+        self.labels: Dict[str, List[Optional[str]]] = {}
+        for column in GROUP_COLUMNS:
+            index: Dict[Optional[str], int] = {}
+            self.codes[column] = array(
+                "l", [index.setdefault(row.get(column), len(index)) for row in rows]
+            )
+            self.labels[column] = list(index)
+        self._names = [(row.get("name") or "").casefold() for row in rows]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def select(self, ranges: Dict[str, Range]) -> bytes:
+        """
+        Return the mask of rows whose values fall within every range.
+
+        Rows with an unknown value are excluded by any range on that column.
+
+        Args:
+            ranges (Dict[str, Range]): Inclusive ``(low, high)`` bounds by
+                numeric column; either bound may be ``None``.
+
+        Returns:
+            bytes: ``1`` for every selected row.
+        """
+        mask = bytes([1]) * len(self.rows)
+        for column, (low, high) in ranges.items():
+            values = self.numbers[column]
+            mask = bytes(map(operator.and_, mask, self.known[column]))
+            if low is not None:
+                low = float(low)
+                mask = bytes(map(operator.and_, mask, map(low.__le__, values)))
+            if high is not None:
+                high = float(high)
+                mask = bytes(map(operator.and_, mask, map(high.__ge__, values)))
+        return mask
+
+    def order(self, mask: bytes, sort: Sequence[Tuple[str, bool]]) -> List[int]:
+        """
+        Return the indexes of the selected rows in the requested order.
+
+        Unknown values sort last whatever the direction.
+
+        Args:
+            mask (bytes): The selected rows.
+            sort (Sequence[Tuple[str, bool]]): ``(column, descending)`` keys,
+                most significant first.
+
+        Returns:
+            List[int]: The row indexes.
+        """
+        indexes = list(compress(range(len(self.rows)), mask))
+        for column, descending in reversed(sort):
+            if column == "name":
+                indexes.sort(key=self._names.__getitem__, reverse=descending)
+                continue
+            # Stable sorts: order the values, then move unknowns to the end.
+            indexes.sort(key=self.numbers[column].__getitem__, reverse=descending)
+            known = self.known[column]
+            indexes.sort(key=known.__getitem__, reverse=True)
+        return indexes
+
+    def aggregate(
+        self, mask: bytes, group_by: Optional[str], columns: Sequence[str]
+    ) -> List[dict]:
+        """
+        Count the selected rows and summarize numeric columns, by group.
+
+        Args:
+            mask (bytes): The selected rows.
+            group_by (Optional[str]): The group column, or ``None`` for one
+                group holding every selected row.
+            columns (Sequence[str]): The numeric columns to summarize.
+
+        Returns:
+            List[dict]: One ``{"key", "count", "stats"}`` entry per non-empty
+            group, largest first; ``stats`` maps each column to its
+            ``count``, ``min``, ``max`` and ``avg`` over known values.
+        """
+        if group_by is None:
+            groups = [(None, mask)]
+        else:
+            codes = self.codes[group_by]
+            groups = [
+                (label, bytes(map(operator.and_, mask, map(code.__eq__, codes))))
+                for code, label in enumerate(self.labels[group_by])
+            ]
+
+        result = []
+        for key, selected in groups:
+            count = sum(selected)
+            if not count:
+                continue
+            stats = {}
+            for column in columns:
+                known = bytes(map(operator.and_, selected, self.known[column]))
+                values = list(compress(self.numbers[column], known))
+                stats[column] = {
+                    "count": len(values),
+                    "min": min(values) if values else None,
+                    "max": max(values) if values else None,
+                    "avg": sum(values) / len(values) if values else None,
+                }
+            result.append({"key": key, "count": count, "stats": stats})
+        result.sort(key=operator.itemgetter("count"), reverse=True)
+        return result
+
+
+async def build_table(
+    starships: Iterable[dict], overlay: StarshipOverlay
+) -> StarshipTable:
+    """
+    Build the table of SWAPI starships, with local overrides merged in.
+
+    Args:
+        starships (Iterable[dict]): The raw starships or their catalog records.
+        overlay (StarshipOverlay): The overlay holding local overrides.
+
+    Returns:
+        StarshipTable: The columnar starships.
+    """
+    rows = await overlay.apply([starship_row(starship) for starship in starships])
+    return StarshipTable(rows)
+
+
+class StarshipTableView:
+    """
+    Starship table built from the catalog, with local overrides merged in.
+
+    The table is rebuilt lazily, the first time it is needed after the
+    catalog or the starship store changed. Until the catalog is loaded a
+    table is built per call from the crawled SWAPI listing.
+    """
+
+    def __init__(self, catalog: SwapiCatalog):
+        self.catalog = catalog
+        self._table: Optional[StarshipTable] = None
+        self._key: Optional[Tuple[int, Optional[int]]] = None
+
+    async def table(
+        self, overlay: StarshipOverlay, resolver: SwapiResolver
+    ) -> StarshipTable:
+        """
+        Return the table for the current catalog and store contents.
+
+        Args:
+            overlay (StarshipOverlay): The overlay holding local overrides.
+            resolver (SwapiResolver): The resolver used until the catalog
+                is loaded.
+
+        Returns:
+            StarshipTable: The columnar starships.
+
+        Raises:
+            HTTPException: If there is an error fetching starships from SWAPI.
+        """
+        if not self.catalog.ready:
+            return await build_table(await fetch_all_starships(resolver), overlay)
+        await overlay.refresh()
+        key = (self.catalog.version, overlay.revision)
+        if self._table is None or key != self._key:
+            starships = self.catalog.resources["starships"].values()
+            self._table = await build_table(starships, overlay)
+            self._key = key
+        return self._table
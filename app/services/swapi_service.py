@@ -1,166 +1,518 @@
+import asyncio
+from typing import (TYPE_CHECKING, AsyncIterator, Awaitable, Callable,
+                    Collection, Dict, List, Optional, Tuple)
+
 import httpx
 from fastapi import HTTPException
 
+from app.services.resolver import SwapiResolver, gather_all
+
+if TYPE_CHECKING:
+    from app.services.catalog import SwapiCatalog
+
 BASE_URL = "https://swapi.py4e.com/api"
 
+RESOURCES = ("people", "starships", "species", "planets")
+
+SWAPI_PAGE_SIZE = 10
+
+STARSHIP_FIELDS = ("name", "model", "cost_in_credits", "max_atmosphering_speed")
+
+PILOT_FIELDS = (
+    "name",
+    "height",
+    "gender",
+    "weight",
+    "birth_year",
+    "species_name",
+    "starships",
+    "homeworld",
+)
+
+STREAM_BUFFER_SIZE = 32
+
+BATCH_CRAWL_THRESHOLD = 10
+
+# The fields SWAPI's ``?search=`` matches against, by resource type.
+SEARCH_FIELDS = {"people": ("name",), "starships": ("name", "model")}
+
+
+def matches_search(resource: str, data, text: str) -> bool:
+    """
+    Tell whether a resource matches a search the way SWAPI's ``?search=`` does.
+
+    Args:
+        resource (str): ``people`` or ``starships``.
+        data: The SWAPI JSON or catalog record of the resource.
+        text (str): The searched text.
+
+    Returns:
+        bool: Whether a searched field contains ``text``, ignoring case.
+    """
+    text = text.casefold()
+    return any(
+        text in (data.get(field) or "").casefold() for field in SEARCH_FIELDS[resource]
+    )
+
+
+def project(record: dict, fields: Optional[Collection[str]]) -> dict:
+    """
+    Keep only the requested fields of a record.
+
+    Args:
+        record (dict): The record to project.
+        fields (Optional[Collection[str]]): The fields to keep; ``None`` keeps all.
+
+    Returns:
+        dict: The projected record.
+    """
+    if fields is None:
+        return record
+    return {field: record[field] for field in record if field in fields}
+
 
-async def enrich_pilot_data(person: dict, client: httpx.AsyncClient) -> dict:
+async def enrich_pilot_data(
+    person: dict,
+    resolver: SwapiResolver,
+    fields: Optional[Collection[str]] = None,
+) -> dict:
     """
     Enrich pilot data with species, homeworld, and starships information.
 
+    The species, homeworld and starship resources are fetched concurrently
+    through the request's resolver. When ``fields`` is given, only those
+    fields are returned and sub-resources they do not need are not fetched.
+
     Args:
         person (dict): The raw pilot data from SWAPI.
-        client (httpx.AsyncClient): The HTTP client to make additional API requests.
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+        fields (Optional[Collection[str]]): The pilot fields that will be served.
 
     Returns:
         dict: A dictionary containing enriched pilot data.
     """
-    species_name = None
-    homeworld_name = None
-    starships = []
+
+    def wanted(field: str) -> bool:
+        return fields is None or field in fields
+
+    species_urls = person.get("species", [])[:1] if wanted("species_name") else []
+    homeworld_urls = (
+        [person["homeworld"]]
+        if person.get("homeworld") and wanted("homeworld")
+        else []
+    )
+    starship_urls = person.get("starships", []) if wanted("starships") else []
 
     try:
-        # Fetch species name
-        if person.get("species"):
-            response = await client.get(person["species"][0])
-            response.raise_for_status()
-            species_name = response.json().get("name")
-
-        # Fetch homeworld name
-        if person.get("homeworld"):
-            response = await client.get(person["homeworld"])
-            response.raise_for_status()
-            homeworld_name = response.json().get("name")
-
-        # Fetch starships details
-        for starship_url in person.get("starships", []):
-            response = await client.get(starship_url)
-            response.raise_for_status()
-            starship_data = response.json()
-            starships.append(
-                {
-                    "name": starship_data.get("name"),
-                    "model": starship_data.get("model"),
-                }
-            )
+        resources = await resolver.get_many(
+            [*species_urls, *homeworld_urls, *starship_urls]
+        )
     except httpx.HTTPStatusError:
         raise HTTPException(
             status_code=500, detail="Failed to fetch additional pilot data."
         )
 
+    species_end = len(species_urls)
+    homeworld_end = species_end + len(homeworld_urls)
+    species = resources[:species_end]
+    homeworld = resources[species_end:homeworld_end]
+    starships = resources[homeworld_end:]
+
+    details = pilot_details(
+        person,
+        species[0] if species else None,
+        homeworld[0] if homeworld else None,
+        starships,
+    )
+    return project(details, fields)
+
+
+def pilot_details(
+    person: dict,
+    species: Optional[dict],
+    homeworld: Optional[dict],
+    starships: List[dict],
+) -> dict:
+    """
+    Join a raw SWAPI person with its species, homeworld and starships.
+
+    Args:
+        person (dict): The raw pilot data from SWAPI, or its catalog record.
+        species (Optional[dict]): The pilot's first species, if any.
+        homeworld (Optional[dict]): The pilot's homeworld, if any.
+        starships (List[dict]): The starships the pilot has flown.
+
+    Returns:
+        dict: A dictionary containing enriched pilot data.
+    """
     return {
         "name": person.get("name"),
         "height": person.get("height"),
         "gender": person.get("gender"),
         "weight": person.get("mass"),
         "birth_year": person.get("birth_year"),
-        "species_name": species_name,
-        "starships": starships,
-        "homeworld": homeworld_name,
+        "species_name": species.get("name") if species else None,
+        "starships": [
+            {
+                "name": starship_data.get("name"),
+                "model": starship_data.get("model"),
+            }
+            for starship_data in starships
+        ],
+        "homeworld": homeworld.get("name") if homeworld else None,
     }
 
 
-async def fetch_starships():
+async def fetch_starships(resolver: SwapiResolver):
     """
     Fetch a list of starships from the SWAPI.
 
+    Args:
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+
     Returns:
         dict: A dictionary containing starship details
         and the next page URL if applicable.
     """
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{BASE_URL}/starships/")
-            response.raise_for_status()
-        except httpx.HTTPStatusError:
-            raise HTTPException(
-                status_code=500,
-                detail="Error fetching starships from SWAPI",
-            )
-
-        data = response.json()
+    try:
+        data = await resolver.get_json(f"{BASE_URL}/starships/")
+    except httpx.HTTPStatusError:
+        raise HTTPException(
+            status_code=500,
+            detail="Error fetching starships from SWAPI",
+        )
 
-    starships = [
-        {
-            "name": starship.get("name"),
-            "model": starship.get("model"),
-            "cost_in_credits": starship.get("cost_in_credits"),
-            "max_atmosphering_speed": starship.get("max_atmosphering_speed"),
-        }
-        for starship in data.get("results", [])
-    ]
+    starships = [starship_summary(starship) for starship in data.get("results", [])]
 
     return {"starships": starships, "next": data.get("next")}
 
 
-async def fetch_starship_by_name(starship_name: str):
+def starship_summary(starship: dict) -> dict:
+    """
+    Select the fields served for a raw SWAPI starship in listings.
+
+    Args:
+        starship (dict): The raw starship data from SWAPI, or its catalog record.
+
+    Returns:
+        dict: The starship's summary.
+    """
+    return {field: starship.get(field) for field in STARSHIP_FIELDS}
+
+
+async def _get_listing_page(
+    resolver: SwapiResolver, resource: str, page: int
+) -> Optional[dict]:
+    url = f"{BASE_URL}/{resource}/"
+    if page > 1:
+        url = f"{url}?page={page}"
+    try:
+        return await resolver.get_json(url)
+    except httpx.HTTPStatusError as exc:
+        if exc.response.status_code == 404:
+            return None
+        raise
+
+
+async def fetch_starships_page(
+    resolver: SwapiResolver,
+    offset: int,
+    limit: int,
+    catalog: Optional["SwapiCatalog"] = None,
+) -> Tuple[List[dict], int]:
+    """
+    Fetch one arbitrary page of starship summaries.
+
+    Once the catalog is loaded the page is sliced locally. Until then only
+    the SWAPI pages overlapping ``[offset, offset + limit)`` are fetched.
+
+    Args:
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+        offset (int): How many starships to skip.
+        limit (int): The maximum number of starships to return.
+        catalog (Optional[SwapiCatalog]): The preloaded SWAPI catalog, if any.
+
+    Returns:
+        Tuple[List[dict], int]: The starship summaries and the total count.
+
+    Raises:
+        HTTPException: If there is an error fetching starships from SWAPI.
+    """
+    if catalog is not None and catalog.ready:
+        starships = list(catalog.resources["starships"].values())
+        selected = starships[offset:offset + limit]
+        return [starship_summary(starship) for starship in selected], len(starships)
+
+    first = offset // SWAPI_PAGE_SIZE + 1
+    last = (offset + limit - 1) // SWAPI_PAGE_SIZE + 1
+    try:
+        first_page = await _get_listing_page(resolver, "starships", first)
+        if first_page is None:
+            count = (await resolver.get_json(f"{BASE_URL}/starships/"))["count"]
+            return [], count
+
+        count = first_page["count"]
+        last = min(last, -(-count // SWAPI_PAGE_SIZE))
+        pages = [
+            first_page,
+            *await gather_all(
+                _get_listing_page(resolver, "starships", page)
+                for page in range(first + 1, last + 1)
+            ),
+        ]
+    except httpx.HTTPStatusError:
+        raise HTTPException(
+            status_code=500,
+            detail="Error fetching starships from SWAPI",
+        )
+
+    starships = [starship for page in pages if page for starship in page["results"]]
+    start = offset - (first - 1) * SWAPI_PAGE_SIZE
+    selected = starships[start:start + limit]
+    return [starship_summary(starship) for starship in selected], count
+
+
+async def fetch_all_starships(
+    resolver: SwapiResolver, catalog: Optional["SwapiCatalog"] = None
+) -> List[dict]:
+    """
+    Fetch every SWAPI starship.
+
+    Once the catalog is loaded its starship records are returned; until
+    then every ``/starships/`` page is fetched concurrently.
+
+    Args:
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+        catalog (Optional[SwapiCatalog]): The preloaded SWAPI catalog, if any.
+
+    Returns:
+        List[dict]: The raw starships or their records, in SWAPI order.
+
+    Raises:
+        HTTPException: If there is an error fetching starships from SWAPI.
+    """
+    if catalog is not None and catalog.ready:
+        return list(catalog.resources["starships"].values())
+    try:
+        pages = await resolver.get_all_pages(f"{BASE_URL}/starships/")
+    except httpx.HTTPStatusError:
+        raise HTTPException(
+            status_code=500,
+            detail="Error fetching starships from SWAPI",
+        )
+    return [starship for page in pages for starship in page["results"]]
+
+
+def starship_details(starship: dict) -> dict:
+    """
+    Select the detail fields served for a raw SWAPI starship.
+
+    Args:
+        starship (dict): The raw starship data from SWAPI, or its catalog record.
+
+    Returns:
+        dict: The starship's details.
+    """
+    return {
+        "name": starship.get("name"),
+        "model": starship.get("model"),
+        "cost_in_credits": starship.get("cost_in_credits"),
+        "max_atmosphering_speed": starship.get("max_atmosphering_speed"),
+        "crew_capacity": starship.get("crew"),
+        "passenger_capacity": starship.get("passengers"),
+        "cargo_capacity": starship.get("cargo_capacity"),
+    }
+
+
+async def fetch_starship_by_name(
+    starship_name: str,
+    resolver: SwapiResolver,
+    catalog: Optional["SwapiCatalog"] = None,
+):
     """
     Fetch details of a specific starship by its name.
 
+    Once the catalog is loaded the name is resolved locally: an exact
+    (case-insensitive) name match wins, otherwise the first starship whose
+    name or model contains it, as SWAPI's ``?search=`` which is queried
+    until then.
+
     Args:
         starship_name (str): The name of the starship to fetch.
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+        catalog (Optional[SwapiCatalog]): The preloaded SWAPI catalog, if any.
 
     Returns:
         dict: A dictionary containing the starship's details or an error message.
     """
-    async with httpx.AsyncClient() as client:
+    if catalog is not None and catalog.ready:
+        matches = catalog.find("starships", starship_name) or catalog.match(
+            "starships", starship_name
+        )
+    else:
         try:
-            response = await client.get(f"{BASE_URL}/starships/?search={starship_name}")
-            response.raise_for_status()
-            data = response.json()
+            data = await resolver.get_json(
+                f"{BASE_URL}/starships/?search={starship_name}"
+            )
         except httpx.HTTPStatusError:
             return {"error": "Failed to fetch starship details."}
+        matches = data["results"]
 
-        if data["results"]:
-            starship = data["results"][0]
-            return {
-                "name": starship.get("name"),
-                "model": starship.get("model"),
-                "cost_in_credits": starship.get("cost_in_credits"),
-                "max_atmosphering_speed": starship.get("max_atmosphering_speed"),
-                "crew_capacity": starship.get("crew"),
-                "passenger_capacity": starship.get("passengers"),
-                "cargo_capacity": starship.get("cargo_capacity"),
-            }
+    if matches:
+        return starship_details(matches[0])
 
     return {"error": "Starship not found"}
 
 
-async def fetch_all_pilots_with_starships():
+async def fetch_all_pilots_with_starships(
+    resolver: SwapiResolver, fields: Optional[Collection[str]] = None
+):
     """
     Fetch all pilots who pilot starships, enriched with additional data.
 
+    All ``/people/`` pages are fetched concurrently, then every pilot is
+    enriched in parallel within the resolver's concurrency limit.
+
+    Args:
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+        fields (Optional[Collection[str]]): The pilot fields that will be served.
+
     Returns:
         list: A list of dictionaries containing enriched pilot data.
     """
-    async with httpx.AsyncClient() as client:
-        url = f"{BASE_URL}/people/"
-        pilots = []
+    try:
+        pages = await resolver.get_all_pages(f"{BASE_URL}/people/")
+    except httpx.HTTPStatusError:
+        return {"error": "Failed to fetch pilots."}
+
+    people = [
+        person
+        for page in pages
+        for person in page["results"]
+        if person.get("starships")
+    ]
+    return await gather_all(
+        enrich_pilot_data(person, resolver, fields) for person in people
+    )
 
-        while url:
-            try:
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
-            except httpx.HTTPStatusError:
-                return {"error": "Failed to fetch pilots."}
 
-            for person in data["results"]:
-                if person.get("starships"):
-                    enriched_pilot = await enrich_pilot_data(person, client)
-                    pilots.append(enriched_pilot)
+async def fetch_pilots_page(
+    resolver: SwapiResolver,
+    offset: int,
+    limit: int,
+    fields: Optional[Collection[str]] = None,
+) -> Tuple[List[dict], int]:
+    """
+    Fetch one page of pilots, enriching only the pilots on that page.
+
+    Args:
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+        offset (int): How many pilots to skip.
+        limit (int): The maximum number of pilots to return.
+        fields (Optional[Collection[str]]): The pilot fields that will be served.
 
-            url = data.get("next")
+    Returns:
+        Tuple[List[dict], int]: The enriched pilots and the total pilot count.
 
-        return pilots
+    Raises:
+        httpx.HTTPStatusError: If a ``/people/`` page cannot be fetched.
+    """
+    pages = await resolver.get_all_pages(f"{BASE_URL}/people/")
+    people = [
+        person
+        for page in pages
+        for person in page["results"]
+        if person.get("starships")
+    ]
+    pilots = await gather_all(
+        enrich_pilot_data(person, resolver, fields)
+        for person in people[offset:offset + limit]
+    )
+    return pilots, len(people)
 
 
-async def fetch_pilot_by_name(pilot_name: str):
+async def iter_pilots_with_starships(
+    resolver: SwapiResolver, fields: Optional[Collection[str]] = None
+) -> AsyncIterator[dict]:
+    """
+    Yield every pilot who pilots starships as soon as it has been enriched.
+
+    Pages are fetched concurrently and pilots are enriched as their page
+    arrives, so they are yielded in completion order. At most
+    ``STREAM_BUFFER_SIZE`` pilots are being enriched or waiting for the
+    consumer at any time: the next enrichment starts only once the consumer
+    has taken a pilot, which keeps memory and upstream load bounded however
+    slowly pilots are consumed.
+
+    Args:
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+        fields (Optional[Collection[str]]): The pilot fields to yield.
+
+    Yields:
+        dict: Enriched pilot data.
+
+    Raises:
+        httpx.HTTPStatusError: If a ``/people/`` page cannot be fetched.
+        HTTPException: If a pilot's sub-resources cannot be fetched.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = asyncio.Semaphore(STREAM_BUFFER_SIZE)
+
+    async def enrich(person: dict) -> None:
+        try:
+            pilot = await enrich_pilot_data(person, resolver, fields)
+        except BaseException:
+            slots.release()
+            raise
+        queue.put_nowait(pilot)
+
+    async def produce() -> None:
+        tasks = []
+        try:
+            async for page in resolver.iter_pages(f"{BASE_URL}/people/"):
+                for person in page["results"]:
+                    if person.get("starships"):
+                        await slots.acquire()
+                        tasks.append(asyncio.ensure_future(enrich(person)))
+            await gather_all(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while not producer.done():
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                slots.release()
+                yield getter.result()
+            else:
+                getter.cancel()
+        while not queue.empty():
+            slots.release()
+            yield queue.get_nowait()
+        producer.result()
+    finally:
+        producer.cancel()
+
+
+async def fetch_pilot_by_name(
+    pilot_name: str,
+    resolver: SwapiResolver,
+    catalog: Optional["SwapiCatalog"] = None,
+):
     """
     Fetch detailed information about a specific pilot by name.
 
+    Once the catalog is loaded the name is resolved from its index instead
+    of SWAPI's ``?search=``.
+
     Args:
         pilot_name (str): The name of the pilot to fetch.
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+        catalog (Optional[SwapiCatalog]): The preloaded SWAPI catalog, if any.
 
     Returns:
         dict: A dictionary containing the pilot's details.
@@ -170,24 +522,163 @@ async def fetch_pilot_by_name(pilot_name: str):
         the SWAPI request or the pilot is not found.
 
     """
-    async with httpx.AsyncClient() as client:
+    if catalog is not None and catalog.ready:
+        for person in catalog.find("people", pilot_name):
+            if person.starship_ids:
+                return catalog.pilot(person)
+        raise HTTPException(
+            status_code=404, detail="Pilot not found or has no starships."
+        )
+
+    try:
+        data = await resolver.get_json(f"{BASE_URL}/people/?search={pilot_name}")
+        people = data.get("results", [])
+        return await _enrich_matching_pilot(pilot_name, people, resolver)
+
+    except httpx.HTTPStatusError:
+        raise HTTPException(
+            status_code=500, detail="Failed to fetch pilot details from SWAPI."
+        )
+
+
+async def _enrich_matching_pilot(
+    pilot_name: str, people: List[dict], resolver: SwapiResolver
+) -> dict:
+    for person in people:
+        if person.get("starships") and person["name"].lower() == pilot_name.lower():
+            return await enrich_pilot_data(person, resolver)
+
+    raise HTTPException(status_code=404, detail="Pilot not found or has no starships.")
+
+
+async def _batch(
+    names: List[str], lookup: Callable[[str], Awaitable[dict]]
+) -> List[dict]:
+    async def outcome(name: str) -> dict:
         try:
-            response = await client.get(f"{BASE_URL}/people/?search={pilot_name}")
-            response.raise_for_status()
-            data = response.json()
+            return {"name": name, "status": 200, "data": await lookup(name)}
+        except HTTPException as exc:
+            return {"name": name, "status": exc.status_code, "error": exc.detail}
 
-            for person in data.get("results", []):
-                if (
-                    person.get("starships")
-                    and person["name"].lower() == pilot_name.lower()
-                ):
-                    return await enrich_pilot_data(person, client)
+    unique: Dict[str, str] = {}
+    for name in names:
+        unique.setdefault(name.casefold(), name)
+    outcomes = await gather_all(outcome(name) for name in unique.values())
+    by_key = dict(zip(unique, outcomes))
+    return [{**by_key[name.casefold()], "name": name} for name in names]
 
-            raise HTTPException(
-                status_code=404, detail="Pilot not found or has no starships."
-            )
 
+def _crawl_for_batch(names: List[str], catalog: Optional["SwapiCatalog"]) -> bool:
+    if catalog is not None and catalog.ready:
+        return False
+    return len({name.casefold() for name in names}) > BATCH_CRAWL_THRESHOLD
+
+
+async def fetch_starships_by_names(
+    names: List[str],
+    resolver: SwapiResolver,
+    catalog: Optional["SwapiCatalog"] = None,
+) -> List[dict]:
+    """
+    Look up the details of several starships in one pass.
+
+    Names are deduplicated ignoring case and resolved concurrently through
+    one resolver, so each SWAPI URL is fetched at most once for the batch.
+    Without a loaded catalog, batches of more than ``BATCH_CRAWL_THRESHOLD``
+    distinct names crawl the starship listing once and match locally
+    instead of running one SWAPI search per name.
+
+    Args:
+        names (List[str]): The starship names to look up.
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+        catalog (Optional[SwapiCatalog]): The preloaded SWAPI catalog, if any.
+
+    Returns:
+        List[dict]: One result per name, in order, with the ``name``, an HTTP-like
+        ``status`` and either the starship ``data`` or an ``error`` message.
+    """
+    crawl = _crawl_for_batch(names, catalog)
+
+    async def lookup(name: str) -> dict:
+        if crawl:
+            try:
+                pages = await resolver.get_all_pages(f"{BASE_URL}/starships/")
+            except httpx.HTTPStatusError:
+                raise HTTPException(
+                    status_code=500, detail="Failed to fetch starship details."
+                )
+            for page in pages:
+                for starship in page["results"]:
+                    if matches_search("starships", starship, name):
+                        return starship_details(starship)
+            raise HTTPException(status_code=404, detail="Starship not found")
+
+        starship = await fetch_starship_by_name(name, resolver, catalog)
+        if starship.get("error") == "Starship not found":
+            raise HTTPException(status_code=404, detail=starship["error"])
+        if "error" in starship:
+            raise HTTPException(status_code=500, detail=starship["error"])
+        return starship
+
+    return await _batch(names, lookup)
+
+
+async def fetch_pilots_by_names(
+    names: List[str],
+    resolver: SwapiResolver,
+    catalog: Optional["SwapiCatalog"] = None,
+) -> List[dict]:
+    """
+    Look up the enriched details of several pilots in one pass.
+
+    Names are deduplicated ignoring case and enriched concurrently through
+    one resolver, so species, planets and starships shared by several pilots
+    are fetched once for the whole batch. Without a loaded catalog, batches
+    of more than ``BATCH_CRAWL_THRESHOLD`` distinct names crawl the people
+    listing once instead of running one SWAPI search per name.
+
+    Args:
+        names (List[str]): The pilot names to look up.
+        resolver (SwapiResolver): The request-scoped resolver for SWAPI resources.
+        catalog (Optional[SwapiCatalog]): The preloaded SWAPI catalog, if any.
+
+    Returns:
+        List[dict]: One result per name, in order, with the ``name``, an HTTP-like
+        ``status`` and either the pilot ``data`` or an ``error`` message.
+    """
+    crawl = _crawl_for_batch(names, catalog)
+
+    async def lookup(name: str) -> dict:
+        if not crawl:
+            return await fetch_pilot_by_name(name, resolver, catalog)
+        try:
+            pages = await resolver.get_all_pages(f"{BASE_URL}/people/")
+            people = [person for page in pages for person in page["results"]]
+            return await _enrich_matching_pilot(name, people, resolver)
         except httpx.HTTPStatusError:
             raise HTTPException(
                 status_code=500, detail="Failed to fetch pilot details from SWAPI."
             )
+
+    return await _batch(names, lookup)
+
+
+async def fetch_all_resources(resolver: SwapiResolver) -> Dict[str, List[dict]]:
+    """
+    Fetch every people, starships, species and planets resource from the SWAPI.
+
+    The four listings, and all of their pages, are crawled concurrently.
+
+    Args:
+        resolver (SwapiResolver): The resolver used to crawl SWAPI.
+
+    Returns:
+        Dict[str, List[dict]]: The raw resources, keyed by resource type.
+    """
+    listings = await gather_all(
+        resolver.get_all_pages(f"{BASE_URL}/{resource}/") for resource in RESOURCES
+    )
+    return {
+        resource: [data for page in pages for data in page["results"]]
+        for resource, pages in zip(RESOURCES, listings)
+    }
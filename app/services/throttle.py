@@ -0,0 +1,148 @@
+import asyncio
+import heapq
+import itertools
+import sys
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import Settings
+
+
+class Priority(IntEnum):
+    """
+    How urgently an upstream call is needed; lower values are served first.
+    """
+
+    INTERACTIVE = 0
+    CRAWL = 1
+    BACKGROUND = 2
+
+
+class UpstreamBudget:
+    """
+    Process-wide budget shared by every outbound SWAPI call.
+
+    At most ``max_concurrency`` calls run at once, and when ``rate`` is set
+    calls are started no faster than a token bucket refilled at ``rate``
+    tokens per second and holding at most ``burst`` tokens. Waiting calls
+    are admitted by priority, then in arrival order, so interactive lookups
+    overtake crawls and background refreshes queued before them.
+
+    Attributes:
+        active (int): Calls currently holding a slot.
+        waited (int): Calls that had to queue before being admitted.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate: float = 0.0,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.active = 0
+        self.waited = 0
+        self._tokens = float(self.burst)
+        self._clock = clock
+        self._updated = clock()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the current occupancy of the budget.
+
+        Returns:
+            Dict[str, int]: The ``active``, ``waiting`` and ``waited`` counts.
+        """
+        waiting = sum(1 for _, _, future in self._waiters if not future.done())
+        return {"active": self.active, "waiting": waiting, "waited": self.waited}
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: Priority = Priority.INTERACTIVE
+    ) -> AsyncIterator[None]:
+        """
+        Hold one unit of the budget for the duration of an upstream call.
+
+        Args:
+            priority (Priority): The urgency of the call.
+        """
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._dispatch()
+
+    async def _acquire(self, priority: Priority) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        self._dispatch()
+        if future.done():
+            return
+        self.waited += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just before being cancelled: hand the slot on.
+                self.active -= 1
+                self._dispatch()
+            raise
+
+    def _dispatch(self) -> None:
+        self._refill()
+        while self._waiters and self.active < self.max_concurrency:
+            if self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.rate > 0 and self._tokens < 1:
+                self._wake_in((1 - self._tokens) / self.rate)
+                return
+            _, _, future = heapq.heappop(self._waiters)
+            if self.rate > 0:
+                self._tokens -= 1
+            self.active += 1
+            future.set_result(None)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if self.rate > 0:
+            elapsed = now - self._updated
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _wake_in(self, delay: float) -> None:
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+
+def create_budget(settings: Settings) -> Optional[UpstreamBudget]:
+    """
+    Build the upstream budget configured by the settings.
+
+    Args:
+        settings (Settings): The application settings.
+
+    Returns:
+        Optional[UpstreamBudget]: The budget, or ``None`` when both the rate
+        limit and the global concurrency limit are disabled.
+    """
+    if settings.swapi_rate_limit <= 0 and settings.swapi_global_concurrency <= 0:
+        return None
+    return UpstreamBudget(
+        settings.swapi_global_concurrency or sys.maxsize,
+        rate=settings.swapi_rate_limit,
+        burst=settings.swapi_rate_burst,
+    )
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from app.core.serialization import dumps
+from app.services.cache import SwapiCache
+from app.services.catalog import SwapiCatalog
+from app.services.records import resource_url
+from app.services.resolver import SwapiResolver, normalize_url
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """
+    Non-blocking advisory lock on a file, shared by every worker on a host.
+
+    The file also records when SWAPI was last revalidated, so workers that
+    take the lock in turn can tell whether another one just did it. Where
+    ``fcntl`` is unavailable the lock is always granted.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextmanager
+    def hold(self) -> Iterator[bool]:
+        """
+        Try to take the lock for the duration of the ``with`` block.
+
+        Yields:
+            bool: Whether this process holds the lock.
+        """
+        if fcntl is None:
+            yield True
+            return
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def last_refresh(self) -> float:
+        """
+        Return when SWAPI was last revalidated by any worker.
+
+        Returns:
+            float: The Unix time recorded by ``mark_refreshed``, or ``0.0``
+            if none was recorded.
+        """
+        try:
+            with open(self.path) as file:
+                return float(file.read() or 0.0)
+        except (OSError, ValueError):
+            return 0.0
+
+    def mark_refreshed(self, at: float) -> None:
+        """
+        Record when SWAPI was revalidated; call it while holding the lock.
+
+        Args:
+            at (float): The Unix time the revalidation started.
+        """
+        with open(self.path, "w") as file:
+            file.write(repr(at))
+
+
+class CacheWarmer:
+    """
+    Pre-warm SWAPI data on startup and keep it warm on a schedule.
+
+    Warming loads the catalog, which crawls every people, starship, species
+    and planet listing page through the cache and rebuilds the materialized
+    pilot list, then stores every resource under its own URL so detail
+    lookups are cache hits too, unless SWAPI's own response for that URL is
+    cached already. Scheduled refreshes run every ``interval``
+    seconds, give or take ``jitter`` of it so workers do not refresh in
+    step, and revalidate the listings with SWAPI before their TTL runs out.
+    When ``lock`` is given only the worker holding it revalidates, and only
+    if no worker did in the last ``interval * (1 - jitter)`` seconds, the
+    shortest time between two refreshes of one worker; the others reload
+    the shared cache it keeps fresh.
+
+    Attributes:
+        ready (bool): Whether the first warm-up completed.
+        refreshes (int): Scheduled refreshes completed.
+    """
+
+    def __init__(
+        self,
+        catalog: SwapiCatalog,
+        new_resolver: Callable[[bool], SwapiResolver],
+        cache: Optional[SwapiCache] = None,
+        interval: float = 0.0,
+        jitter: float = 0.1,
+        lock: Optional[FileLock] = None,
+        retry_delay: float = 5.0,
+    ):
+        self.catalog = catalog
+        self.cache = cache
+        self.interval = interval
+        self.jitter = jitter
+        self.lock = lock
+        self.retry_delay = retry_delay
+        self.ready = False
+        self.refreshes = 0
+        self._new_resolver = new_resolver
+
+    async def warm(self, revalidate: bool = False) -> None:
+        """
+        Load the catalog and prime the cache with every resource it holds.
+
+        Args:
+            revalidate (bool): Revalidate cached listings with SWAPI even
+                when they are still fresh.
+        """
+        await self.catalog.refresh(self._new_resolver(revalidate))
+        if self.cache is not None:
+            await self.cache.prime_many(
+                {
+                    normalize_url(resource_url(resource, id)): dumps(
+                        record.to_swapi()
+                    )
+                    for resource, records in self.catalog.resources.items()
+                    for id, record in records.items()
+                },
+                replace=revalidate,
+            )
+        self.ready = True
+
+    async def refresh(self) -> None:
+        """
+        Run one scheduled refresh, revalidating with SWAPI if allowed to.
+        """
+        if self.lock is None:
+            await self.warm(revalidate=True)
+        else:
+            with self.lock.hold() as held:
+                started = time.time()
+                lease = self.interval * (1 - self.jitter)
+                revalidate = held and started - self.lock.last_refresh() >= lease
+                await self.warm(revalidate=revalidate)
+                if revalidate:
+                    self.lock.mark_refreshed(started)
+        self.refreshes += 1
+
+    def next_delay(self) -> float:
+        """
+        Return the jittered delay before the next scheduled refresh.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def run(self) -> None:
+        """
+        Warm up until it succeeds, then refresh on schedule until cancelled.
+        """
+        while not self.ready:
+            try:
+                await self.warm()
+            except Exception:
+                logger.exception("Failed to warm the SWAPI data, retrying")
+                await asyncio.sleep(self.retry_delay)
+        logger.info("SWAPI data warmed")
+
+        if self.interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(self.next_delay())
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Scheduled SWAPI refresh failed")
@@ -0,0 +1,512 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+
+from app.core.config import get_settings
+from benchmarks.swapi_simulator import SimulatorConfig, SwapiSimulator
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(__file__), "thresholds.json")
+
+# Production-like settings; the budget is lifted so the benchmark measures
+# the service rather than the rate limit protecting the real SWAPI.
+DEFAULT_ENV = {
+    "STARSHIP_CATALOG_PRELOAD": "true",
+    "STARSHIP_CACHE_BACKEND": "memory",
+    "STARSHIP_SWAPI_MODE": "online",
+    "STARSHIP_SWAPI_RATE_LIMIT": "0",
+    "STARSHIP_STORE_BACKEND": "memory",
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One request the benchmark sends repeatedly.
+
+    Attributes:
+        name (str): The name used in reports and thresholds.
+        method (str): The HTTP method.
+        path (str): The path and query string.
+        body (Optional[bytes]): The request body, if any.
+        headers (Dict[str, str]): Extra request headers.
+    """
+
+    name: str
+    method: str
+    path: str
+    body: Optional[bytes] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Profile:
+    """
+    How the app is started for a benchmark run.
+
+    Attributes:
+        name (str): The name used in reports and thresholds.
+        env (Dict[str, str]): ``STARSHIP_*`` settings for the app.
+        warm (bool): Whether scenarios are measured on one app that has
+            already served them, rather than each on a freshly started app
+            with nothing loaded or cached.
+    """
+
+    name: str
+    env: Dict[str, str]
+    warm: bool = True
+
+
+PROFILES = (
+    Profile("warm", DEFAULT_ENV),
+    Profile("cold", {**DEFAULT_ENV, "STARSHIP_CATALOG_PRELOAD": "false"}, warm=False),
+)
+
+
+def _json_body(value) -> bytes:
+    return json.dumps(value).encode()
+
+
+JSON = {"Content-Type": "application/json"}
+
+UPDATE = {
+    "name": "Millennium Falcon",
+    "model": "YT-1300 light freighter",
+    "cost_in_credits": 100000,
+    "max_atmosphering_speed": 1050,
+    "crew_capacity": 4,
+    "passenger_capacity": 6,
+    "pilots": ["Han Solo", "Chewbacca"],
+}
+
+GRAPHQL_QUERY = """
+{
+  pilots {
+    name
+    species { name }
+    homeworld { name }
+    starships { name model crew_capacity }
+  }
+  starship(name: "Starship 12") { name cost_in_credits }
+}
+"""
+
+SCENARIOS = (
+    Scenario("starships", "GET", "/starships"),
+    Scenario("starships_page", "GET", "/starships?page=2&limit=10"),
+    Scenario(
+        "starships_query",
+        "GET",
+        "/starships?min_crew_capacity=10&sort=-cost_in_credits&limit=20",
+    ),
+    Scenario("starship_stats", "GET", "/starships/stats?group_by=starship_class"),
+    Scenario("starship_details", "GET", "/starships/details/Starship%2012"),
+    Scenario(
+        "starship_batch",
+        "POST",
+        "/starships/details:batch",
+        _json_body({"names": [f"Starship {id}" for id in range(1, 21)]}),
+        JSON,
+    ),
+    Scenario("pilots", "GET", "/pilots"),
+    Scenario("pilots_page", "GET", "/pilots?page=2&limit=5&fields=name,starships"),
+    Scenario("pilots_ndjson", "GET", "/pilots?stream=ndjson"),
+    Scenario("pilot_details", "GET", "/pilots/details/Person%2012"),
+    Scenario(
+        "pilot_batch",
+        "POST",
+        "/pilots/details:batch",
+        _json_body({"names": [f"Person {id}" for id in range(1, 21)]}),
+        JSON,
+    ),
+    Scenario(
+        "graphql",
+        "POST",
+        "/graphql",
+        _json_body({"query": GRAPHQL_QUERY}),
+        JSON,
+    ),
+    Scenario("local_starships", "GET", "/starships/local"),
+    Scenario("local_starship", "GET", "/starships/local/Millennium%20Falcon"),
+    Scenario("update_starship", "PUT", "/starships/update", _json_body(UPDATE), JSON),
+    Scenario(
+        "bulk_upsert",
+        "PATCH",
+        "/starships/bulk",
+        _json_body([{**UPDATE, "name": f"Local {id}"} for id in range(50)]),
+        JSON,
+    ),
+)
+
+
+@dataclass
+class Result:
+    """
+    Measurements of one scenario at one concurrency level.
+
+    Attributes:
+        scenario (str): The scenario name.
+        concurrency (int): Requests kept in flight at once.
+        requests (int): Requests sent.
+        errors (int): Responses with a ``5xx`` status.
+        throughput (float): Requests completed per second.
+        p50_ms (float): Median latency in milliseconds.
+        p95_ms (float): 95th percentile latency in milliseconds.
+        p99_ms (float): 99th percentile latency in milliseconds.
+        upstream_calls (float): SWAPI calls per request.
+        profile (str): The name of the profile the app was started with.
+    """
+
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    upstream_calls: float
+    profile: str = "warm"
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Return the nearest-rank percentile of already sorted values.
+
+    Args:
+        sorted_values (Sequence[float]): The values, in ascending order.
+        q (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile, or ``0.0`` when there are no values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+@contextmanager
+def _environment(overrides: Dict[str, str]) -> Iterator[None]:
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    get_settings.cache_clear()
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        get_settings.cache_clear()
+
+
+@asynccontextmanager
+async def running_app(
+    simulator: SwapiSimulator, env: Dict[str, str]
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Start the application against the simulator and yield a client for it.
+
+    The app lifespan runs with ``env`` applied to the settings, and the
+    client only returns once the app reports ready.
+
+    Args:
+        simulator (SwapiSimulator): The simulated SWAPI.
+        env (Dict[str, str]): ``STARSHIP_*`` settings overrides.
+
+    Yields:
+        httpx.AsyncClient: A client calling the app in-process.
+    """
+    from app.main import app, lifespan
+
+    with _environment(env), simulator.mock():
+        async with lifespan(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://starship-api"
+            ) as client:
+                while (await client.get("/ready")).status_code != 200:
+                    await asyncio.sleep(0.01)
+                yield client
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    simulator: SwapiSimulator,
+    scenario: Scenario,
+    concurrency: int,
+    requests: int,
+    profile: str = "warm",
+) -> Result:
+    """
+    Send ``requests`` copies of a scenario with ``concurrency`` in flight.
+
+    Args:
+        client (httpx.AsyncClient): The client calling the app.
+        simulator (SwapiSimulator): The simulated SWAPI, to count calls.
+        scenario (Scenario): The request to send.
+        concurrency (int): Requests kept in flight at once.
+        requests (int): Requests to send in total.
+        profile (str): The name of the profile the app was started with.
+
+    Returns:
+        Result: The measurements.
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.request(
+                scenario.method,
+                scenario.path,
+                content=scenario.body,
+                headers=scenario.headers,
+            )
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 500:
+                errors += 1
+
+    calls_before = simulator.total_calls
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return Result(
+        scenario=scenario.name,
+        concurrency=concurrency,
+        requests=requests,
+        errors=errors,
+        throughput=round(requests / elapsed, 1),
+        p50_ms=round(percentile(latencies, 50) * 1000, 2),
+        p95_ms=round(percentile(latencies, 95) * 1000, 2),
+        p99_ms=round(percentile(latencies, 99) * 1000, 2),
+        upstream_calls=round((simulator.total_calls - calls_before) / requests, 2),
+        profile=profile,
+    )
+
+
+async def run_benchmark(
+    scenarios: Sequence[Scenario] = SCENARIOS,
+    concurrency_levels: Sequence[int] = (1, 8, 32),
+    requests: int = 200,
+    config: SimulatorConfig = SimulatorConfig(),
+    env: Optional[Dict[str, str]] = None,
+    profile: Profile = PROFILES[0],
+) -> List[Result]:
+    """
+    Benchmark every scenario at every concurrency level.
+
+    With a warm profile, each scenario is sent once before it is measured,
+    so results describe the steady state rather than the first request.
+    With a cold profile, each measurement starts a fresh app, so results
+    include loading and caching the SWAPI data the scenario needs.
+
+    Args:
+        scenarios (Sequence[Scenario]): The requests to benchmark.
+        concurrency_levels (Sequence[int]): The concurrency levels to run.
+        requests (int): Requests per scenario and level.
+        config (SimulatorConfig): The simulated SWAPI's configuration.
+        env (Optional[Dict[str, str]]): Settings overrides applied on top of
+            the profile's.
+        profile (Profile): How the app is started.
+
+    Returns:
+        List[Result]: The measurements, by scenario then concurrency.
+    """
+    simulator = SwapiSimulator(config)
+    settings = {**profile.env, **(env or {})}
+    results = []
+    if not profile.warm:
+        for scenario in scenarios:
+            for concurrency in concurrency_levels:
+                async with running_app(simulator, settings) as client:
+                    results.append(
+                        await measure(
+                            client,
+                            simulator,
+                            scenario,
+                            concurrency,
+                            requests,
+                            profile.name,
+                        )
+                    )
+        return results
+
+    async with running_app(simulator, settings) as client:
+        for scenario in scenarios:
+            await measure(client, simulator, scenario, 1, 1)
+            for concurrency in concurrency_levels:
+                results.append(
+                    await measure(
+                        client, simulator, scenario, concurrency, requests, profile.name
+                    )
+                )
+    return results
+
+
+def check_thresholds(
+    results: Sequence[Result], thresholds: Dict[str, dict]
+) -> List[str]:
+    """
+    Compare results with per-profile, per-scenario regression thresholds.
+
+    A threshold entry may set ``max_upstream_calls`` (SWAPI calls per
+    request), ``max_p95_ms`` and ``max_errors``.
+
+    Args:
+        results (Sequence[Result]): The benchmark results.
+        thresholds (Dict[str, dict]): The limits, by profile name then
+            scenario name.
+
+    Returns:
+        List[str]: A description of every violated threshold.
+    """
+    violations = []
+    for result in results:
+        limits = thresholds.get(result.profile, {}).get(result.scenario, {})
+        checks = (
+            ("max_upstream_calls", result.upstream_calls, "SWAPI calls per request"),
+            ("max_p95_ms", result.p95_ms, "p95 latency (ms)"),
+            ("max_errors", result.errors, "errors"),
+        )
+        for key, value, label in checks:
+            if key in limits and value > limits[key]:
+                violations.append(
+                    f"{result.scenario} ({result.profile}) at concurrency "
+                    f"{result.concurrency}: "
+                    f"{label} {value} exceeds {limits[key]}"
+                )
+    return violations
+
+
+def format_table(results: Sequence[Result]) -> str:
+    """
+    Format results as an aligned text table.
+
+    Args:
+        results (Sequence[Result]): The benchmark results.
+
+    Returns:
+        str: The table.
+    """
+    header = (
+        "profile",
+        "scenario",
+        "conc",
+        "req/s",
+        "p50 ms",
+        "p95 ms",
+        "p99 ms",
+        "swapi/req",
+    )
+    rows = [
+        (
+            r.profile,
+            r.scenario,
+            str(r.concurrency),
+            f"{r.throughput:.1f}",
+            f"{r.p50_ms:.2f}",
+            f"{r.p95_ms:.2f}",
+            f"{r.p99_ms:.2f}",
+            f"{r.upstream_calls:.2f}",
+        )
+        for r in results
+    ]
+    widths = [max(len(row[i]) for row in (header, *rows)) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths))
+        for row in (header, *rows)
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark every API route against a simulated SWAPI."
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--size", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--scenario", nargs="+", help="Only run the named scenarios."
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="+",
+        choices=[profile.name for profile in PROFILES],
+        help="Only run the named profiles.",
+    )
+    parser.add_argument(
+        "--env",
+        nargs="+",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Settings overrides, e.g. STARSHIP_CATALOG_PRELOAD=false.",
+    )
+    parser.add_argument("--json", help="Also write the results to this file.")
+    parser.add_argument(
+        "--check",
+        nargs="?",
+        const=DEFAULT_THRESHOLDS,
+        help="Fail when a regression threshold is exceeded.",
+    )
+    args = parser.parse_args(argv)
+
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if not args.scenario or scenario.name in args.scenario
+    ]
+    config = SimulatorConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        size=args.size,
+        seed=args.seed,
+    )
+    env = dict(item.split("=", 1) for item in args.env)
+    results = [
+        result
+        for profile in PROFILES
+        if not args.profile or profile.name in args.profile
+        for result in asyncio.run(
+            run_benchmark(
+                scenarios, args.concurrency, args.requests, config, env, profile
+            )
+        )
+    ]
+    print(format_table(results))
+
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump([asdict(result) for result in results], output, indent=2)
+
+    if args.check:
+        with open(args.check) as thresholds:
+            violations = check_thresholds(results, json.load(thresholds))
+        for violation in violations:
+            print(f"REGRESSION: {violation}", file=sys.stderr)
+        return 1 if violations else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import random
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List
+
+import httpx
+import respx
+
+from app.core.serialization import dumps
+from app.services.swapi_service import BASE_URL, SWAPI_PAGE_SIZE
+
+SWAPI_HOST = httpx.URL(BASE_URL).host
+
+
+@dataclass(frozen=True)
+class SimulatorConfig:
+    """
+    Shape and behaviour of the simulated SWAPI.
+
+    Attributes:
+        latency (float): Mean seconds SWAPI takes to answer.
+        jitter (float): Maximum deviation from ``latency``, in seconds.
+        error_rate (float): Fraction of calls answered with ``503``.
+        size (int): Dataset multiplier; ``1`` matches the real SWAPI
+            (82 people, 36 starships, 37 species and 60 planets).
+        seed (int): Seed making the dataset and the injected faults reproducible.
+    """
+
+    latency: float = 0.02
+    jitter: float = 0.01
+    error_rate: float = 0.0
+    size: int = 1
+    seed: int = 42
+
+
+def generate_dataset(config: SimulatorConfig) -> Dict[str, List[dict]]:
+    """
+    Generate a SWAPI-shaped dataset of people, starships, species and planets.
+
+    Starship costs and speeds include SWAPI's ``unknown`` and comma-grouped
+    values, and about a third of the people pilot one to three starships.
+
+    Args:
+        config (SimulatorConfig): The simulator configuration.
+
+    Returns:
+        Dict[str, List[dict]]: The resources by type, in id order.
+    """
+    rng = random.Random(config.seed)
+    counts = {
+        "people": 82 * config.size,
+        "starships": 36 * config.size,
+        "species": 37 * config.size,
+        "planets": 60 * config.size,
+    }
+
+    def url(resource: str, id: int) -> str:
+        return f"{BASE_URL}/{resource}/{id}/"
+
+    def number(low: int, high: int) -> str:
+        if rng.random() < 0.1:
+            return "unknown"
+        value = rng.randint(low, high)
+        return f"{value:,}" if rng.random() < 0.2 else str(value)
+
+    planets = [
+        {"name": f"Planet {id}", "url": url("planets", id), "edited": "1"}
+        for id in range(1, counts["planets"] + 1)
+    ]
+    species = [
+        {"name": f"Species {id}", "url": url("species", id), "edited": "1"}
+        for id in range(1, counts["species"] + 1)
+    ]
+    starships = [
+        {
+            "name": f"Starship {id}",
+            "model": f"Model {id % 12}",
+            "starship_class": f"Class {id % 5}",
+            "cost_in_credits": number(10_000, 1_000_000_000),
+            "max_atmosphering_speed": number(100, 5_000),
+            "crew": number(1, 50_000),
+            "passengers": number(0, 10_000),
+            "cargo_capacity": number(0, 1_000_000),
+            "url": url("starships", id),
+            "edited": "1",
+        }
+        for id in range(1, counts["starships"] + 1)
+    ]
+    people = []
+    for id in range(1, counts["people"] + 1):
+        flown = (
+            rng.sample(range(1, counts["starships"] + 1), rng.randint(1, 3))
+            if rng.random() < 0.33
+            else []
+        )
+        people.append(
+            {
+                "name": f"Person {id}",
+                "height": str(rng.randint(60, 230)),
+                "mass": str(rng.randint(20, 150)),
+                "gender": rng.choice(("male", "female", "n/a")),
+                "birth_year": f"{rng.randint(1, 900)}BBY",
+                "species": [url("species", rng.randint(1, counts["species"]))],
+                "homeworld": url("planets", rng.randint(1, counts["planets"])),
+                "starships": [url("starships", starship) for starship in flown],
+                "url": url("people", id),
+                "edited": "1",
+            }
+        )
+    return {
+        "people": people,
+        "starships": starships,
+        "species": species,
+        "planets": planets,
+    }
+
+
+class SwapiSimulator:
+    """
+    In-process stand-in for SWAPI with configurable latency and faults.
+
+    It answers resource details, paginated listings and ``?search=`` like
+    SWAPI does, sends ``ETag`` headers and honours ``If-None-Match``.
+    ``mock()`` intercepts every call the application makes to the SWAPI
+    host, so the whole client stack (pool, retries, budget, cache) runs
+    unchanged.
+
+    Attributes:
+        config (SimulatorConfig): The simulator configuration.
+        dataset (Dict[str, List[dict]]): The resources served.
+        calls (Counter): Calls received, by resource type.
+    """
+
+    def __init__(self, config: SimulatorConfig = SimulatorConfig()):
+        self.config = config
+        self.dataset = generate_dataset(config)
+        self.calls: Counter = Counter()
+        self._rng = random.Random(config.seed)
+        self._by_url = {
+            data["url"]: data for items in self.dataset.values() for data in items
+        }
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    @contextmanager
+    def mock(self) -> Iterator[respx.MockRouter]:
+        """
+        Route every request to the SWAPI host to the simulator.
+
+        Yields:
+            respx.MockRouter: The active router.
+        """
+        with respx.mock(assert_all_called=False) as router:
+            router.route(host=SWAPI_HOST).mock(side_effect=self.handle)
+            yield router
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """
+        Answer one SWAPI request after the simulated latency.
+
+        Args:
+            request (httpx.Request): The request sent to SWAPI.
+
+        Returns:
+            httpx.Response: The simulated answer.
+        """
+        path = request.url.path.split("/api/", 1)[-1].strip("/").split("/")
+        resource = path[0]
+        self.calls[resource] += 1
+
+        config = self.config
+        delay = config.latency + self._rng.uniform(-config.jitter, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._rng.random() < config.error_rate:
+            return httpx.Response(503, json={"detail": "Service unavailable"})
+
+        if resource not in self.dataset or len(path) > 2:
+            return _not_found()
+        if len(path) == 2:
+            data = self._by_url.get(f"{BASE_URL}/{resource}/{path[1]}/")
+            return _json(request, data) if data is not None else _not_found()
+        return self._listing(request, resource)
+
+    def _listing(self, request: httpx.Request, resource: str) -> httpx.Response:
+        search = request.url.params.get("search", "").casefold()
+        page = int(request.url.params.get("page", "1"))
+        items = [
+            data
+            for data in self.dataset[resource]
+            if search in data["name"].casefold()
+            or search in data.get("model", "").casefold()
+        ]
+        results = items[(page - 1) * SWAPI_PAGE_SIZE:page * SWAPI_PAGE_SIZE]
+        if page > 1 and not results:
+            return _not_found()
+
+        def page_url(number: int) -> str:
+            params = httpx.QueryParams({"search": search, "page": number})
+            if not search:
+                params = params.remove("search")
+            return f"{BASE_URL}/{resource}/?{params}"
+
+        return _json(
+            request,
+            {
+                "count": len(items),
+                "next": (
+                    page_url(page + 1) if page * SWAPI_PAGE_SIZE < len(items) else None
+                ),
+                "previous": page_url(page - 1) if page > 1 else None,
+                "results": results,
+            },
+        )
+
+
+def _json(request: httpx.Request, data: dict) -> httpx.Response:
+    body = dumps(data)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return httpx.Response(304, headers={"ETag": etag})
+    return httpx.Response(
+        200,
+        content=body,
+        headers={"Content-Type": "application/json", "ETag": etag},
+    )
+
+
+def _not_found() -> httpx.Response:
+    return httpx.Response(404, json={"detail": "Not found"})
@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+import respx
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from starlette.routing import Match
+
+# Keep the app lifespan from crawling SWAPI in the background during tests.
+os.environ.setdefault("STARSHIP_CATALOG_PRELOAD", "false")
+
+from app.core.config import get_settings  # noqa: E402
+from app.main import app  # noqa: E402
+from tests.fake_swapi import swapi_dataset, swapi_handler  # noqa: E402
+
+
+def _response_model(request):
+    scope = {"type": "http", "path": request.url.path, "method": request.method}
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.matches(scope)[0] == Match.FULL:
+            return route.response_model
+    return None
+
+
+@pytest.fixture(autouse=True)
+def check_response_models(monkeypatch):
+    """
+    Validate every successful JSON response of the app against the
+    ``response_model`` of its route.
+
+    Routes return pre-encoded responses, which FastAPI does not validate, so
+    this keeps the documented schemas from drifting from the real payloads.
+    """
+    send = TestClient.request
+
+    def request(self, method, url, *args, **kwargs):
+        response = send(self, method, url, *args, **kwargs)
+        content_type = response.headers.get("content-type", "")
+        if response.is_success and content_type.startswith("application/json"):
+            model = _response_model(response.request)
+            if model is not None:
+                model.model_validate(response.json())
+        return response
+
+    monkeypatch.setattr(TestClient, "request", request)
+
+
+@pytest.fixture
+def live_client(monkeypatch, tmp_path):
+    """
+    Run the app with its lifespan against a fake SWAPI.
+
+    The catalog is preloaded and the response cache enabled, and the
+    client is yielded once the warm-up completed. ``live_client.swapi``
+    is the fake SWAPI handler, recording every request that reached it.
+    """
+    monkeypatch.setenv("STARSHIP_CATALOG_PRELOAD", "true")
+    monkeypatch.setenv("STARSHIP_CACHE_BACKEND", "memory")
+    monkeypatch.setenv("STARSHIP_WARM_INTERVAL", "0")
+    monkeypatch.setenv("STARSHIP_STORE_BACKEND", "sqlite")
+    monkeypatch.setenv("STARSHIP_STORE_PATH", str(tmp_path / "starships.sqlite3"))
+    get_settings.cache_clear()
+    handler = swapi_handler(swapi_dataset())
+    try:
+        with respx.mock:
+            respx.route(host="swapi.py4e.com").mock(side_effect=handler)
+            with TestClient(app) as client:
+                deadline = time.monotonic() + 5
+                while client.get("/ready").status_code != 200:
+                    assert time.monotonic() < deadline, "the app never warmed up"
+                    time.sleep(0.01)
+                client.swapi = handler
+                yield client
+    finally:
+        get_settings.cache_clear()
@@ -0,0 +1,94 @@
+import httpx
+
+from app.services.swapi_service import BASE_URL, matches_search
+
+
+def swapi_dataset() -> dict:
+    """
+    Build a small SWAPI dataset with one pilot, one droid and twelve planets.
+    """
+    planets = [
+        {"name": f"Planet {id}", "url": f"{BASE_URL}/planets/{id}/", "edited": "1"}
+        for id in range(1, 13)
+    ]
+    planets[0]["name"] = "Tatooine"
+    return {
+        "people": [
+            {
+                "name": "Luke Skywalker",
+                "height": "172",
+                "gender": "male",
+                "mass": "77",
+                "birth_year": "19BBY",
+                "species": [f"{BASE_URL}/species/1/"],
+                "homeworld": f"{BASE_URL}/planets/1/",
+                "starships": [f"{BASE_URL}/starships/12/"],
+                "url": f"{BASE_URL}/people/1/",
+                "edited": "1",
+            },
+            {
+                "name": "C-3PO",
+                "species": [],
+                "homeworld": f"{BASE_URL}/planets/1/",
+                "starships": [],
+                "url": f"{BASE_URL}/people/2/",
+                "edited": "1",
+            },
+        ],
+        "starships": [
+            {
+                "name": "X-wing",
+                "model": "T-65 X-wing",
+                "cost_in_credits": "149999",
+                "max_atmosphering_speed": "1050",
+                "crew": "1",
+                "passengers": "0",
+                "cargo_capacity": "110",
+                "url": f"{BASE_URL}/starships/12/",
+                "edited": "1",
+            },
+        ],
+        "species": [{"name": "Human", "url": f"{BASE_URL}/species/1/", "edited": "1"}],
+        "planets": planets,
+    }
+
+
+def swapi_handler(dataset: dict):
+    """
+    Build a fake SWAPI request handler serving ``dataset`` in pages of 10.
+
+    The handler records every request it answers in its ``requests`` list.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        handler.requests.append(request)
+        resource = request.url.path.split("/")[2]
+        items = dataset[resource]
+        if request.url.path.rstrip("/").count("/") == 3:
+            for data in items:
+                if data["url"] == str(request.url):
+                    return httpx.Response(200, json=data)
+            return httpx.Response(404, json={"detail": "Not found"})
+        search = request.url.params.get("search", "")
+        if search:
+            items = [item for item in items if matches_search(resource, item, search)]
+        page = int(request.url.params.get("page", "1"))
+        has_next = page * 10 < len(items)
+        return httpx.Response(
+            200,
+            json={
+                "count": len(items),
+                "next": f"{BASE_URL}/{resource}/?page={page + 1}" if has_next else None,
+                "results": items[(page - 1) * 10:page * 10],
+            },
+        )
+
+    handler.requests = []
+    return handler
+
+
+def upstream_client(dataset: dict) -> httpx.AsyncClient:
+    """
+    Build a client backed by a fake SWAPI serving ``dataset`` in pages of 10.
+    """
+    return httpx.AsyncClient(transport=httpx.MockTransport(swapi_handler(dataset)))
@@ -0,0 +1,112 @@
+import json
+
+import httpx
+import pytest
+
+from app.core.config import get_settings
+from app.services.swapi_service import BASE_URL
+from benchmarks.harness import (DEFAULT_THRESHOLDS, PROFILES, SCENARIOS,
+                                Result, check_thresholds, percentile,
+                                run_benchmark)
+from benchmarks.swapi_simulator import SimulatorConfig, SwapiSimulator
+
+INSTANT = SimulatorConfig(latency=0.0, jitter=0.0)
+
+
+@pytest.mark.asyncio
+async def test_simulator_serves_swapi_shaped_listings():
+    """
+    Test pagination, search, details and ETag revalidation of the simulator.
+    """
+    simulator = SwapiSimulator(INSTANT)
+
+    with simulator.mock():
+        async with httpx.AsyncClient() as client:
+            page = (await client.get(f"{BASE_URL}/people/?page=9")).json()
+            found = await client.get(f"{BASE_URL}/starships/?search=starship 12")
+            details = await client.get(f"{BASE_URL}/planets/3/")
+            revalidated = await client.get(
+                f"{BASE_URL}/planets/3/",
+                headers={"If-None-Match": details.headers["etag"]},
+            )
+
+    assert page["count"] == 82
+    assert page["next"] is None
+    assert len(page["results"]) == 2
+    assert [s["name"] for s in found.json()["results"]] == ["Starship 12"]
+    assert details.json()["name"] == "Planet 3"
+    assert revalidated.status_code == 304
+    assert simulator.calls == {"people": 1, "starships": 1, "planets": 2}
+
+
+@pytest.mark.asyncio
+async def test_benchmark_reports_latency_and_upstream_calls():
+    """
+    Test a short benchmark run against a warm app.
+    """
+    scenarios = [s for s in SCENARIOS if s.name in ("pilots", "starship_details")]
+    environment = get_settings()
+
+    results = await run_benchmark(scenarios, (2,), requests=4, config=INSTANT)
+
+    assert [(r.scenario, r.concurrency, r.requests) for r in results] == [
+        ("starship_details", 2, 4),
+        ("pilots", 2, 4),
+    ]
+    assert all(r.errors == 0 and r.upstream_calls == 0 for r in results)
+    assert all(0 < r.p50_ms <= r.p95_ms <= r.p99_ms for r in results)
+    assert get_settings() == environment
+
+
+@pytest.mark.asyncio
+async def test_cold_profile_measures_a_fresh_app():
+    """
+    Test that a cold run pays for loading the SWAPI data it needs.
+    """
+    [cold] = [profile for profile in PROFILES if not profile.warm]
+    scenarios = [s for s in SCENARIOS if s.name == "pilots"]
+
+    results = await run_benchmark(
+        scenarios, (1, 2), requests=4, config=INSTANT, profile=cold
+    )
+
+    assert [(r.profile, r.concurrency) for r in results] == [("cold", 1), ("cold", 2)]
+    assert all(r.errors == 0 and r.upstream_calls > 0 for r in results)
+
+
+def test_thresholds_flag_regressions():
+    """
+    Test that extra upstream calls and latency are reported as regressions.
+    """
+    result = Result("pilots", 8, 10, 0, 100.0, 5.0, 40.0, 60.0, 1.5)
+
+    assert check_thresholds([result], {"warm": {"pilots": {"max_p95_ms": 50}}}) == []
+    assert check_thresholds(
+        [result], {"cold": {"pilots": {"max_upstream_calls": 0}}}
+    ) == []
+    assert check_thresholds(
+        [result], {"warm": {"pilots": {"max_upstream_calls": 1, "max_p95_ms": 30}}}
+    ) == [
+        "pilots (warm) at concurrency 8: SWAPI calls per request 1.5 exceeds 1",
+        "pilots (warm) at concurrency 8: p95 latency (ms) 40.0 exceeds 30",
+    ]
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 99) == 4.0
+
+
+def test_every_scenario_has_thresholds():
+    """
+    Test that no scenario is benchmarked without regression thresholds, and
+    that every one of them may call SWAPI a little.
+    """
+    with open(DEFAULT_THRESHOLDS) as thresholds:
+        limits = json.load(thresholds)
+
+    assert sorted(limits) == sorted(profile.name for profile in PROFILES)
+    for profile in PROFILES:
+        budgets = {
+            name: scenario["max_upstream_calls"]
+            for name, scenario in limits[profile.name].items()
+        }
+        assert sorted(budgets) == sorted(scenario.name for scenario in SCENARIOS)
+        assert all(budget > 0 for budget in budgets.values())
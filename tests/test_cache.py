@@ -0,0 +1,274 @@
+import asyncio
+import fnmatch
+
+import httpx
+import pytest
+import respx
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.main import app
+from app.services.cache import (CacheEntry, MemoryCacheBackend,
+                                RedisCacheBackend, SwapiCache, resource_type)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """
+    Local stand-in for the subset of ``redis.asyncio.Redis`` the backend uses.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.expiries = {}
+
+    async def get(self, name):
+        return self.data.get(name)
+
+    async def set(self, name, value, px=None):
+        self.data[name] = value
+        self.expiries[name] = px
+
+    async def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+    async def scan_iter(self, match):
+        for name in list(self.data):
+            if fnmatch.fnmatch(name, match):
+                yield name
+
+    async def aclose(self):
+        self.data.clear()
+
+
+def make_cache(backend=None, clock=None):
+    return SwapiCache(
+        backend or MemoryCacheBackend(max_bytes=1024),
+        ttls={"species": 100.0},
+        default_ttl=10.0,
+        stale_ttl=5.0,
+        clock=clock or FakeClock(),
+    )
+
+
+def counting_loader(body: bytes = b'{"name": "Human"}'):
+    calls = []
+
+    async def loader(headers) -> Response:
+        calls.append(headers)
+        await asyncio.sleep(0)
+        return Response(200, content=body)
+
+    return loader, calls
+
+
+def test_resource_type():
+    """
+    Test that the resource type is read from the SWAPI URL path.
+    """
+    assert resource_type("https://swapi.py4e.com/api/species/1/") == "species"
+    assert resource_type("https://swapi.py4e.com/api/people/?search=luke") == "people"
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used():
+    """
+    Test that the in-process backend stays within its byte bound.
+    """
+    backend = MemoryCacheBackend(max_bytes=10)
+    entry = CacheEntry(b"12345", 0.0, 1.0, 2.0)
+    await backend.set("a", entry)
+    await backend.set("b", entry)
+    await backend.get("a")
+    await backend.set("c", entry)
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") is not None
+    assert backend.size == 10
+    assert backend.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_fresh_entries_until_ttl():
+    """
+    Test per-resource TTLs and the hit and miss counters.
+    """
+    clock = FakeClock()
+    cache = make_cache(clock=clock)
+    loader, calls = counting_loader()
+    key = "https://swapi.py4e.com/api/species/1/"
+
+    assert await cache.get_or_load(key, loader) == b'{"name": "Human"}'
+    clock.now += 99
+    await cache.get_or_load(key, loader)
+
+    assert len(calls) == 1
+    assert cache.stats() == {
+        "hits": 1,
+        "stale_hits": 0,
+        "misses": 1,
+        "revalidations": 0,
+        "stale_errors": 0,
+    }
+    assert cache.ttl_for("https://swapi.py4e.com/api/planets/1/") == 10.0
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_stale_while_revalidating():
+    """
+    Test that stale entries are served while one background refresh runs.
+    """
+    clock = FakeClock()
+    cache = make_cache(clock=clock)
+    key = "https://swapi.py4e.com/api/planets/1/"
+    first, _ = counting_loader(b"old")
+    await cache.get_or_load(key, first)
+
+    clock.now += 12
+    second, calls = counting_loader(b"new")
+    assert await cache.get_or_load(key, second) == b"old"
+    assert await cache.get_or_load(key, second) == b"old"
+    await asyncio.sleep(0.01)
+
+    assert len(calls) == 1
+    assert await cache.get_or_load(key, second) == b"new"
+    assert cache.stale_hits == 2
+
+    clock.now += 100
+    assert await cache.get_or_load(key, second) == b"new"
+    assert cache.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_revalidates_with_swapi_validators():
+    """
+    Test that expired entries are revalidated and kept on 304 Not Modified.
+    """
+    clock = FakeClock()
+    cache = make_cache(clock=clock)
+    key = "https://swapi.py4e.com/api/planets/1/"
+    sent = []
+
+    async def loader(headers) -> Response:
+        sent.append(headers)
+        if headers:
+            return Response(304, headers={"ETag": '"v2"'})
+        return Response(200, content=b"body", headers={"ETag": '"v1"'})
+
+    await cache.get_or_load(key, loader)
+    clock.now += 100
+    assert await cache.get_or_load(key, loader) == b"body"
+    clock.now += 100
+    assert await cache.get_or_load(key, loader) == b"body"
+
+    assert sent == [{}, {"If-None-Match": '"v1"'}, {"If-None-Match": '"v2"'}]
+    assert cache.revalidations == 2
+
+
+@pytest.mark.asyncio
+async def test_priming_keeps_swapi_responses():
+    """
+    Test that primed bodies never overwrite a response SWAPI can revalidate.
+    """
+    clock = FakeClock()
+    cache = make_cache(clock=clock)
+    fetched = "https://swapi.py4e.com/api/planets/1/"
+    primed = "https://swapi.py4e.com/api/planets/2/"
+
+    async def loader(headers) -> Response:
+        return Response(200, content=b"full", headers={"ETag": '"v1"'})
+
+    await cache.get_or_load(fetched, loader)
+    stored = await cache.prime_many(
+        {fetched: b"trimmed", primed: b"trimmed"}, replace=True
+    )
+    assert stored == 1
+    clock.now += 100
+    assert await cache.prime_many({fetched: b"new", primed: b"new"}) == 1
+
+    entry = await cache.backend.get(fetched)
+    assert (entry.value, entry.etag) == (b"full", '"v1"')
+    assert (await cache.backend.get(primed)).value == b"new"
+    assert not await cache.prime(primed, b"newer")
+    assert await cache.prime(primed, b"newer", replace=True)
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_old_entries_while_swapi_is_down():
+    """
+    Test that an entry past its stale window is served when SWAPI is unreachable.
+    """
+    clock = FakeClock()
+    cache = make_cache(clock=clock)
+    key = "https://swapi.py4e.com/api/planets/1/"
+    loader, _ = counting_loader(b"old")
+    await cache.get_or_load(key, loader)
+
+    async def unreachable(headers) -> Response:
+        raise httpx.ConnectError("down")
+
+    clock.now += 1000
+    assert await cache.get_or_load(key, unreachable) == b"old"
+    assert cache.stale_errors == 1
+
+    with pytest.raises(httpx.ConnectError):
+        await cache.get_or_load("https://swapi.py4e.com/api/planets/2/", unreachable)
+
+
+@pytest.mark.asyncio
+async def test_cache_collapses_concurrent_misses():
+    """
+    Test that concurrent misses for one key trigger a single load.
+    """
+    cache = make_cache()
+    loader, calls = counting_loader()
+    key = "https://swapi.py4e.com/api/species/1/"
+
+    await asyncio.gather(*(cache.get_or_load(key, loader) for _ in range(5)))
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_round_trip():
+    """
+    Test the Redis backend against a local stand-in.
+    """
+    redis = FakeRedis()
+    cache = make_cache(backend=RedisCacheBackend(redis, prefix="test:"))
+    loader, calls = counting_loader()
+    key = "https://swapi.py4e.com/api/species/1/"
+
+    await cache.get_or_load(key, loader)
+    assert await cache.get_or_load(key, loader) == b'{"name": "Human"}'
+    assert len(calls) == 1
+    assert list(redis.data) == [f"test:{key}"]
+    assert redis.expiries[f"test:{key}"] > 0
+
+    await cache.clear()
+    assert redis.data == {}
+
+
+@respx.mock
+def test_starships_are_served_from_cache():
+    """
+    Test that repeated reads of a resource only reach SWAPI once.
+    """
+    route = respx.get("https://swapi.py4e.com/api/starships/").mock(
+        return_value=Response(200, json={"results": [], "next": None})
+    )
+
+    with TestClient(app) as client:
+        assert client.get("/starships").status_code == 200
+        assert client.get("/starships").status_code == 200
+        assert app.state.swapi_cache.stats()["hits"] == 1
+
+    assert route.call_count == 1
@@ -0,0 +1,137 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_pilots_view
+from app.main import app
+from app.services.catalog import SwapiCatalog
+from app.services.name_index import NameIndex
+from app.services.pilots_view import PilotsView
+from app.services.resolver import SwapiResolver
+from app.services.swapi_service import (fetch_all_pilots_with_starships,
+                                        fetch_pilot_by_name,
+                                        fetch_starship_by_name)
+from tests.fake_swapi import swapi_dataset, upstream_client
+
+
+def test_name_index_lookups():
+    """
+    Test exact, prefix and fuzzy lookups and incremental removal.
+    """
+    index = NameIndex()
+    index.add(10, "Millennium Falcon")
+    index.add(12, "X-wing")
+    index.add(22, "Imperial shuttle")
+    index.add(28, "A-wing")
+
+    assert index.lookup("x-WING") == [12]
+    assert index.search("x-wing") == [12, 28]
+    assert index.search("imp") == [22]
+    assert index.search("wing")[:2] == [28, 12]
+    assert index.search("Milenium Falcon")[0] == 10
+
+    index.remove(12)
+    index.add(28, "B-wing")
+    assert index.lookup("X-wing") == []
+    assert index.lookup("b-wing") == [28]
+    assert len(index) == 3
+
+
+@pytest.mark.asyncio
+async def test_catalog_refresh_reports_changes():
+    """
+    Test that a refresh only reports and re-indexes changed resources.
+    """
+    dataset = swapi_dataset()
+    catalog = SwapiCatalog()
+    changes = []
+    catalog.subscribe(lambda _, change: changes.append(change))
+
+    async with upstream_client(dataset) as client:
+        await catalog.refresh(SwapiResolver(client))
+    assert catalog.ready
+    assert catalog.version == 1
+
+    dataset["starships"][0]["name"] = "T-65 X-wing"
+    async with upstream_client(dataset) as client:
+        change = await catalog.refresh(SwapiResolver(client))
+        await catalog.refresh(SwapiResolver(client))
+
+    assert change.upserted["starships"] == {12}
+    assert not change.upserted["people"]
+    assert catalog.version == 2
+    assert len(changes) == 2
+    assert catalog.find("starships", "t-65 x-wing")[0].crew == "1"
+    assert catalog.find("starships", "X-wing") == []
+
+
+@pytest.mark.asyncio
+async def test_lookups_use_the_catalog_index():
+    """
+    Test that name lookups are served by the catalog without searching SWAPI.
+    """
+    catalog = SwapiCatalog()
+    async with upstream_client(swapi_dataset()) as client:
+        await catalog.refresh(SwapiResolver(client))
+        resolver = SwapiResolver(client)
+
+        starship = await fetch_starship_by_name("x-wing", resolver, catalog)
+        partial = await fetch_starship_by_name("wing", resolver, catalog)
+        missing = await fetch_starship_by_name("Death Star", resolver, catalog)
+        pilot = await fetch_pilot_by_name("LUKE SKYWALKER", resolver, catalog)
+        searches = ["T-65", "x-wingz", "Y-wing", "wing"]
+        local = [await fetch_starship_by_name(s, resolver, catalog) for s in searches]
+        remote = [await fetch_starship_by_name(s, resolver) for s in searches]
+
+    assert starship["model"] == "T-65 X-wing"
+    assert partial["name"] == "X-wing"
+    assert missing == {"error": "Starship not found"}
+    assert local == remote
+    assert [result.get("name") for result in local] == ["X-wing", None, None, "X-wing"]
+    assert pilot["name"] == "Luke Skywalker"
+    assert pilot["starships"] == [{"name": "X-wing", "model": "T-65 X-wing"}]
+
+
+@pytest.mark.asyncio
+async def test_pilots_view_matches_crawled_pilots():
+    """
+    Test that the materialized join equals the on-demand enrichment.
+    """
+    dataset = swapi_dataset()
+    catalog = SwapiCatalog()
+    view = PilotsView(catalog)
+    async with upstream_client(dataset) as client:
+        await catalog.refresh(SwapiResolver(client))
+        crawled = await fetch_all_pilots_with_starships(SwapiResolver(client))
+
+    assert view.ready
+    assert view.pilots == crawled
+    assert json.loads(view.body) == {"pilots": crawled}
+
+    dataset["planets"][0]["name"] = "Tatooine II"
+    async with upstream_client(dataset) as client:
+        await catalog.refresh(SwapiResolver(client))
+    assert view.pilots[0]["homeworld"] == "Tatooine II"
+    assert view.version == catalog.version
+
+
+@pytest.mark.asyncio
+async def test_list_pilots_serves_the_materialized_view():
+    """
+    Test that /pilots returns the pre-serialized payload without calling SWAPI.
+    """
+    catalog = SwapiCatalog()
+    view = PilotsView(catalog)
+    async with upstream_client(swapi_dataset()) as client:
+        await catalog.refresh(SwapiResolver(client))
+
+    app.dependency_overrides[get_pilots_view] = lambda: view
+    try:
+        response = TestClient(app).get("/pilots")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.content == view.body
+    assert response.json()["pilots"][0]["species_name"] == "Human"
@@ -0,0 +1,98 @@
+import pytest
+import respx
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.api.dependencies import get_pilots_view
+from app.main import app
+from app.services.catalog import SwapiCatalog
+from app.services.pilots_view import PilotsView
+from app.services.resolver import SwapiResolver
+from tests.fake_swapi import swapi_dataset, upstream_client
+
+client = TestClient(app)
+
+
+@respx.mock
+def test_starships_answer_304_for_a_matching_etag():
+    """
+    Test that listings carry validators and honour If-None-Match.
+    """
+    respx.get("https://swapi.py4e.com/api/starships/").mock(
+        return_value=Response(200, json={"results": [], "next": None})
+    )
+
+    response = client.get("/starships")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+
+    response = client.get("/starships", headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get("/starships", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_materialized_pilots_are_revalidated_without_encoding():
+    """
+    Test version-based validators on the materialized /pilots payload.
+    """
+    catalog = SwapiCatalog()
+    view = PilotsView(catalog)
+    async with upstream_client(swapi_dataset()) as upstream:
+        await catalog.refresh(SwapiResolver(upstream))
+
+    app.dependency_overrides[get_pilots_view] = lambda: view
+    try:
+        full = client.get("/pilots")
+        names = client.get("/pilots?fields=name")
+        assert full.headers["ETag"] != names.headers["ETag"]
+
+        view.body = b"never sent"
+        cached = client.get(
+            "/pilots", headers={"If-None-Match": full.headers["ETag"]}
+        )
+        since = client.get(
+            "/pilots", headers={"If-Modified-Since": full.headers["Last-Modified"]}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert cached.status_code == since.status_code == 304
+
+
+def test_warmed_responses_are_revalidated(live_client):
+    """
+    Test that the lifespan-materialized pilots and catalog details answer 304
+    for a matching ETag without calling SWAPI.
+    """
+    calls = len(live_client.swapi.requests)
+
+    for path in ("/pilots", "/starships/details/X-wing"):
+        response = live_client.get(path)
+        assert response.status_code == 200
+        cached = live_client.get(
+            path, headers={"If-None-Match": response.headers["ETag"]}
+        )
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == response.headers["ETag"]
+
+    assert live_client.get("/pilots").json()["pilots"][0]["homeworld"] == "Tatooine"
+    assert len(live_client.swapi.requests) == calls
+
+
+def test_local_starships_are_revalidated_by_version():
+    """
+    Test that stored starships reuse their version ETag and must revalidate.
+    """
+    response = client.get("/starships/local/Millennium Falcon")
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    response = client.get(
+        "/starships/local/Millennium Falcon",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert response.status_code == 304
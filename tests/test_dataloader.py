@@ -0,0 +1,86 @@
+import asyncio
+import gc
+
+import pytest
+
+from app.services.dataloader import DataLoader
+
+
+@pytest.mark.asyncio
+async def test_loads_are_batched_and_deduplicated():
+    """
+    Test that concurrent loads share one batch and repeated keys load once.
+    """
+    batches = []
+
+    async def batch(keys):
+        batches.append(keys)
+        return [key * 10 for key in keys]
+
+    loader = DataLoader(batch)
+    loader.prime(4, 400)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), loader.load_many([2, 3, 1, 4])
+    )
+    assert results == [10, 20, [20, 30, 10, 400]]
+    assert await loader.load(3) == 30
+    assert batches == [[1, 2, 3]]
+    assert loader.batches == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_failures_reach_every_waiter():
+    """
+    Test that a failing batch fails every load waiting on it.
+    """
+
+    async def batch(keys):
+        raise LookupError("unavailable")
+
+    loader = DataLoader(batch)
+    results = await asyncio.gather(
+        loader.load("a"), loader.load("b"), return_exceptions=True
+    )
+    assert [str(result) for result in results] == ["unavailable"] * 2
+
+
+@pytest.mark.asyncio
+async def test_short_batches_fail_instead_of_hanging():
+    """
+    Test that a batch returning too few values fails every load in it.
+    """
+
+    async def batch(keys):
+        return keys[:1]
+
+    loader = DataLoader(batch)
+    with pytest.raises(ValueError, match="1 values for 2 keys"):
+        await asyncio.wait_for(loader.load_many(["a", "b"]), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_failures_of_abandoned_loads_are_not_logged():
+    """
+    Test that a failed load nobody awaits any more is not reported as an
+    unretrieved exception.
+    """
+    errors = []
+    asyncio.get_running_loop().set_exception_handler(
+        lambda loop, context: errors.append(context)
+    )
+    released = asyncio.Event()
+
+    async def batch(keys):
+        await released.wait()
+        raise LookupError("unavailable")
+
+    loader = DataLoader(batch)
+    load = asyncio.ensure_future(loader.load("a"))
+    await asyncio.sleep(0)
+    load.cancel()
+    released.set()
+    await asyncio.sleep(0.01)
+    del loader, load
+    gc.collect()
+
+    assert errors == []
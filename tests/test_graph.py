@@ -0,0 +1,163 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_catalog
+from app.main import app
+from app.services.catalog import SwapiCatalog
+from app.services.graph import GraphExecutor, QueryError, parse_query
+from app.services.overlay import StarshipOverlay
+from app.services.records import resource_id
+from app.services.resolver import SwapiResolver
+from app.services.starship_store import MemoryStarshipStore
+from benchmarks.swapi_simulator import SimulatorConfig, SwapiSimulator
+from tests.fake_swapi import swapi_dataset, upstream_client
+
+client = TestClient(app)
+
+PILOTS_QUERY = """
+query PilotFleet {
+  pilots {
+    name
+    species { name }
+    world: homeworld { name }
+    starships { name cost_in_credits crew_capacity }
+  }
+}
+"""
+
+
+def test_parse_query_validates_against_the_schema():
+    """
+    Test parsing aliases and arguments, and rejecting unknown selections.
+    """
+    [root] = parse_query('{ luke: pilot(name: "Luke Skywalker") { name } }')
+    assert (root.name, root.alias) == ("pilot", "luke")
+    assert root.arguments == {"name": "Luke Skywalker"}
+    assert [selection.name for selection in root.selections] == ["name"]
+
+    for query, error in [
+        ("{ pilots { name ", "Unexpected end of query."),
+        ("{ pilots { mass } }", "Unknown field Pilot.mass."),
+        ("{ pilots }", "Field Query.pilots needs sub-fields."),
+        ("{ pilots { name { x } } }", "Field Pilot.name has no sub-fields."),
+        ("{ pilot { name } }", "Argument 'name' on Query.pilot must be a string."),
+        ('{ pilots(name: "x") { name } }', "Unknown argument 'name' on Query.pilots."),
+        ("{a" * 3000 + "}" * 3000, "Selections are nested more than 4 deep."),
+    ]:
+        with pytest.raises(QueryError) as exc_info:
+            parse_query(query)
+        assert str(exc_info.value) == error
+
+
+@pytest.mark.asyncio
+async def test_nested_query_loads_each_resource_once_per_level():
+    """
+    Test that related resources are batched and fetched once per distinct URL.
+    """
+    simulator = SwapiSimulator(SimulatorConfig(latency=0, jitter=0))
+    pilots = [
+        person for person in simulator.dataset["people"] if person["starships"]
+    ]
+
+    with simulator.mock():
+        async with httpx.AsyncClient() as http:
+            executor = GraphExecutor(
+                SwapiResolver(http), None, StarshipOverlay(MemoryStarshipStore())
+            )
+            data = await executor.execute(parse_query(PILOTS_QUERY))
+
+    assert [pilot["name"] for pilot in data["pilots"]] == [
+        pilot["name"] for pilot in pilots
+    ]
+    first = pilots[0]
+    assert len(data["pilots"][0]["starships"]) == len(first["starships"])
+    assert data["pilots"][0]["world"]["name"] == (
+        f"Planet {resource_id(first['homeworld'])}"
+    )
+    assert simulator.calls["starships"] == len(
+        {url for pilot in pilots for url in pilot["starships"]}
+    )
+    assert simulator.calls["planets"] == len({pilot["homeworld"] for pilot in pilots})
+    assert simulator.calls["species"] == len(
+        {pilot["species"][0] for pilot in pilots}
+    )
+    assert [loader.batches for loader in executor.loaders.values()] == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_graphql_endpoint_reads_the_catalog():
+    """
+    Test answering a query from the loaded catalog, without calling SWAPI.
+    """
+    catalog = SwapiCatalog()
+    async with upstream_client(swapi_dataset()) as http:
+        await catalog.refresh(SwapiResolver(http))
+
+    app.dependency_overrides[get_catalog] = lambda: catalog
+    try:
+        response = client.post(
+            "/graphql",
+            json={
+                "query": '{ pilot(name: "luke skywalker") { name species { name } }'
+                ' missing: starship(name: "Death Star") { name } }'
+            },
+        )
+        invalid = client.post("/graphql", json={"query": "{ pilots { mass } }"})
+        deep = client.post("/graphql", json={"query": "{a" * 3000 + "}" * 3000})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "data": {
+            "pilot": {"name": "Luke Skywalker", "species": {"name": "Human"}},
+            "missing": None,
+        }
+    }
+    assert invalid.status_code == 400
+    assert invalid.json()["detail"] == "Unknown field Pilot.mass."
+    assert deep.status_code == 400
+
+
+def test_graphql_endpoint_on_a_live_app(live_client):
+    """
+    Test a nested query over the warmed catalog, with local changes merged
+    into starships, without calling SWAPI.
+    """
+    calls = len(live_client.swapi.requests)
+    response = live_client.patch(
+        "/starships/bulk",
+        json=[
+            {
+                "name": "X-wing",
+                "model": "T-70 X-wing",
+                "cost_in_credits": 50000,
+                "max_atmosphering_speed": 1100,
+                "crew_capacity": 2,
+                "passenger_capacity": 0,
+                "pilots": ["Poe Dameron"],
+            }
+        ],
+    )
+    assert response.json()["created"] == 1
+
+    response = live_client.post(
+        "/graphql",
+        json={
+            "query": "{ pilots { name homeworld { name } starships { model } } }"
+        },
+    )
+
+    assert response.json() == {
+        "data": {
+            "pilots": [
+                {
+                    "name": "Luke Skywalker",
+                    "homeworld": {"name": "Tatooine"},
+                    "starships": [{"model": "T-70 X-wing"}],
+                }
+            ]
+        }
+    }
+    assert len(live_client.swapi.requests) == calls
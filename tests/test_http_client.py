@@ -0,0 +1,54 @@
+import httpx
+import respx
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.core.config import Settings
+from app.core.http import create_http_client
+from app.main import app
+
+
+def test_settings_from_env(monkeypatch):
+    """
+    Test that pool and timeout settings can be overridden from the environment.
+    """
+    monkeypatch.setenv("STARSHIP_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("STARSHIP_HTTP_READ_TIMEOUT", "2.5")
+    monkeypatch.setenv("STARSHIP_HTTP2", "false")
+
+    settings = Settings.from_env()
+
+    assert settings.http_max_connections == 7
+    assert settings.http_read_timeout == 2.5
+    assert settings.http2 is False
+
+
+def test_create_http_client_applies_timeouts():
+    """
+    Test that the shared client is built with the configured timeouts.
+    """
+    client = create_http_client(Settings(http_read_timeout=3.0, http2=False))
+
+    assert client.timeout.read == 3.0
+    assert client.timeout.connect == Settings().http_connect_timeout
+
+
+@respx.mock
+def test_lifespan_shares_one_client_across_requests():
+    """
+    Test that the lifespan opens a single client reused by every request.
+    """
+    respx.get("https://swapi.py4e.com/api/starships/").mock(
+        return_value=Response(200, json={"results": [], "next": None})
+    )
+
+    with TestClient(app) as client:
+        shared = app.state.http_client
+        assert isinstance(shared, httpx.AsyncClient)
+
+        assert client.get("/starships").status_code == 200
+        assert client.get("/starships").status_code == 200
+        assert app.state.http_client is shared
+
+    assert shared.is_closed
+    assert not hasattr(app.state, "http_client")
@@ -0,0 +1,127 @@
+import respx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.api.instrumentation import MetricsMiddleware
+from app.core.metrics import (HTTP_REQUEST_DURATION, SWAPI_REQUEST_DURATION,
+                              Counter, Histogram, Registry, RequestTimings,
+                              record_swapi_call)
+from app.core.serialization import dumps
+from app.main import app
+
+
+def test_registry_renders_prometheus_text():
+    """
+    Test the exposition format of counters and cumulative histograms.
+    """
+    registry = Registry()
+    calls = registry.register(Counter("calls_total", "Calls.", ("kind",)))
+    latency = registry.register(
+        Histogram("latency_seconds", "Latency.", buckets=(1, 5))
+    )
+    calls.inc(kind='say "hi"')
+    latency.observe(0.5)
+    latency.observe(3)
+
+    assert registry.render().splitlines() == [
+        "# HELP calls_total Calls.",
+        "# TYPE calls_total counter",
+        'calls_total{kind="say \\"hi\\""} 1',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="5"} 2',
+        'latency_seconds_bucket{le="+Inf"} 2',
+        "latency_seconds_sum 3.5",
+        "latency_seconds_count 2",
+    ]
+
+
+def test_server_timing_header_value():
+    """
+    Test that request timings render as a Server-Timing header.
+    """
+    timings = RequestTimings()
+    timings.add("swapi", 0.012)
+    timings.add("swapi", 0.008)
+    timings.add("cache_hit")
+    timings.add("cache_miss")
+    timings.add("encode", 0.0005)
+
+    assert timings.server_timing(0.0251) == (
+        'swapi;dur=20.0;desc="2 calls", cache;desc="hit=1 miss=1", '
+        "encode;dur=0.5, total;dur=25.1"
+    )
+
+
+def test_middleware_labels_routes_and_sends_server_timing():
+    """
+    Test that requests are recorded by route template with a per-request breakdown.
+    """
+    demo = FastAPI()
+    demo.add_middleware(MetricsMiddleware, server_timing=True)
+
+    @demo.get("/demo/{name}")
+    async def handler(name: str):
+        record_swapi_call("people", "200", 0.004)
+        dumps({"name": name})
+        return {"name": name}
+
+    before = HTTP_REQUEST_DURATION.count(
+        method="GET", route="/demo/{name}", status="200"
+    )
+    response = TestClient(demo).get("/demo/luke")
+
+    header = response.headers["server-timing"]
+    assert header.startswith('swapi;dur=4.0;desc="1 calls", encode;dur=')
+    assert "total;dur=" in header
+    assert (
+        HTTP_REQUEST_DURATION.count(method="GET", route="/demo/{name}", status="200")
+        == before + 1
+    )
+
+
+def test_middleware_records_unhandled_errors():
+    """
+    Test that a request failing with an unhandled error is recorded as a 500.
+    """
+    demo = FastAPI()
+    demo.add_middleware(MetricsMiddleware)
+
+    @demo.get("/broken")
+    async def handler():
+        raise RuntimeError("boom")
+
+    before = HTTP_REQUEST_DURATION.count(method="GET", route="/broken", status="500")
+    response = TestClient(demo, raise_server_exceptions=False).get("/broken")
+
+    assert response.status_code == 500
+    assert (
+        HTTP_REQUEST_DURATION.count(method="GET", route="/broken", status="500")
+        == before + 1
+    )
+
+
+@respx.mock
+def test_metrics_endpoint_exports_swapi_calls():
+    """
+    Test that SWAPI calls made by a route show up on /metrics.
+    """
+    respx.get("https://swapi.py4e.com/api/starships/").mock(
+        return_value=Response(200, json={"results": [], "next": None})
+    )
+    before = SWAPI_REQUEST_DURATION.count(resource="starships", status="200")
+    client = TestClient(app)
+
+    client.get("/starships")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert SWAPI_REQUEST_DURATION.count(resource="starships", status="200") == (
+        before + 1
+    )
+    assert 'http_request_duration_seconds_count{method="GET",route="/starships"' in (
+        response.text
+    )
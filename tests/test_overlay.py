@@ -0,0 +1,121 @@
+import pytest
+import respx
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.main import app
+from app.services.overlay import StarshipOverlay
+from app.services.starship_store import MemoryStarshipStore
+
+client = TestClient(app)
+
+FALCON = {
+    "name": "Millennium Falcon",
+    "model": "YT-1300 light freighter",
+    "cost_in_credits": "100000",
+    "max_atmosphering_speed": "1050",
+    "crew_capacity": "4",
+    "passenger_capacity": "6",
+    "cargo_capacity": "100000",
+}
+
+
+@pytest.mark.asyncio
+async def test_overlay_caches_merges_until_the_store_changes():
+    """
+    Test that merged records are reused until the store is written to.
+    """
+    store = MemoryStarshipStore()
+    overlay = StarshipOverlay(store)
+    x_wing = {"name": "X-wing", "model": "T-65 X-wing"}
+
+    first = await overlay.apply([FALCON, x_wing])
+    again = await overlay.apply([dict(FALCON)])
+    assert first[1] is x_wing
+    assert again[0] is first[0]
+
+    await store.upsert_many([{"name": "Millennium Falcon", "crew_capacity": 5}])
+    [merged] = await overlay.apply([FALCON])
+    assert merged is not first[0]
+    assert merged == {**FALCON, "crew_capacity": "5"}
+
+
+@respx.mock
+def test_starship_reads_reflect_local_updates():
+    """
+    Test that details and listings serve local changes merged over SWAPI.
+    """
+    respx.get(
+        "https://swapi.py4e.com/api/starships/?search=Millennium Falcon"
+    ).mock(
+        return_value=Response(
+            200,
+            json={
+                "results": [
+                    {**FALCON, "crew": "4", "passengers": "6", "cargo_capacity": "1"}
+                ]
+            },
+        )
+    )
+    respx.get("https://swapi.py4e.com/api/starships/?search=Ghost").mock(
+        return_value=Response(200, json={"results": []})
+    )
+    respx.get("https://swapi.py4e.com/api/starships/").mock(
+        return_value=Response(200, json={"results": [FALCON], "next": None})
+    )
+
+    client.patch(
+        "/starships/bulk",
+        json=[
+            {"name": "Millennium Falcon", "model": "YT-1300f", "crew_capacity": 2},
+            {
+                "name": "Ghost",
+                "model": "VCX-100",
+                "cost_in_credits": 1,
+                "max_atmosphering_speed": 1025,
+                "crew_capacity": 6,
+                "passenger_capacity": 0,
+                "pilots": ["Hera Syndulla"],
+            },
+        ],
+    )
+
+    details = client.get("/starships/details/Millennium Falcon").json()
+    assert (details["model"], details["crew_capacity"]) == ("YT-1300f", "2")
+    assert details["cargo_capacity"] == "1"
+
+    listing = client.get("/starships").json()
+    assert listing["starships"][0]["model"] == "YT-1300f"
+
+    ghost = client.get("/starships/details/Ghost")
+    assert ghost.status_code == 200
+    assert ghost.json()["model"] == "VCX-100"
+
+
+def test_catalog_reads_reflect_local_updates(live_client):
+    """
+    Test that starships served from the warmed catalog carry local changes,
+    without calling SWAPI.
+    """
+    calls = len(live_client.swapi.requests)
+
+    live_client.patch(
+        "/starships/bulk",
+        json=[
+            {
+                "name": "X-wing",
+                "model": "T-70 X-wing",
+                "cost_in_credits": 1,
+                "max_atmosphering_speed": 1100,
+                "crew_capacity": 1,
+                "passenger_capacity": 0,
+                "pilots": ["Poe Dameron"],
+            }
+        ],
+    )
+
+    details = live_client.get("/starships/details/x-wing").json()
+    assert (details["model"], details["cargo_capacity"]) == ("T-70 X-wing", "110")
+    listing = live_client.get("/starships").json()
+    assert [ship["model"] for ship in listing["starships"]] == ["T-70 X-wing"]
+    assert len(live_client.swapi.requests) == calls
@@ -1,8 +1,15 @@
+import asyncio
+import json
+
+import pytest
 import respx
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from httpx import Response
 
+from app.api.streaming import json_array_chunks, ndjson_lines
 from app.main import app
+from app.services import swapi_service
 
 client = TestClient(app)
 
@@ -179,3 +186,246 @@ def test_pilot_details_swapi_error():
     data = response.json()
     assert "detail" in data
     assert data["detail"] == "Failed to fetch pilot details from SWAPI."
+
+
+X_WING_URL = "https://swapi.py4e.com/api/starships/12/"
+
+
+def _person(name: str, starships: list) -> dict:
+    return {
+        "name": name,
+        "species": [],
+        "homeworld": None,
+        "starships": starships,
+    }
+
+
+@respx.mock
+def test_list_pilots_fetches_every_page():
+    """
+    Test that all pages reported by the first page's count are crawled in order.
+    """
+    respx.get("https://swapi.py4e.com/api/people/", params={"page": "2"}).mock(
+        return_value=Response(
+            200,
+            json={"count": 5, "next": None, "results": [_person("Han Solo", [])]},
+        )
+    )
+    respx.get("https://swapi.py4e.com/api/people/", params={"page": "3"}).mock(
+        return_value=Response(
+            200,
+            json={
+                "count": 5,
+                "next": None,
+                "results": [
+                    _person("Wedge Antilles", [X_WING_URL])
+                ],
+            },
+        )
+    )
+    respx.get("https://swapi.py4e.com/api/people/").mock(
+        return_value=Response(
+            200,
+            json={
+                "count": 5,
+                "next": "https://swapi.py4e.com/api/people/?page=2",
+                "results": [
+                    _person("Luke Skywalker", [X_WING_URL]),
+                    _person("C-3PO", []),
+                ],
+            },
+        )
+    )
+    respx.get(X_WING_URL).mock(
+        return_value=Response(200, json={"name": "X-wing", "model": "T-65 X-wing"})
+    )
+
+    response = client.get("/pilots")
+    assert response.status_code == 200
+    names = [pilot["name"] for pilot in response.json()["pilots"]]
+    assert names == ["Luke Skywalker", "Wedge Antilles"]
+
+
+def _mock_two_pilots():
+    respx.get("https://swapi.py4e.com/api/people/").mock(
+        return_value=Response(
+            200,
+            json={
+                "count": 2,
+                "next": None,
+                "results": [
+                    _person("Luke Skywalker", [X_WING_URL]),
+                    _person("Wedge Antilles", [X_WING_URL]),
+                ],
+            },
+        )
+    )
+    return respx.get(X_WING_URL).mock(
+        return_value=Response(200, json={"name": "X-wing", "model": "T-65 X-wing"})
+    )
+
+
+@respx.mock
+def test_list_pilots_streams_ndjson():
+    """
+    Test streaming pilots as NDJSON, selected by query flag or Accept header.
+    """
+    _mock_two_pilots()
+
+    by_flag = client.get("/pilots?stream=ndjson")
+    by_header = client.get("/pilots", headers={"Accept": "application/x-ndjson"})
+
+    for response in (by_flag, by_header):
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(pilot["name"] for pilot in lines) == [
+            "Luke Skywalker",
+            "Wedge Antilles",
+        ]
+
+
+@respx.mock
+def test_list_pilots_streams_chunked_json():
+    """
+    Test streaming pilots as a chunked JSON document with the usual shape.
+    """
+    _mock_two_pilots()
+
+    response = client.get("/pilots?stream=json")
+    assert response.status_code == 200
+    pilots = response.json()["pilots"]
+    assert len(pilots) == 2
+    assert pilots[0]["starships"] == [{"name": "X-wing", "model": "T-65 X-wing"}]
+
+
+@respx.mock
+def test_list_pilots_stream_reports_errors():
+    """
+    Test that a failure before the first pilot is a regular 500 response.
+    """
+    respx.get("https://swapi.py4e.com/api/people/").mock(return_value=Response(500))
+
+    response = client.get("/pilots?stream=ndjson")
+    assert response.status_code == 500
+    assert response.json()["detail"].startswith("Failed to fetch pilots")
+
+
+@pytest.mark.asyncio
+async def test_streams_report_errors_after_the_first_pilot():
+    """
+    Test that a failure mid-stream is reported at the end of the stream.
+    """
+
+    async def pilots():
+        yield {"name": "Luke Skywalker"}
+        raise HTTPException(500, "Failed to fetch additional pilot data.")
+
+    chunks = [chunk async for chunk in json_array_chunks("pilots", pilots())]
+    lines = [line async for line in ndjson_lines(pilots())]
+
+    assert json.loads(b"".join(chunks)) == {
+        "pilots": [{"name": "Luke Skywalker"}],
+        "error": "Failed to fetch additional pilot data.",
+    }
+    assert json.loads(lines[-1]) == {"error": "Failed to fetch additional pilot data."}
+
+
+@pytest.mark.asyncio
+async def test_stream_bounds_enrichments_for_a_slow_consumer(monkeypatch):
+    """
+    Test that a slow consumer holds back enrichment to the stream buffer size.
+    """
+    people = [_person(f"Pilot {n}", [X_WING_URL]) for n in range(200)]
+    started = []
+    consumed = []
+
+    class Resolver:
+        async def iter_pages(self, url):
+            for start in range(0, len(people), 50):
+                yield {"results": people[start:start + 50]}
+
+    async def enrich_pilot_data(person, resolver, fields):
+        started.append(len(started) - len(consumed))
+        await asyncio.sleep(0)
+        return {"name": person["name"]}
+
+    monkeypatch.setattr(swapi_service, "enrich_pilot_data", enrich_pilot_data)
+
+    async for pilot in swapi_service.iter_pilots_with_starships(Resolver()):
+        consumed.append(pilot["name"])
+        await asyncio.sleep(0.001)
+
+    assert sorted(consumed) == sorted(person["name"] for person in people)
+    assert max(started) < swapi_service.STREAM_BUFFER_SIZE
+
+
+@respx.mock
+def test_list_pilots_paginates_and_projects():
+    """
+    Test enriching only the requested page and skipping unprojected lookups.
+    """
+    respx.get("https://swapi.py4e.com/api/people/").mock(
+        return_value=Response(
+            200,
+            json={
+                "count": 3,
+                "next": None,
+                "results": [
+                    {**_person("Luke Skywalker", [X_WING_URL]), "homeworld": "x"},
+                    _person("Wedge Antilles", [X_WING_URL]),
+                    _person("Biggs Darklighter", [X_WING_URL]),
+                ],
+            },
+        )
+    )
+    x_wing = respx.get(X_WING_URL).mock(
+        return_value=Response(200, json={"name": "X-wing", "model": "T-65 X-wing"})
+    )
+
+    response = client.get("/pilots?limit=2&fields=name")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pilots"] == [{"name": "Luke Skywalker"}, {"name": "Wedge Antilles"}]
+    assert data["count"] == 3
+    assert not x_wing.called
+
+    response = client.get("/pilots?page=1&limit=1&fields=name,starships")
+    assert response.json()["pilots"] == [
+        {
+            "name": "Luke Skywalker",
+            "starships": [{"name": "X-wing", "model": "T-65 X-wing"}],
+        }
+    ]
+
+
+@respx.mock
+def test_pilot_details_batch_crawls_people_once():
+    """
+    Test that large batches crawl the people listing once and share lookups.
+    """
+    names = [f"Pilot {number}" for number in range(12)]
+    people = respx.get("https://swapi.py4e.com/api/people/").mock(
+        return_value=Response(
+            200,
+            json={
+                "count": 11,
+                "next": None,
+                "results": [_person(name, [X_WING_URL]) for name in names[:11]],
+            },
+        )
+    )
+    x_wing = respx.get(X_WING_URL).mock(
+        return_value=Response(200, json={"name": "X-wing", "model": "T-65 X-wing"})
+    )
+
+    response = client.post("/pilots/details:batch", json={"names": names})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200] * 11 + [404]
+    assert results[0]["data"]["starships"] == [
+        {"name": "X-wing", "model": "T-65 X-wing"}
+    ]
+    assert results[11]["error"] == "Pilot not found or has no starships."
+    assert people.call_count == 1
+    assert x_wing.call_count == 1
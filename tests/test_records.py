@@ -0,0 +1,37 @@
+from app.services.records import PersonRecord, StarshipRecord, resource_id
+from app.services.swapi_service import BASE_URL, starship_details
+from tests.fake_swapi import swapi_dataset
+
+
+def test_records_keep_served_fields_with_integer_references():
+    """
+    Test that records are slotted, intern strings and reference by id.
+    """
+    luke = swapi_dataset()["people"][0]
+    person = PersonRecord.from_swapi({**luke, "films": ["a", "b"], "created": "x"})
+
+    assert not hasattr(person, "__dict__")
+    assert person.id == 1
+    assert person.species_ids == (1,)
+    assert person.homeworld_id == 1
+    assert person.starship_ids == (12,)
+    assert person.gender is PersonRecord.from_swapi(dict(luke)).gender
+    assert person.to_swapi() == {
+        field: luke[field]
+        for field in (
+            "name", "height", "mass", "gender", "birth_year",
+            "species", "homeworld", "starships", "url",
+        )
+    }
+    assert resource_id(f"{BASE_URL}/planets/") is None
+
+
+def test_starship_record_serves_like_the_raw_starship():
+    """
+    Test that served payloads are identical whether built from JSON or records.
+    """
+    [x_wing] = swapi_dataset()["starships"]
+    record = StarshipRecord.from_swapi(x_wing)
+
+    assert starship_details(record) == starship_details(x_wing)
+    assert record.get("films", []) == []
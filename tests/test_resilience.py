@@ -0,0 +1,196 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.core.resilience import (CircuitBreaker, CircuitOpenError,
+                                 ResilientTransport, RetryPolicy)
+from app.main import app
+
+URL = "https://swapi.py4e.com/api/starships/9/"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def no_sleep(delay: float) -> None:
+    pass
+
+
+def make_client(**kwargs) -> httpx.AsyncClient:
+    kwargs.setdefault("retry", RetryPolicy(retries=2, base_delay=0.0))
+    kwargs.setdefault("sleep", no_sleep)
+    return httpx.AsyncClient(
+        transport=ResilientTransport(httpx.AsyncHTTPTransport(), **kwargs)
+    )
+
+
+def test_retry_delays_are_jittered_and_bounded():
+    """
+    Test that backoff grows exponentially, stays capped and honours Retry-After.
+    """
+    policy = RetryPolicy(retries=5, base_delay=0.5, max_delay=1.0)
+
+    assert all(0 <= policy.delay(0) <= 0.5 for _ in range(50))
+    assert all(0 <= policy.delay(4) <= 1.0 for _ in range(50))
+    assert policy.delay(0, retry_after=0.25) == 0.25
+    assert policy.delay(0, retry_after=30) == 1.0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_transient_failures_are_retried():
+    """
+    Test that connection errors and 503s are retried until SWAPI answers.
+    """
+    route = respx.get(URL).mock(
+        side_effect=[
+            httpx.ConnectError("reset"),
+            Response(503),
+            Response(200, json={"name": "Millennium Falcon"}),
+        ]
+    )
+
+    async with make_client() as client:
+        response = await client.get(URL)
+
+    assert response.json() == {"name": "Millennium Falcon"}
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_retries_give_up_with_the_last_answer():
+    """
+    Test that the last upstream answer is returned once retries run out.
+    """
+    route = respx.get(URL).mock(return_value=Response(503))
+
+    async with make_client() as client:
+        response = await client.get(URL)
+
+    assert response.status_code == 503
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_non_idempotent_requests_are_not_retried():
+    """
+    Test that only idempotent methods are retried.
+    """
+    route = respx.post(URL).mock(return_value=Response(503))
+
+    async with make_client() as client:
+        response = await client.post(URL)
+
+    assert response.status_code == 503
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_attempts_are_bounded_by_the_timeout():
+    """
+    Test that an attempt exceeding the overall timeout fails as a read timeout.
+    """
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return Response(200)
+
+    respx.get(URL).mock(side_effect=slow)
+
+    async with make_client(retry=RetryPolicy(retries=0), timeout=0.01) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get(URL)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_breaker_fails_fast_then_probes_again():
+    """
+    Test that the breaker opens after repeated failures and recovers on a probe.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    route = respx.get(URL).mock(side_effect=httpx.ConnectError("down"))
+
+    async with make_client(retry=RetryPolicy(retries=0), breaker=breaker) as client:
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await client.get(URL)
+        with pytest.raises(CircuitOpenError):
+            await client.get(URL)
+        assert route.call_count == 2
+
+        clock.now += 10
+        route.mock(side_effect=None, return_value=Response(200, json={}))
+        assert (await client.get(URL)).status_code == 200
+
+    assert breaker.state == "closed"
+    assert route.call_count == 3
+
+
+def test_half_open_breaker_allows_a_single_probe():
+    """
+    Test that only one probe is let through and a failed probe reopens the circuit.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now += 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_slow_calls_are_hedged():
+    """
+    Test that a slow attempt is raced against a hedge and the faster one wins.
+    """
+    calls = []
+
+    async def first_slow(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+            return Response(200, json={"attempt": 1})
+        return Response(200, json={"attempt": 2})
+
+    respx.get(URL).mock(side_effect=first_slow)
+
+    async with make_client(hedge_delay=0.01) as client:
+        response = await client.get(URL)
+
+    assert response.json() == {"attempt": 2}
+    assert len(calls) == 2
+
+
+@respx.mock
+def test_unreachable_swapi_is_reported_as_503():
+    """
+    Test that upstream connection failures surface as 503 rather than 500.
+    """
+    respx.get("https://swapi.py4e.com/api/starships/").mock(
+        side_effect=httpx.ConnectError("down")
+    )
+
+    response = TestClient(app).get("/starships")
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "SWAPI is unavailable."}
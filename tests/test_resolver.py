@@ -0,0 +1,138 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.services.resolver import SwapiResolver, normalize_url
+from app.services.singleflight import SingleFlight
+from app.services.swapi_service import enrich_pilot_data
+
+RESOURCES = {
+    "/api/species/1/": {"name": "Human"},
+    "/api/planets/1/": {"name": "Tatooine"},
+    "/api/starships/12/": {"name": "X-wing", "model": "T-65 X-wing"},
+    "/api/starships/22/": {"name": "Imperial shuttle", "model": "Lambda-class"},
+}
+
+LUKE = {
+    "name": "Luke Skywalker",
+    "height": "172",
+    "gender": "male",
+    "mass": "77",
+    "birth_year": "19BBY",
+    "species": ["https://swapi.py4e.com/api/species/1/"],
+    "homeworld": "https://swapi.py4e.com/api/planets/1/",
+    "starships": [
+        "https://swapi.py4e.com/api/starships/12/",
+        "https://swapi.py4e.com/api/starships/22/",
+    ],
+}
+
+
+def make_client(delay: float = 0.01, fail_path: str = None):
+    """
+    Build a client whose transport records the peak number of in-flight calls.
+    """
+    stats = {"in_flight": 0, "peak": 0, "calls": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        stats["calls"] += 1
+        stats["in_flight"] += 1
+        stats["peak"] = max(stats["peak"], stats["in_flight"])
+        await asyncio.sleep(delay)
+        stats["in_flight"] -= 1
+        if request.url.path == fail_path:
+            return httpx.Response(500)
+        return httpx.Response(200, json=RESOURCES[request.url.path])
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), stats
+
+
+@pytest.mark.asyncio
+async def test_enrich_pilot_data_fetches_concurrently():
+    """
+    Test that species, homeworld and starships are fetched at the same time.
+    """
+    client, stats = make_client()
+    async with client:
+        pilot = await enrich_pilot_data(LUKE, SwapiResolver(client))
+
+    assert stats["calls"] == 4
+    assert stats["peak"] == 4
+    assert pilot["species_name"] == "Human"
+    assert pilot["homeworld"] == "Tatooine"
+    assert [s["name"] for s in pilot["starships"]] == ["X-wing", "Imperial shuttle"]
+
+
+@pytest.mark.asyncio
+async def test_resolver_bounds_concurrency():
+    """
+    Test that the resolver never exceeds its concurrency limit.
+    """
+    client, stats = make_client()
+    async with client:
+        await enrich_pilot_data(LUKE, SwapiResolver(client, max_concurrency=2))
+
+    assert stats["calls"] == 4
+    assert stats["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_enrich_pilot_data_maps_upstream_errors():
+    """
+    Test that a failing sub-resource is reported as an HTTP 500.
+    """
+    client, _ = make_client(fail_path="/api/planets/1/")
+    async with client:
+        with pytest.raises(HTTPException) as exc_info:
+            await enrich_pilot_data(LUKE, SwapiResolver(client))
+
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.detail == "Failed to fetch additional pilot data."
+
+
+def test_normalize_url():
+    """
+    Test that equivalent SWAPI URLs normalize to the same key.
+    """
+    assert normalize_url("https://SWAPI.py4e.com/api/species/1") == normalize_url(
+        "https://swapi.py4e.com/api/species/1/"
+    )
+    assert normalize_url(
+        "https://swapi.py4e.com/api/people/?search=luke&page=2"
+    ) == normalize_url("https://swapi.py4e.com/api/people/?page=2&search=luke")
+
+
+@pytest.mark.asyncio
+async def test_resolver_deduplicates_urls_within_a_request():
+    """
+    Test that pilots sharing species and starships trigger one fetch per URL.
+    """
+    client, stats = make_client()
+    async with client:
+        resolver = SwapiResolver(client)
+        pilots = await asyncio.gather(
+            enrich_pilot_data(LUKE, resolver),
+            enrich_pilot_data(dict(LUKE, name="Biggs Darklighter"), resolver),
+        )
+
+    assert stats["calls"] == 4
+    assert pilots[1]["species_name"] == "Human"
+
+
+@pytest.mark.asyncio
+async def test_singleflight_shares_calls_across_resolvers():
+    """
+    Test that concurrent requests share one in-flight call for the same URL.
+    """
+    client, stats = make_client()
+    singleflight = SingleFlight()
+    async with client:
+        resolvers = [SwapiResolver(client, singleflight=singleflight) for _ in range(3)]
+        await asyncio.gather(
+            *(enrich_pilot_data(LUKE, resolver) for resolver in resolvers)
+        )
+
+    assert stats["calls"] == 4
+    assert len(singleflight) == 0
@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+
+from app.api.responses import FastJSONResponse
+from app.core import serialization
+from app.main import app
+
+
+def test_serialization_matches_without_orjson(monkeypatch):
+    """
+    Test that the standard library fallback produces the same encoding.
+    """
+    value = {"name": "Padmé", "starships": [{"model": None}], "count": 2}
+    encoded = serialization.dumps(value)
+
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert serialization.dumps(value) == encoded
+    assert serialization.loads(encoded) == value
+
+
+def test_pre_encoded_payloads_are_sent_as_is():
+    """
+    Test that bytes bypass encoding and routes document typed responses.
+    """
+    assert FastJSONResponse(b'{"pilots":[]}').body == b'{"pilots":[]}'
+
+    paths = TestClient(app).get("/openapi.json").json()["paths"]
+    schema = paths["/pilots"]["get"]["responses"]["200"]["content"]
+    assert schema["application/json"]["schema"]["$ref"].endswith("/PilotList")
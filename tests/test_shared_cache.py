@@ -0,0 +1,143 @@
+import asyncio
+import errno
+
+import pytest
+from httpx import Response
+
+from app.core.config import Settings
+from app.services.cache import CacheEntry, SwapiCache, create_cache
+from app.services.catalog import SwapiCatalog
+from app.services.pilots_view import SHARED_KEY, PilotsView
+from app.services.resolver import SwapiResolver
+from app.services.shared_cache import SharedCacheServer, SocketCacheBackend
+from tests.fake_swapi import swapi_dataset, upstream_client
+
+KEY = "https://swapi.py4e.com/api/species/1/"
+
+
+def entry(value: bytes, stale_until: float = 2e9) -> CacheEntry:
+    return CacheEntry(
+        value=value,
+        stored_at=1.0,
+        expires_at=stale_until,
+        stale_until=stale_until,
+        etag='"v1"',
+    )
+
+
+@pytest.mark.asyncio
+async def test_workers_share_entries_through_the_sidecar(tmp_path):
+    """
+    Test that an entry stored by one worker is served to another.
+    """
+    path = str(tmp_path / "cache.sock")
+    server = await SharedCacheServer(path, max_bytes=1024).start()
+    first, second = SocketCacheBackend(path), SocketCacheBackend(path)
+    try:
+        await first.set(KEY, entry(b'{"name": "Human"}'))
+        await first.set("expired", entry(b"{}", stale_until=1.0))
+        results = await asyncio.gather(
+            second.get(KEY), second.get("expired"), second.get("missing")
+        )
+        assert results == [entry(b'{"name": "Human"}'), None, None]
+
+        await second.delete(KEY)
+        assert await first.get(KEY) is None
+        await first.set(KEY, entry(b"{}"))
+        await second.clear()
+        assert await first.get(KEY) is None
+    finally:
+        await first.close()
+        await second.close()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_cache_bypasses_an_unavailable_sidecar(tmp_path):
+    """
+    Test that lookups miss while the sidecar is down and recover once it is up.
+    """
+    path = str(tmp_path / "cache.sock")
+    settings = Settings(cache_backend="socket", cache_socket_path=path)
+    cache = create_cache(settings)
+    assert isinstance(cache, SwapiCache)
+    calls = []
+
+    async def loader(headers) -> Response:
+        calls.append(headers)
+        return Response(200, content=b'{"name": "Human"}')
+
+    assert await cache.get_or_load(KEY, loader) == b'{"name": "Human"}'
+    assert await cache.get_or_load(KEY, loader) == b'{"name": "Human"}'
+    assert len(calls) == 2
+
+    server = await SharedCacheServer(path, max_bytes=1024).start()
+    try:
+        await cache.get_or_load(KEY, loader)
+        assert await cache.get_or_load(KEY, loader) == b'{"name": "Human"}'
+        assert len(calls) == 3
+    finally:
+        await cache.backend.close()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_sidecar_does_not_take_over_a_live_socket(tmp_path):
+    """
+    Test that a second sidecar refuses a socket in use but replaces a stale one.
+    """
+    path = str(tmp_path / "cache.sock")
+    server = await SharedCacheServer(path, max_bytes=1024).start()
+    try:
+        with pytest.raises(OSError) as raised:
+            await SharedCacheServer(path, max_bytes=1024).start()
+        assert raised.value.errno == errno.EADDRINUSE
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    # Any socket file left by the closed server is replaced.
+    server = await SharedCacheServer(path, max_bytes=1024).start()
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_workers_publish_the_pilots_payload_once(tmp_path):
+    """
+    Test that the encoded /pilots payload is published by one worker, and
+    that the others look it up once and then serve their own copy.
+    """
+    path = str(tmp_path / "cache.sock")
+    server = await SharedCacheServer(path, max_bytes=1024 * 1024).start()
+    backends = [SocketCacheBackend(path), SocketCacheBackend(path)]
+    views = []
+    try:
+        async with upstream_client(swapi_dataset()) as client:
+            for backend in backends:
+                catalog = SwapiCatalog()
+                views.append(PilotsView(catalog, shared=backend))
+                await catalog.refresh(SwapiResolver(client))
+
+        first, second = views
+        lookups = []
+        get = backends[1].get
+
+        async def counted_get(key):
+            lookups.append(key)
+            return await get(key)
+
+        backends[1].get = counted_get
+        body = await first.payload()
+        assert await backends[1].get(SHARED_KEY) is not None
+        lookups.clear()
+        assert [await second.payload() for _ in range(3)] == [body] * 3
+        assert second.digest == first.digest
+        assert lookups == [SHARED_KEY]
+    finally:
+        for backend in backends:
+            await backend.close()
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,64 @@
+import httpx
+import pytest
+
+from app.services.resolver import SwapiResolver
+from app.services.snapshot import SnapshotTransport, SwapiSnapshot, sync_snapshot
+from app.services.swapi_service import (BASE_URL, fetch_all_pilots_with_starships,
+                                        fetch_pilot_by_name,
+                                        fetch_starship_by_name, fetch_starships)
+from tests.fake_swapi import swapi_dataset, upstream_client
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    snapshot = SwapiSnapshot(str(tmp_path / "swapi.sqlite3"))
+    yield snapshot
+    snapshot.close()
+
+
+@pytest.mark.asyncio
+async def test_sync_snapshot_is_incremental(snapshot):
+    """
+    Test that only new, edited and removed resources are written on refresh.
+    """
+    dataset = swapi_dataset()
+    async with upstream_client(dataset) as client:
+        counts = await sync_snapshot(SwapiResolver(client), snapshot)
+    assert counts == {"inserted": 16, "updated": 0, "deleted": 0}
+
+    dataset["starships"][0]["edited"] = "2"
+    dataset["people"].pop()
+    async with upstream_client(dataset) as client:
+        counts = await sync_snapshot(SwapiResolver(client), snapshot)
+    assert counts == {"inserted": 0, "updated": 1, "deleted": 1}
+
+    async with upstream_client(dataset) as client:
+        counts = await sync_snapshot(SwapiResolver(client), snapshot)
+    assert counts == {"inserted": 0, "updated": 0, "deleted": 0}
+
+
+@pytest.mark.asyncio
+async def test_service_functions_resolve_from_snapshot(snapshot):
+    """
+    Test that every service function is answered offline by the snapshot.
+    """
+    async with upstream_client(swapi_dataset()) as client:
+        await sync_snapshot(SwapiResolver(client), snapshot)
+
+    offline = httpx.AsyncClient(transport=SnapshotTransport(snapshot))
+    async with offline:
+        starships = await fetch_starships(SwapiResolver(offline))
+        starship = await fetch_starship_by_name("x-wing", SwapiResolver(offline))
+        pilots = await fetch_all_pilots_with_starships(SwapiResolver(offline))
+        pilot = await fetch_pilot_by_name("luke skywalker", SwapiResolver(offline))
+        planets = await SwapiResolver(offline).get_all_pages(f"{BASE_URL}/planets/")
+        missing = await offline.get(f"{BASE_URL}/starships/99/")
+
+    assert [s["name"] for s in starships["starships"]] == ["X-wing"]
+    assert starship["crew_capacity"] == "1"
+    assert [p["name"] for p in pilots] == ["Luke Skywalker"]
+    assert pilot["homeworld"] == "Tatooine"
+    assert pilot["species_name"] == "Human"
+    assert pilot["starships"] == [{"name": "X-wing", "model": "T-65 X-wing"}]
+    assert [len(page["results"]) for page in planets] == [10, 2]
+    assert missing.status_code == 404
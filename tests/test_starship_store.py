@@ -0,0 +1,289 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.api.streaming import split_lines
+from app.main import app
+from app.models.schemas import MAX_BULK_SIZE
+from app.services.starship_store import (MemoryStarshipStore,
+                                         SqliteStarshipStore, StarshipNotFound,
+                                         VersionConflict)
+
+client = TestClient(app)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStarshipStore()
+    return SqliteStarshipStore(str(tmp_path / "starships.sqlite3"))
+
+
+def _falcon(**changes) -> dict:
+    return {
+        "name": "Millennium Falcon",
+        "model": "YT-1300 light freighter",
+        "cost_in_credits": 100000,
+        "max_atmosphering_speed": 1050,
+        "crew_capacity": 4,
+        "passenger_capacity": 6,
+        "pilots": ["Han Solo", "Chewbacca"],
+        **changes,
+    }
+
+
+@pytest.mark.asyncio
+async def test_store_indexes_follow_updates(store):
+    """
+    Test that model and pilot lookups reflect the latest version.
+    """
+    assert [s.data["name"] for s in await store.find(pilot="han solo")] == [
+        "Millennium Falcon"
+    ]
+
+    updated = await store.update(_falcon(model="YT-1300f", pilots=["Lando"]))
+    assert updated.version == 2
+    assert await store.find(pilot="Han Solo") == []
+    assert await store.find(model="yt-1300f", pilot="LANDO") == [updated]
+    assert await store.get("Millennium Falcon") == updated
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_store_rejects_stale_and_unknown_updates(store):
+    """
+    Test optimistic concurrency and updates of unknown starships.
+    """
+    await store.update(_falcon(crew_capacity=5), expected_version=1)
+
+    with pytest.raises(VersionConflict) as conflict:
+        await store.update(_falcon(crew_capacity=6), expected_version=1)
+    assert conflict.value.current == 2
+
+    with pytest.raises(StarshipNotFound):
+        await store.update(_falcon(name="Slave I"))
+    assert (await store.get("Millennium Falcon")).data["crew_capacity"] == 5
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_persists_across_instances(tmp_path):
+    """
+    Test that a reopened SQLite store keeps updates instead of reseeding.
+    """
+    path = str(tmp_path / "starships.sqlite3")
+    first = SqliteStarshipStore(path)
+    await first.update(_falcon(crew_capacity=5))
+    await first.close()
+
+    second = SqliteStarshipStore(path)
+    stored = await second.get("Millennium Falcon")
+    assert (stored.version, stored.data["crew_capacity"]) == (2, 5)
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_reads_while_a_write_is_in_progress(tmp_path):
+    """
+    Test that reads see the last committed state instead of waiting for an
+    open write transaction.
+    """
+    store = SqliteStarshipStore(str(tmp_path / "starships.sqlite3"))
+    with store._transaction() as connection:
+        connection.execute(
+            "UPDATE starships SET version = 7 WHERE name = 'Millennium Falcon'"
+        )
+        stored = await asyncio.wait_for(store.get("Millennium Falcon"), 5.0)
+        revision = await asyncio.wait_for(store.revision(), 5.0)
+    assert (stored.version, revision) == (1, 1)
+    assert (await store.get("Millennium Falcon")).version == 7
+    await store.close()
+
+
+def test_update_starship_honours_if_match():
+    """
+    Test that updates based on an outdated ETag are refused with 412.
+    """
+    etag = client.get("/starships/local/Millennium Falcon").headers["ETag"]
+
+    response = client.put(
+        "/starships/update", json=_falcon(), headers={"If-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    response = client.put(
+        "/starships/update", json=_falcon(), headers={"If-Match": etag}
+    )
+    assert response.status_code == 412
+
+    response = client.get("/starships/local", params={"pilot": "chewbacca"})
+    assert [ship["name"] for ship in response.json()["starships"]] == [
+        "Millennium Falcon"
+    ]
+
+
+def test_lifespan_store_persists_updates(live_client):
+    """
+    Test that updates go through the store opened by the app lifespan.
+    """
+    assert isinstance(app.state.starship_store, SqliteStarshipStore)
+    assert app.state.swapi_catalog.ready
+
+    response = live_client.put(
+        "/starships/update", json=_falcon(pilots=["Lando Calrissian"])
+    )
+    assert response.status_code == 200
+
+    local = live_client.get("/starships/local/Millennium Falcon")
+    assert local.headers["ETag"] == response.headers["ETag"]
+    response = live_client.get("/starships/local", params={"pilot": "lando calrissian"})
+    assert [ship["name"] for ship in response.json()["starships"]] == [
+        "Millennium Falcon"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_store_upserts_patches_in_one_write(store):
+    """
+    Test that bulk patches create, merge and reject starships in order.
+    """
+    outcomes = await store.upsert_many(
+        [
+            {"name": "Millennium Falcon", "crew_capacity": 5},
+            _falcon(name="Slave I", model="Firespray-31", pilots=["Boba Fett"]),
+            {"name": "Slave I", "passenger_capacity": 2},
+            {"name": "Tantive IV", "model": "CR90 corvette"},
+        ]
+    )
+
+    assert [outcome.status for outcome in outcomes] == [200, 201, 200, 422]
+    assert outcomes[3].error.startswith("Missing fields for a new starship: ")
+    falcon = await store.get("Millennium Falcon")
+    assert (falcon.version, falcon.data["crew_capacity"]) == (2, 5)
+    assert falcon.data["model"] == "YT-1300 light freighter"
+    slave = await store.find(pilot="boba fett")
+    assert [(s.version, s.data["passenger_capacity"]) for s in slave] == [(2, 2)]
+    assert await store.get("Tantive IV") is None
+    await store.close()
+
+
+def test_bulk_upsert_accepts_json_and_ndjson():
+    """
+    Test per-item results for JSON array and NDJSON bulk bodies.
+    """
+    response = client.patch(
+        "/starships/bulk",
+        json=[
+            _falcon(name="Home One", model="MC80", pilots=["Ackbar"]),
+            {"name": "Home One", "crew_capacity": "many"},
+            {"model": "nameless"},
+            {"name": 5},
+        ],
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [result["status"] for result in data["results"]] == [201, 422, 422, 422]
+    assert data["results"][1]["error"].startswith("crew_capacity: ")
+    assert data["results"][2]["error"].startswith("name: ")
+    assert data["results"][3]["name"] is None
+    assert (data["created"], data["updated"], data["failed"]) == (1, 0, 3)
+
+    lines = [
+        json.dumps({"name": "Home One", "crew_capacity": 5400}),
+        "",
+        "{not json",
+    ]
+    response = client.patch(
+        "/starships/bulk",
+        content="\n".join(lines).encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 422]
+    assert results[0]["version"] == 2
+
+    response = client.patch("/starships/bulk", json={"name": "Home One"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_stops_reading_an_oversized_stream():
+    """
+    Test that an NDJSON body is refused once it exceeds ``MAX_BULK_SIZE``
+    patches, without reading the rest of the stream.
+    """
+    sent = []
+
+    async def body():
+        for index in range(2 * MAX_BULK_SIZE):
+            sent.append(index)
+            yield json.dumps({"name": f"Ship {index}"}).encode() + b"\n"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        response = await http.patch(
+            "/starships/bulk",
+            content=body(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+    assert response.status_code == 413
+    assert len(sent) == MAX_BULK_SIZE + 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_refuses_oversized_bodies(monkeypatch):
+    """
+    Test that bodies over the byte limit are refused whether their size is
+    declared or not, and that over-long NDJSON lines are refused too.
+    """
+    monkeypatch.setattr(routes, "MAX_BULK_BYTES", 1000)
+    monkeypatch.setattr(routes, "MAX_PATCH_BYTES", 100)
+    patches = [{"name": f"Ship {index}"} for index in range(100)]
+    sent = []
+
+    async def body():
+        for patch in patches:
+            sent.append(patch)
+            yield json.dumps(patch).encode() + b"\n"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        declared = await http.patch("/starships/bulk", json=patches)
+        streamed = await http.patch(
+            "/starships/bulk",
+            content=body(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        long_line = await http.patch(
+            "/starships/bulk",
+            content=json.dumps({"name": "x" * 200}).encode(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+    assert "content-length" not in streamed.request.headers
+    assert [declared.status_code, streamed.status_code, long_line.status_code] == [
+        413,
+        413,
+        413,
+    ]
+    assert len(sent) < len(patches)
+
+
+@pytest.mark.asyncio
+async def test_split_lines_joins_lines_across_chunks():
+    """
+    Test that lines split across chunks are rejoined and blank ones skipped.
+    """
+
+    async def chunks():
+        for chunk in (b"ab", b"c\nd", b"e\n\n", b"  \nf"):
+            yield chunk
+
+    lines = [line async for line in split_lines(chunks(), 10)]
+    assert lines == [b"abc", b"de", b"f"]
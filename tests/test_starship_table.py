@@ -0,0 +1,78 @@
+from app.services.starship_table import StarshipTable, parse_number
+
+
+def _rows() -> list:
+    return [
+        {"name": "b", "model": "M1", "cost_in_credits": "1,000", "crew_capacity": "?"},
+        {"name": "A", "model": "M2", "cost_in_credits": "10", "crew_capacity": "5"},
+        {"name": "c", "model": "M1", "cost_in_credits": "n/a", "crew_capacity": "2-4"},
+    ]
+
+
+def test_parse_number():
+    """
+    Test parsing SWAPI's numeric strings.
+    """
+    assert parse_number("1,000") == 1000.0
+    assert parse_number("0.5") == 0.5
+    assert parse_number("30-165") == 165.0
+    assert parse_number("-3") == -3.0
+    assert parse_number(42) == 42.0
+    assert parse_number("unknown") is None
+    assert parse_number("n/a") is None
+    assert parse_number(None) is None
+
+
+def test_select_excludes_unknown_values():
+    """
+    Test that range filters are inclusive and never match unknown values.
+    """
+    table = StarshipTable(_rows())
+    assert table.select({}) == bytes([1, 1, 1])
+    assert table.select({"cost_in_credits": (10, None)}) == bytes([1, 1, 0])
+    assert table.select({"cost_in_credits": (None, 10)}) == bytes([0, 1, 0])
+    assert table.select(
+        {"cost_in_credits": (0, None), "crew_capacity": (None, 10)}
+    ) == bytes([0, 1, 0])
+
+
+def test_order_puts_unknown_values_last():
+    """
+    Test multi-key sorts, with unknown values last in either direction.
+    """
+    table = StarshipTable(_rows())
+    everything = table.select({})
+    assert table.order(everything, [("cost_in_credits", False)]) == [1, 0, 2]
+    assert table.order(everything, [("cost_in_credits", True)]) == [0, 1, 2]
+    assert table.order(everything, [("crew_capacity", True)]) == [1, 2, 0]
+    assert table.order(everything, [("name", False)]) == [1, 0, 2]
+    assert table.order(
+        everything, [("cost_in_credits", True), ("name", True)]
+    ) == [0, 1, 2]
+    assert table.order(table.select({"crew_capacity": (0, None)}), []) == [1, 2]
+
+
+def test_aggregate_by_group():
+    """
+    Test per-group counts and column statistics.
+    """
+    table = StarshipTable(_rows())
+    groups = table.aggregate(table.select({}), "model", ["cost_in_credits"])
+    assert groups == [
+        {
+            "key": "M1",
+            "count": 2,
+            "stats": {
+                "cost_in_credits": {
+                    "count": 1, "min": 1000.0, "max": 1000.0, "avg": 1000.0
+                }
+            },
+        },
+        {
+            "key": "M2",
+            "count": 1,
+            "stats": {
+                "cost_in_credits": {"count": 1, "min": 10.0, "max": 10.0, "avg": 10.0}
+            },
+        },
+    ]
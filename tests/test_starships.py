@@ -136,3 +136,268 @@ def test_update_starship():
     assert data["data"]["crew_capacity"] == 6
     assert data["data"]["passenger_capacity"] == 8
     assert data["data"]["pilots"] == ["Han Solo", "Chewbacca"]
+
+
+def _starship_page(page: int, count: int) -> dict:
+    first = (page - 1) * 10
+    return {
+        "count": count,
+        "next": None,
+        "results": [
+            {
+                "name": f"Starship {number}",
+                "model": f"Model {number}",
+                "cost_in_credits": "1000",
+                "max_atmosphering_speed": "900",
+            }
+            for number in range(first, min(first + 10, count))
+        ],
+    }
+
+
+@respx.mock
+def test_list_starships_paginates_with_cursor():
+    """
+    Test serving arbitrary pages, fetching only the SWAPI pages they overlap.
+    """
+    second = respx.get(
+        "https://swapi.py4e.com/api/starships/", params={"page": "2"}
+    ).mock(return_value=Response(200, json=_starship_page(2, 12)))
+    first = respx.get("https://swapi.py4e.com/api/starships/").mock(
+        return_value=Response(200, json=_starship_page(1, 12))
+    )
+
+    response = client.get("/starships?page=2&limit=5")
+    assert response.status_code == 200
+    data = response.json()
+    assert [ship["name"] for ship in data["starships"]] == [
+        f"Starship {number}" for number in range(5, 10)
+    ]
+    assert data["count"] == 12
+    assert not second.called
+
+    response = client.get(f"/starships?cursor={data['next']}")
+    data = response.json()
+    assert [ship["name"] for ship in data["starships"]] == [
+        "Starship 10",
+        "Starship 11",
+    ]
+    assert data["next"] is None
+    assert first.called and second.called
+
+
+@respx.mock
+def test_list_starships_projects_fields():
+    """
+    Test restricting starships to the requested fields.
+    """
+    respx.get("https://swapi.py4e.com/api/starships/").mock(
+        return_value=Response(200, json=_starship_page(1, 2))
+    )
+
+    response = client.get("/starships?fields=name,model")
+    assert response.status_code == 200
+    assert response.json()["starships"][0] == {
+        "name": "Starship 0",
+        "model": "Model 0",
+    }
+
+    response = client.get("/starships?fields=name,crew")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: crew"
+
+
+def test_list_starships_rejects_invalid_cursor():
+    """
+    Test that a malformed cursor is a client error.
+    """
+    response = client.get("/starships?cursor=not-a-cursor")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor."
+
+
+@respx.mock
+def test_starship_details_batch():
+    """
+    Test looking up several starships at once, deduplicating repeated names.
+    """
+    search = respx.get("https://swapi.py4e.com/api/starships/?search=X-wing").mock(
+        return_value=Response(
+            200, json={"results": [{"name": "X-wing", "model": "T-65 X-wing"}]}
+        )
+    )
+    respx.get("https://swapi.py4e.com/api/starships/?search=Nonexistent").mock(
+        return_value=Response(200, json={"results": []})
+    )
+
+    response = client.post(
+        "/starships/details:batch", json={"names": ["X-wing", "x-wing", "Nonexistent"]}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["name"] for result in results] == ["X-wing", "x-wing", "Nonexistent"]
+    assert results[0]["status"] == results[1]["status"] == 200
+    assert results[1]["data"]["model"] == "T-65 X-wing"
+    assert results[2] == {
+        "name": "Nonexistent",
+        "status": 404,
+        "error": "Starship not found",
+    }
+    assert search.call_count == 1
+
+
+def test_starship_details_batch_rejects_empty_batch():
+    """
+    Test that a batch must name at least one starship.
+    """
+    response = client.post("/starships/details:batch", json={"names": []})
+    assert response.status_code == 422
+
+
+def _fleet_page() -> dict:
+    fleet = [
+        ("Corvette", "CR90", "corvette", "3,500,000", "950", "30-165"),
+        ("Shuttle", "Lambda", "transport", "240000", "850", "6"),
+        ("Dreadnought", "Executor", "star dreadnought", "unknown", "n/a", "279,144"),
+        ("Gunship", "Lambda", "transport", "500000", "1000", "4"),
+    ]
+    return {
+        "count": len(fleet),
+        "next": None,
+        "results": [
+            {
+                "name": name,
+                "model": model,
+                "starship_class": starship_class,
+                "cost_in_credits": cost,
+                "max_atmosphering_speed": speed,
+                "crew": crew,
+                "passengers": "0",
+                "cargo_capacity": "100",
+            }
+            for name, model, starship_class, cost, speed, crew in fleet
+        ],
+    }
+
+
+@respx.mock
+def test_list_starships_filters_and_sorts():
+    """
+    Test filtering starships on numeric ranges and sorting them.
+    """
+    respx.get("https://swapi.py4e.com/api/starships/").mock(
+        return_value=Response(200, json=_fleet_page())
+    )
+
+    response = client.get(
+        "/starships?min_cost_in_credits=250000&sort=-cost_in_credits"
+        "&fields=name,cost_in_credits"
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "starships": [
+            {"name": "Corvette", "cost_in_credits": "3,500,000"},
+            {"name": "Gunship", "cost_in_credits": "500000"},
+        ],
+        "count": 2,
+        "next": None,
+    }
+
+    response = client.get("/starships?sort=crew_capacity&limit=2")
+    data = response.json()
+    assert [ship["name"] for ship in data["starships"]] == ["Gunship", "Shuttle"]
+    assert data["count"] == 4
+
+    response = client.get(f"/starships?sort=crew_capacity&cursor={data['next']}")
+    assert [ship["name"] for ship in response.json()["starships"]] == [
+        "Corvette",
+        "Dreadnought",
+    ]
+
+    response = client.get("/starships?sort=crew")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown sort fields: crew"
+
+
+@respx.mock
+def test_starship_stats():
+    """
+    Test aggregating starship columns by class, ignoring unknown values.
+    """
+    respx.get("https://swapi.py4e.com/api/starships/").mock(
+        return_value=Response(200, json=_fleet_page())
+    )
+
+    response = client.get(
+        "/starships/stats?group_by=starship_class&columns=cost_in_credits"
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["group_by"] == "starship_class"
+    assert data["count"] == 4
+    assert data["groups"][0] == {
+        "key": "transport",
+        "count": 2,
+        "stats": {
+            "cost_in_credits": {
+                "count": 2,
+                "min": 240000.0,
+                "max": 500000.0,
+                "avg": 370000.0,
+            }
+        },
+    }
+    dreadnought = next(
+        group for group in data["groups"] if group["key"] == "star dreadnought"
+    )
+    assert dreadnought["stats"]["cost_in_credits"] == {
+        "count": 0,
+        "min": None,
+        "max": None,
+        "avg": None,
+    }
+
+    response = client.get("/starships/stats?max_max_atmosphering_speed=900")
+    data = response.json()
+    assert data["count"] == 1
+    assert data["groups"][0]["key"] is None
+    assert data["groups"][0]["stats"]["crew_capacity"]["max"] == 6.0
+
+    response = client.get("/starships/stats?group_by=name")
+    assert response.status_code == 422
+
+
+def test_starship_queries_read_the_warmed_catalog(live_client):
+    """
+    Test that filters, sorts and stats run over the catalog of a live app,
+    with local changes merged, without calling SWAPI.
+    """
+    calls = len(live_client.swapi.requests)
+    query = "/starships?min_cost_in_credits=100000&fields=name,cost_in_credits"
+
+    response = live_client.get(query)
+    assert response.json()["starships"] == [
+        {"name": "X-wing", "cost_in_credits": "149999"}
+    ]
+
+    response = live_client.patch(
+        "/starships/bulk",
+        json=[
+            {
+                "name": "X-wing",
+                "model": "T-70 X-wing",
+                "cost_in_credits": 50000,
+                "max_atmosphering_speed": 1100,
+                "crew_capacity": 2,
+                "passenger_capacity": 0,
+                "pilots": ["Poe Dameron"],
+            }
+        ],
+    )
+    assert response.json()["created"] == 1
+    assert live_client.get(query).json()["starships"] == []
+
+    stats = live_client.get("/starships/stats?columns=crew_capacity").json()
+    assert stats["count"] == 1
+    assert stats["groups"][0]["stats"]["crew_capacity"]["max"] == 2.0
+    assert len(live_client.swapi.requests) == calls
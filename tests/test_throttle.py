@@ -0,0 +1,191 @@
+import asyncio
+
+import pytest
+import respx
+from httpx import AsyncClient, AsyncHTTPTransport, Response
+
+from app.core.metrics import SWAPI_REQUEST_DURATION
+from app.core.resilience import ResilientTransport, RetryPolicy
+from app.services.resolver import SwapiResolver
+from app.services.throttle import Priority, UpstreamBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_process_wide_concurrency():
+    """
+    Test that no more than ``max_concurrency`` calls hold the budget at once.
+    """
+    budget = UpstreamBudget(max_concurrency=2)
+    running = peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with budget.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    assert budget.stats() == {"active": 0, "waiting": 0, "waited": 4}
+
+
+@pytest.mark.asyncio
+async def test_waiting_calls_are_admitted_by_priority():
+    """
+    Test that interactive calls overtake crawls and background work queued earlier.
+    """
+    budget = UpstreamBudget(max_concurrency=1)
+    order = []
+    release = asyncio.Event()
+
+    async def call(name, priority):
+        async with budget.slot(priority):
+            order.append(name)
+            await release.wait()
+
+    tasks = [asyncio.ensure_future(call("holder", Priority.INTERACTIVE))]
+    await asyncio.sleep(0)
+    for name, priority in [
+        ("background", Priority.BACKGROUND),
+        ("crawl", Priority.CRAWL),
+        ("interactive", Priority.INTERACTIVE),
+    ]:
+        tasks.append(asyncio.ensure_future(call(name, priority)))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert order == ["holder", "interactive", "crawl", "background"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_allows_a_burst_then_refills():
+    """
+    Test that the token bucket admits ``burst`` calls, then ``rate`` per second.
+    """
+    clock = FakeClock()
+    budget = UpstreamBudget(max_concurrency=10, rate=100.0, burst=2, clock=clock)
+
+    async def call():
+        async with budget.slot():
+            pass
+
+    await call()
+    await call()
+    pending = asyncio.ensure_future(call())
+    await asyncio.sleep(0)
+    assert not pending.done()
+
+    clock.now += 0.01
+    await asyncio.wait_for(pending, timeout=1)
+    assert budget.stats()["waited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_give_up_their_turn():
+    """
+    Test that a cancelled waiter neither keeps a slot nor blocks later calls.
+    """
+    budget = UpstreamBudget(max_concurrency=1)
+    release = asyncio.Event()
+
+    async def hold():
+        async with budget.slot():
+            await release.wait()
+
+    holder = asyncio.ensure_future(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(hold())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    await holder
+
+    async with budget.slot():
+        assert budget.stats()["active"] == 1
+    assert budget.stats() == {"active": 0, "waiting": 0, "waited": 1}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_resolver_calls_wait_for_the_budget():
+    """
+    Test that resolvers sharing a budget never exceed it together.
+    """
+    budget = UpstreamBudget(max_concurrency=1)
+    running = peak = 0
+
+    async def respond(request):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return Response(200, json={})
+
+    respx.get(url__startswith="https://swapi.py4e.com/api/").mock(side_effect=respond)
+
+    async with AsyncClient() as client:
+        resolvers = [
+            SwapiResolver(client, budget=budget, priority=priority)
+            for priority in (Priority.INTERACTIVE, Priority.CRAWL)
+        ]
+        await asyncio.gather(
+            *(
+                resolver.get_json(f"https://swapi.py4e.com/api/people/{id}/")
+                for resolver in resolvers
+                for id in range(3)
+            )
+        )
+
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_every_attempt_is_charged_to_the_budget():
+    """
+    Test that retries take their own budget slot and count as SWAPI calls.
+    """
+    budget = UpstreamBudget(max_concurrency=1)
+    slots = []
+    slot = budget.slot
+
+    def counting_slot(priority):
+        slots.append(priority)
+        return slot(priority)
+
+    budget.slot = counting_slot
+    url = "https://swapi.py4e.com/api/planets/3/"
+    respx.get(url).mock(
+        side_effect=[Response(429), Response(503), Response(200, json={})]
+    )
+    before = SWAPI_REQUEST_DURATION.count(resource="planets", status="200")
+    retried = SWAPI_REQUEST_DURATION.count(resource="planets", status="429")
+
+    transport = ResilientTransport(
+        AsyncHTTPTransport(), retry=RetryPolicy(retries=2, base_delay=0.0)
+    )
+    async with AsyncClient(transport=transport) as client:
+        resolver = SwapiResolver(client, budget=budget, priority=Priority.CRAWL)
+        assert await resolver.get_json(url) == {}
+
+    assert slots == [Priority.CRAWL] * 3
+    assert SWAPI_REQUEST_DURATION.count(resource="planets", status="200") == (
+        before + 1
+    )
+    assert SWAPI_REQUEST_DURATION.count(resource="planets", status="429") == (
+        retried + 1
+    )
+    assert budget.stats()["active"] == 0
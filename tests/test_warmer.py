@@ -0,0 +1,132 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.cache import MemoryCacheBackend, SwapiCache
+from app.services.catalog import SwapiCatalog
+from app.services.pilots_view import PilotsView
+from app.services.resolver import SwapiResolver
+from app.services.swapi_service import BASE_URL
+from app.services.warmer import CacheWarmer, FileLock
+from tests.fake_swapi import swapi_dataset, upstream_client
+
+
+def make_cache() -> SwapiCache:
+    return SwapiCache(
+        MemoryCacheBackend(max_bytes=1024 * 1024),
+        ttls={},
+        default_ttl=60.0,
+        stale_ttl=60.0,
+    )
+
+
+def unreachable_client() -> httpx.AsyncClient:
+    def handler(request):
+        raise httpx.ConnectError("SWAPI should not be called", request=request)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_warm_loads_catalog_and_primes_detail_records():
+    """
+    Test that warming materializes pilots and caches every detail record.
+    """
+    catalog = SwapiCatalog()
+    view = PilotsView(catalog)
+    cache = make_cache()
+
+    async with upstream_client(swapi_dataset()) as client:
+        warmer = CacheWarmer(
+            catalog, lambda revalidate: SwapiResolver(client, cache=cache), cache
+        )
+        await warmer.warm()
+
+    assert warmer.ready
+    assert view.ready
+    async with unreachable_client() as client:
+        resolver = SwapiResolver(client, cache=cache)
+        starship = await resolver.get_json(f"{BASE_URL}/starships/12")
+    assert starship["name"] == "X-wing"
+
+
+@pytest.mark.asyncio
+async def test_refresh_revalidates_only_while_holding_the_lock(tmp_path):
+    """
+    Test that a worker that cannot take the lock reloads from the cache instead.
+    """
+    lock = FileLock(str(tmp_path / "warm.lock"))
+    revalidations = []
+
+    def new_resolver(revalidate):
+        revalidations.append(revalidate)
+        return SwapiResolver(client)
+
+    async with upstream_client(swapi_dataset()) as client:
+        warmer = CacheWarmer(SwapiCatalog(), new_resolver, lock=lock)
+        await warmer.refresh()
+        with lock.hold() as held:
+            assert held
+            await warmer.refresh()
+
+    assert revalidations == [True, False]
+    assert warmer.refreshes == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_skips_revalidation_just_done_by_another_worker(tmp_path):
+    """
+    Test that a worker refreshing right after another one reloads the cache
+    instead of revalidating with SWAPI again.
+    """
+    lock_path = str(tmp_path / "warm.lock")
+    revalidations = []
+
+    def new_resolver(revalidate):
+        revalidations.append(revalidate)
+        return SwapiResolver(client)
+
+    async with upstream_client(swapi_dataset()) as client:
+        first, second = (
+            CacheWarmer(
+                SwapiCatalog(), new_resolver, interval=100.0, lock=FileLock(lock_path)
+            )
+            for _ in range(2)
+        )
+        await first.refresh()
+        await second.refresh()
+        first.lock.mark_refreshed(first.lock.last_refresh() - 100.0)
+        await second.refresh()
+
+    assert revalidations == [True, False, True]
+
+
+def test_refresh_delays_are_jittered():
+    """
+    Test that scheduled refreshes stay within the configured jitter.
+    """
+    warmer = CacheWarmer(SwapiCatalog(), SwapiResolver, interval=100.0, jitter=0.2)
+
+    delays = {warmer.next_delay() for _ in range(50)}
+
+    assert all(80.0 <= delay <= 120.0 for delay in delays)
+    assert len(delays) > 1
+
+
+def test_ready_reports_warming_until_warm():
+    """
+    Test that the readiness probe fails until the warm-up completes.
+    """
+    warmer = CacheWarmer(SwapiCatalog(), SwapiResolver)
+    app.state.cache_warmer = warmer
+    try:
+        client = TestClient(app)
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json() == {"status": "warming"}
+
+        warmer.ready = True
+        assert client.get("/ready").json() == {"status": "ready"}
+    finally:
+        del app.state.cache_warmer